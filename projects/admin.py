@@ -1,15 +1,101 @@
 from django.contrib import admin
-from .models import Profile, Project, CertifyingInstitution, Certificate
+from django.forms.models import BaseInlineFormSet
+from django.urls import reverse
+from django.utils.html import format_html
+from .counting import EstimatedCountPaginator
+from .models import (
+    Profile,
+    Project,
+    CertifyingInstitution,
+    Certificate,
+    Skill,
+)
 
 
-class CertificateInline(admin.StackedInline):
+class PaginatedInlineFormSet(BaseInlineFormSet):
+    page = 1
+    per_page = 20
+
+    def get_queryset(self):
+        if not hasattr(self, "_page_queryset"):
+            start = (self.page - 1) * self.per_page
+            queryset = super().get_queryset()
+            self._page_queryset = queryset[start:start + self.per_page]
+        return self._page_queryset
+
+
+class EstimatedCountAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+class CertificateInline(admin.TabularInline):
     model = Certificate
+    formset = PaginatedInlineFormSet
+    fields = ["name", "profiles"]
+    autocomplete_fields = ["profiles"]
+    ordering = ["-timestamp"]
+    show_change_link = True
+    extra = 0
+    per_page = 20
+    page_param = "certificates_page"
+
+    def get_formset(self, request, obj=None, **kwargs):
+        formset = super().get_formset(request, obj, **kwargs)
+        page = request.GET.get(self.page_param, "")
+        formset.page = int(page) if page.isdigit() and int(page) else 1
+        formset.per_page = self.per_page
+        return formset
+
 
+class ProfileAdmin(EstimatedCountAdmin):
+    list_display = ["name", "github"]
+    search_fields = ["^name"]
+    ordering = ["name"]
 
-class CertifiyingInstitutionAdmin(admin.ModelAdmin):
+
+class ProjectAdmin(EstimatedCountAdmin):
+    list_display = ["name", "profile", "key_skill"]
+    list_select_related = ["profile"]
+    search_fields = ["^name"]
+    autocomplete_fields = ["profile"]
+    raw_id_fields = ["skills"]
+
+
+class CertificateAdmin(EstimatedCountAdmin):
+    list_display = ["name", "certifying_institution", "timestamp"]
+    list_select_related = ["certifying_institution"]
+    list_filter = ["timestamp"]
+    search_fields = ["^name"]
+    autocomplete_fields = ["certifying_institution", "profiles"]
+
+
+class CertifiyingInstitutionAdmin(EstimatedCountAdmin):
     inlines = [CertificateInline]
+    list_display = ["name", "url"]
+    search_fields = ["^name"]
+    ordering = ["name"]
+    readonly_fields = ["all_certificates"]
+
+    @admin.display(description="Certificates")
+    def all_certificates(self, obj):
+        if obj.pk is None:
+            return "-"
+        url = reverse("admin:projects_certificate_changelist")
+        return format_html(
+            '<a href="{}?certifying_institution__id__exact={}">'
+            "All {} certificates</a> (the form below shows {} per page, "
+            "use ?{}=N to page through them)",
+            url,
+            obj.pk,
+            obj.certificates.count(),
+            CertificateInline.per_page,
+            CertificateInline.page_param,
+        )
 
 
-admin.site.register(Profile)
-admin.site.register(Project)
-admin.site.register(CertifyingInstitution, CertifiyingInstitutionAdmin)
\ No newline at end of file
+admin.site.register(Profile, ProfileAdmin)
+admin.site.register(Project, ProjectAdmin)
+admin.site.register(Certificate, CertificateAdmin)
+admin.site.register(CertifyingInstitution, CertifiyingInstitutionAdmin)
+admin.site.register(Skill)
@@ -3,4 +3,11 @@ from django.apps import AppConfig
 
 class ProjectsConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
-    name = "projects"
\ No newline at end of file
+    name = "projects"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from . import signals, slow_queries, tasks  # noqa: F401
+
+        connection_created.connect(slow_queries.install)
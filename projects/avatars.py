@@ -0,0 +1,144 @@
+import hashlib
+import io
+import re
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db.models import F
+from django.http import FileResponse, Http404
+from django.urls import reverse
+from PIL import Image, ImageOps, UnidentifiedImageError
+from rest_framework.exceptions import ValidationError
+
+from .models import Profile
+
+# Variant format: (Pillow format, file extension, content type, options).
+FORMATS = {
+    "webp": ("WEBP", "webp", "image/webp", {"quality": 80, "method": 4}),
+    "jpeg": (
+        "JPEG",
+        "jpg",
+        "image/jpeg",
+        {"quality": 85, "optimize": True, "progressive": True},
+    ),
+}
+CONTENT_TYPES = {
+    extension: content_type
+    for _, extension, content_type, _ in FORMATS.values()
+}
+VARIANT_NAME = re.compile(r"^[0-9a-f]{64}\.(webp|jpg)$")
+# The name never changes while the file exists, so it can be cached forever.
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+
+def store(content, directory, extension):
+    """Save content under its SHA-256 digest, once, and return its name."""
+    digest = hashlib.sha256(content).hexdigest()
+    name = f"{directory}/{digest}.{extension}"
+    if not default_storage.exists(name):
+        default_storage.save(name, ContentFile(content))
+    return name
+
+
+def store_original(upload):
+    """Check that upload is an image within AVATAR_MAX_UPLOAD_SIZE and
+    AVATAR_MAX_PIXELS and store it as is for render_avatar()."""
+    if upload.size > settings.AVATAR_MAX_UPLOAD_SIZE:
+        raise ValidationError({"image": "The image is too large."})
+    content = upload.read()
+    try:
+        with Image.open(io.BytesIO(content)) as image:
+            image_format = image.format
+            pixels = image.width * image.height
+            image.verify()
+    except (
+        UnidentifiedImageError,
+        Image.DecompressionBombError,
+        OSError,
+        SyntaxError,
+    ):
+        raise ValidationError({"image": "Upload a valid image."})
+    if pixels > settings.AVATAR_MAX_PIXELS:
+        raise ValidationError({"image": "The image has too many pixels."})
+    return store(content, "avatars/originals", image_format.lower())
+
+
+def encode(image, variant_format):
+    pil_format, _, _, options = FORMATS[variant_format]
+    output = io.BytesIO()
+    image.save(output, pil_format, **options)
+    return output.getvalue()
+
+
+def render_variants(original):
+    """Crop the original to squares of the AVATAR_SIZES, encode each in
+    every format and return the stored names by format and size."""
+    variants = {variant_format: {} for variant_format in FORMATS}
+    with default_storage.open(original) as file, Image.open(file) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        for size in settings.AVATAR_SIZES:
+            thumbnail = ImageOps.fit(
+                image, (size, size), Image.Resampling.LANCZOS
+            )
+            for variant_format, (_, extension, _, _) in FORMATS.items():
+                variants[variant_format][str(size)] = store(
+                    encode(thumbnail, variant_format), "avatars", extension
+                )
+    return variants
+
+
+def render_avatar(profile_id, original):
+    """Render the variants of a profile's uploaded original, or return None
+    when another upload already replaced it."""
+    if not Profile.objects.filter(
+        pk=profile_id, avatar_original=original
+    ).exists():
+        return None
+    return render_variants(original)
+
+
+def link_avatar(profile_id, original, variants):
+    """Link rendered variants to the profile, unless another upload
+    replaced its original while they rendered. Returns whether the profile
+    was updated; the update bypasses post_save, so the caller records the
+    change and notifies the profile documents."""
+    updated = Profile.objects.filter(
+        pk=profile_id, avatar_original=original
+    ).update(avatar=variants, version=F("version") + 1)
+    return bool(updated)
+
+
+def variant_url(name):
+    return reverse("avatar-file", args=[name.rsplit("/", 1)[-1]])
+
+
+def avatar_representation(variants):
+    """The src of the AVATAR_DISPLAY_SIZE JPEG and the srcset of each
+    format, or None without an avatar."""
+    if not variants:
+        return None
+    srcset = {
+        variant_format: ", ".join(
+            f"{variant_url(name)} {size}w"
+            for size, name in sorted(names.items(), key=lambda i: int(i[0]))
+        )
+        for variant_format, names in variants.items()
+    }
+    jpeg = variants["jpeg"]
+    size = str(settings.AVATAR_DISPLAY_SIZE)
+    src = jpeg.get(size) or jpeg[max(jpeg, key=int)]
+    return {"src": variant_url(src), "srcset": srcset}
+
+
+def avatar_file(request, name):
+    """Serve an avatar variant with immutable caching headers."""
+    path = f"avatars/{name}"
+    if not (VARIANT_NAME.match(name) and default_storage.exists(path)):
+        raise Http404()
+    response = FileResponse(
+        default_storage.open(path),
+        content_type=CONTENT_TYPES[name.rsplit(".", 1)[1]],
+    )
+    response["Cache-Control"] = IMMUTABLE
+    return response
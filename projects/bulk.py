@@ -0,0 +1,69 @@
+from django.db import connections
+from django.db.models import Q
+
+from .models import VersionedModel
+
+
+def bulk_upsert(model, objs, unique_fields, update_fields, batch_size=None):
+    queryset = model._default_manager.all()
+    features = connections[queryset.db].features
+    if not features.supports_update_conflicts_with_target:
+        # MySQL resolves ON DUPLICATE KEY UPDATE against every unique key
+        # of the table and rejects an explicit conflict target.
+        unique_fields = None
+    return queryset.bulk_create(
+        objs,
+        batch_size=batch_size,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields,
+    )
+
+
+def by_key(queryset, unique_fields):
+    return {
+        tuple(getattr(obj, field) for field in unique_fields): obj
+        for obj in queryset
+    }
+
+
+def bump_versions(existing, objs_by_key):
+    """Set the version of the objects whose row exists to one past the
+    stored one."""
+    for key, obj in existing.items():
+        objs_by_key[key].version = obj.version + 1
+
+
+def upsert_objects(model, rows, unique_fields, batch_size=500):
+    """Insert or update rows matched on their natural key, one statement
+    per batch, and return the stored objects in request order along with
+    the number of rows inserted.
+
+    Rows of a VersionedModel that already existed get their version bumped
+    by the upsert itself; inserted rows start at version 1."""
+    rows_by_key = {}
+    for row in rows:
+        rows_by_key[tuple(row[field] for field in unique_fields)] = row
+    objs = [model(**row) for row in rows_by_key.values()]
+    update_fields = [field for field in rows[0] if field not in unique_fields]
+
+    lookup = Q()
+    for key in rows_by_key:
+        lookup |= Q(**dict(zip(unique_fields, key)))
+    queryset = model._default_manager.filter(lookup)
+
+    # Locked until the upsert overwrites them, so that no other write
+    # reuses the versions handed out here or deletes them in between.
+    versioned = issubclass(model, VersionedModel)
+    fields = [*unique_fields, "version"] if versioned else unique_fields
+    existing = by_key(
+        queryset.select_for_update().only(*fields), unique_fields
+    )
+    if versioned:
+        bump_versions(existing, dict(zip(rows_by_key, objs)))
+        update_fields.append("version")
+
+    bulk_upsert(model, objs, unique_fields, update_fields, batch_size)
+
+    stored = by_key(queryset, unique_fields)
+    return [stored[key] for key in rows_by_key], len(objs) - len(existing)
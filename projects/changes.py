@@ -0,0 +1,121 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from .models import (
+    Certificate,
+    CertifyingInstitution,
+    ChangeLogEntry,
+    Profile,
+    Project,
+)
+from .serializers import (
+    CertificateSerializer,
+    CertifyingInstitutionSerializer,
+    ProfileSerializer,
+    ProjectSerializer,
+)
+
+RESOURCES = {
+    Profile: "profiles",
+    Project: "projects",
+    Certificate: "certificates",
+    CertifyingInstitution: "certifying-institutions",
+}
+
+SOURCES = {
+    "profiles": (Profile.objects.all, ProfileSerializer),
+    "projects": (Project.objects.all, ProjectSerializer),
+    "certificates": (
+        lambda: Certificate.objects.prefetch_related("profiles"),
+        CertificateSerializer,
+    ),
+    "certifying-institutions": (
+        lambda: CertifyingInstitution.objects.prefetch_related("certificates"),
+        CertifyingInstitutionSerializer,
+    ),
+}
+
+
+def record_changes(model, ids, action):
+    # Written in the writer's transaction, so that entries commit, or roll
+    # back, together with the data they describe.
+    entries = [
+        ChangeLogEntry(resource=RESOURCES[model], object_id=pk, action=action)
+        for pk in set(ids)
+        if pk is not None
+    ]
+    if entries:
+        ChangeLogEntry.objects.bulk_create(entries)
+
+
+def latest_entries(entries):
+    latest = {}
+    for entry in entries:
+        key = (entry.resource, entry.object_id)
+        latest.pop(key, None)
+        latest[key] = entry
+    return list(latest.values())
+
+
+def load_objects(entries):
+    ids = {}
+    for entry in entries:
+        if entry.action == ChangeLogEntry.UPSERT:
+            ids.setdefault(entry.resource, []).append(entry.object_id)
+
+    return {
+        resource: SOURCES[resource][0]().in_bulk(resource_ids)
+        for resource, resource_ids in ids.items()
+    }
+
+
+def serialize_change(entry, objects):
+    instance = objects.get(entry.resource, {}).get(entry.object_id)
+    change = {"resource": entry.resource, "id": entry.object_id}
+    if instance is None:
+        return {**change, "action": ChangeLogEntry.DELETE}
+
+    serializer_class = SOURCES[entry.resource][1]
+    return {
+        **change,
+        "action": ChangeLogEntry.UPSERT,
+        "data": serializer_class(instance).data,
+    }
+
+
+def settled(entries):
+    """The entries up to the first written in the last CHANGES_SETTLE_TIME
+    seconds.
+
+    Ids are handed out in insert order, not commit order: a transaction
+    still open may hold an id below the newest committed entries, and a
+    cursor past that gap would skip its entry for good. Writers whose
+    transactions outlast the settle time can still be skipped.
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.CHANGES_SETTLE_TIME)
+    for index, entry in enumerate(entries):
+        if entry.created_at > cutoff:
+            return entries[:index]
+    return entries
+
+
+def collect_changes(since, limit):
+    entries = settled(
+        list(
+            ChangeLogEntry.objects.filter(pk__gt=since).order_by("pk")[
+                : limit + 1
+            ]
+        )
+    )
+    has_more = len(entries) > limit
+    entries = entries[:limit]
+
+    latest = latest_entries(entries)
+    objects = load_objects(latest)
+    return {
+        "cursor": entries[-1].pk if entries else since,
+        "has_more": has_more,
+        "changes": [serialize_change(entry, objects) for entry in latest],
+    }
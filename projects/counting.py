@@ -0,0 +1,54 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+def estimated_count(queryset):
+    """Return MySQL's estimated row count for an unfiltered queryset, read
+    from the optimizer statistics instead of scanning an index."""
+    connection = connections[queryset.db]
+    if connection.vendor != "mysql" or queryset.query.where:
+        return None
+
+    sql, params = queryset.order_by().values("pk").query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN {sql}", params)
+        columns = [column[0] for column in cursor.description]
+        row = cursor.fetchone()
+    return int(row[columns.index("rows")] or 0) if row else None
+
+
+class EstimatedCountPaginator(Paginator):
+    @cached_property
+    def count(self):
+        estimate = estimated_count(self.object_list)
+        if estimate is not None and (
+            estimate >= settings.ESTIMATED_COUNT_THRESHOLD
+        ):
+            return estimate
+        return super().count
+
+
+def count_cache_key(model):
+    return f"projects:row-count:{model._meta.db_table}"
+
+
+def cached_count(model):
+    """Return the row count kept in the cache by the write signals,
+    seeding it with one exact count when it is missing."""
+    key = count_cache_key(model)
+    count = cache.get(key)
+    if count is None:
+        count = model._default_manager.count()
+        cache.add(key, count, None)
+    return count
+
+
+def adjust_cached_count(model, delta):
+    try:
+        cache.incr(count_cache_key(model), delta)
+    except ValueError:
+        # Not seeded yet; the next read counts the table.
+        pass
@@ -0,0 +1,154 @@
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_delete, pre_delete
+
+from . import signals
+from .changes import record_changes
+from .counting import adjust_cached_count
+from .models import (
+    Certificate,
+    CertifyingInstitution,
+    ChangeLogEntry,
+    Profile,
+    ProfileSnapshot,
+    Project,
+)
+
+ProjectSkill = Project.skills.through
+CertificateProfile = Certificate.profiles.through
+
+# Delete receivers whose work the set-based paths below do in bulk.
+HANDLED_RECEIVERS = {
+    signals.profile_changed,
+    signals.project_changed,
+    signals.certificate_deleted,
+    signals.institution_changed,
+    signals.log_delete,
+    signals.log_profile_certificates,
+    signals.count_deleted,
+}
+
+
+def can_fast_delete(*models):
+    """Whether deleting rows of these models fires no receivers other than
+    the ones the set-based paths stand in for."""
+    return all(
+        receiver in HANDLED_RECEIVERS
+        for model in models
+        for signal in (pre_delete, post_delete)
+        for receiver in signal._live_receivers(model)
+    )
+
+
+def raw_delete(queryset):
+    # Skips the collector: callers delete dependent rows first.
+    return queryset._raw_delete(queryset.db)
+
+
+def count_deleted(model, count):
+    if count:
+        transaction.on_commit(lambda: adjust_cached_count(model, -count))
+
+
+def delete_in_batches(queryset, delete_batch, fields=(), chunked=False):
+    """Call delete_batch with successive batches of (pk, *fields) rows of
+    queryset until it is empty, committing after each batch if chunked."""
+    size = settings.DELETE_BATCH_SIZE
+    rows = queryset.values_list("pk", *fields)
+    while True:
+        with transaction.atomic() if chunked else nullcontext():
+            batch = list(rows[:size])
+            if not batch:
+                return
+            delete_batch(batch)
+
+
+def delete_profile(profile, chunked=False):
+    """Delete a profile, its projects and its certificate links with
+    set-based DELETEs instead of loading them through the collector.
+
+    Everything happens in one transaction unless chunked, in which case
+    each batch of dependent rows commits on its own so that very large
+    deletes do not hold their locks for the whole operation.
+    """
+    models = (Profile, Project, ProjectSkill, CertificateProfile)
+    if not can_fast_delete(*models, ProfileSnapshot):
+        profile.delete()
+        return
+
+    def delete_projects(batch):
+        ids = [pk for pk, in batch]
+        raw_delete(ProjectSkill.objects.filter(project_id__in=ids))
+        count_deleted(Project, raw_delete(Project.objects.filter(pk__in=ids)))
+        record_changes(Project, ids, ChangeLogEntry.DELETE)
+        signals.notify_profiles_changed([profile.pk])
+
+    def unlink_certificates(batch):
+        raw_delete(
+            CertificateProfile.objects.filter(pk__in=[pk for pk, _ in batch])
+        )
+        record_changes(
+            Certificate, [pk for _, pk in batch], ChangeLogEntry.UPSERT
+        )
+
+    with nullcontext() if chunked else transaction.atomic():
+        delete_in_batches(
+            Project.objects.filter(profile=profile),
+            delete_projects,
+            chunked=chunked,
+        )
+        delete_in_batches(
+            CertificateProfile.objects.filter(profile=profile),
+            unlink_certificates,
+            fields=["certificate_id"],
+            chunked=chunked,
+        )
+        with transaction.atomic():
+            raw_delete(ProfileSnapshot.objects.filter(profile=profile))
+            count_deleted(
+                Profile, raw_delete(Profile.objects.filter(pk=profile.pk))
+            )
+            record_changes(Profile, [profile.pk], ChangeLogEntry.DELETE)
+            signals.notify_profiles_changed([profile.pk])
+
+
+def delete_institution(institution, chunked=False):
+    """Delete a certifying institution and its certificates with set-based
+    DELETEs, in one transaction unless chunked (see delete_profile)."""
+    models = (CertifyingInstitution, Certificate, CertificateProfile)
+    if not can_fast_delete(*models):
+        institution.delete()
+        return
+
+    def delete_certificates(batch):
+        ids = [pk for pk, in batch]
+        links = CertificateProfile.objects.filter(certificate_id__in=ids)
+        signals.notify_profiles_changed(
+            links.values_list("profile_id", flat=True)
+        )
+        raw_delete(links)
+        count_deleted(
+            Certificate, raw_delete(Certificate.objects.filter(pk__in=ids))
+        )
+        record_changes(Certificate, ids, ChangeLogEntry.DELETE)
+
+    with nullcontext() if chunked else transaction.atomic():
+        delete_in_batches(
+            Certificate.objects.filter(certifying_institution=institution),
+            delete_certificates,
+            chunked=chunked,
+        )
+        with transaction.atomic():
+            count_deleted(
+                CertifyingInstitution,
+                raw_delete(
+                    CertifyingInstitution.objects.filter(pk=institution.pk)
+                ),
+            )
+            record_changes(
+                CertifyingInstitution,
+                [institution.pk],
+                ChangeLogEntry.DELETE,
+            )
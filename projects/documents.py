@@ -0,0 +1,92 @@
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Prefetch
+from django.utils import timezone
+
+from .bulk import bulk_upsert
+from .jobs import enqueue
+from .models import Certificate, Profile, ProfileSnapshot
+from .renderers import FastJSONRenderer
+from .serializers import ProfileDocumentSerializer
+
+
+def document_queryset():
+    return Profile.objects.prefetch_related(
+        "projects",
+        Prefetch(
+            "certificates",
+            queryset=Certificate.objects.select_related(
+                "certifying_institution"
+            ),
+        ),
+    )
+
+
+def document_cache_key(profile_id):
+    return f"projects:profile-document:{profile_id}"
+
+
+def build_profile_document(profile):
+    data = ProfileDocumentSerializer(profile).data
+    etag = hashlib.md5(FastJSONRenderer().render(data)).hexdigest()
+    return {"data": data, "etag": f'"{etag}"'}
+
+
+def build_snapshots(profile_ids):
+    # Taken before reading so that writes committed while the documents
+    # are being built leave the new snapshots marked as stale.
+    built_at = timezone.now()
+    snapshots = []
+    for profile in document_queryset().filter(pk__in=profile_ids):
+        document = build_profile_document(profile)
+        snapshots.append(
+            ProfileSnapshot(
+                profile=profile,
+                document=document["data"],
+                etag=document["etag"],
+                built_at=built_at,
+            )
+        )
+
+    bulk_upsert(
+        ProfileSnapshot,
+        snapshots,
+        unique_fields=["profile"],
+        update_fields=["document", "etag", "built_at"],
+    )
+    return snapshots
+
+
+def get_profile_document(profile_id):
+    key = document_cache_key(profile_id)
+    document = cache.get(key)
+    if document is not None:
+        return document
+
+    snapshot = ProfileSnapshot.objects.filter(profile_id=profile_id).first()
+    if snapshot is None or snapshot.is_stale:
+        snapshots = build_snapshots([profile_id])
+        if not snapshots:
+            return None
+        snapshot = snapshots[0]
+
+    document = {"data": snapshot.document, "etag": snapshot.etag}
+    cache.set(key, document, settings.PROFILE_DOCUMENT_CACHE_TIMEOUT)
+    return document
+
+
+def invalidate_profile_documents(profile_ids):
+    ProfileSnapshot.objects.filter(profile_id__in=profile_ids).update(
+        stale_since=timezone.now()
+    )
+    cache.delete_many([document_cache_key(pk) for pk in profile_ids])
+
+
+def schedule_snapshot_rebuild(profile_ids):
+    profile_ids = sorted(profile_ids)
+    if settings.PROFILE_SNAPSHOT_ASYNC:
+        enqueue("rebuild_snapshots", {"profile_ids": profile_ids}, dedup=True)
+    else:
+        build_snapshots(profile_ids)
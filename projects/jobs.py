@@ -0,0 +1,191 @@
+import hashlib
+import json
+import logging
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import (
+    DatabaseError,
+    IntegrityError,
+    close_old_connections,
+    transaction,
+)
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Job
+
+TASKS = {}
+PURGE_KEY = "projects:jobs-purged"
+PURGE_BATCH_SIZE = 1000
+
+logger = logging.getLogger(__name__)
+
+
+def task(name):
+    """Register a function as the job task called name. It is called with
+    the job's payload as keyword arguments and its return value, which must
+    be JSON serializable, is stored as the job's result."""
+
+    def register(function):
+        TASKS[name] = function
+        return function
+
+    return register
+
+
+def dedup_key(name, payload):
+    digest = hashlib.md5(
+        json.dumps(payload, sort_keys=True, cls=DjangoJSONEncoder).encode()
+    ).hexdigest()
+    return f"{name}:{digest}"
+
+
+def insert_job(name, payload, key, delay):
+    """Insert a job, or return None when its dedup_key is taken by a job
+    still queued, which may have been queued by a concurrent writer."""
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                task=name,
+                payload=payload,
+                dedup_key=key,
+                max_attempts=settings.JOB_MAX_ATTEMPTS,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+    except IntegrityError:
+        if key is None:
+            raise
+        return None
+
+
+def enqueue(name, payload=None, dedup=False, delay=0):
+    """Queue a job. With dedup, a job still queued with the same task and
+    payload is returned instead of adding a duplicate: it has not started,
+    so it will see everything the new one would have."""
+    if name not in TASKS:
+        raise ValueError(f"Unknown task {name!r}.")
+
+    payload = payload or {}
+    key = dedup_key(name, payload) if dedup else None
+    while True:
+        job = insert_job(name, payload, key, delay) or (
+            Job.objects.filter(dedup_key=key).first()
+        )
+        # None when the queued job was claimed in between: insert again.
+        if job is not None:
+            return job
+
+
+def claim_jobs(limit=1):
+    """Mark up to limit due jobs as running and return them.
+
+    Rows are locked with SKIP LOCKED, so concurrent workers claim disjoint
+    jobs without waiting on each other. Jobs left running past JOB_LEASE
+    seconds belonged to a worker that died and are claimed again.
+    """
+    now = timezone.now()
+    expired = now - timedelta(seconds=settings.JOB_LEASE)
+    with transaction.atomic():
+        jobs = list(
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(
+                Q(status=Job.QUEUED, run_after__lte=now)
+                | Q(status=Job.RUNNING, started_at__lt=expired)
+            )
+            .order_by("run_after", "pk")[:limit]
+        )
+        for job in jobs:
+            job.status = Job.RUNNING
+            job.attempts += 1
+            job.started_at = now
+            # A started job no longer stands for the writes queued after.
+            job.dedup_key = None
+        Job.objects.bulk_update(
+            jobs, ["status", "attempts", "started_at", "dedup_key"]
+        )
+    return jobs
+
+
+def retry_delay(attempts):
+    return settings.JOB_RETRY_BACKOFF * 2 ** (attempts - 1)
+
+
+def run_job(job):
+    try:
+        job.result = TASKS[job.task](**job.payload)
+    except Exception:
+        job.error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            job.status = Job.QUEUED
+            job.run_after = timezone.now() + timedelta(
+                seconds=retry_delay(job.attempts)
+            )
+        else:
+            job.status = Job.FAILED
+            job.finished_at = timezone.now()
+    else:
+        job.status = Job.SUCCEEDED
+        job.error = ""
+        job.finished_at = timezone.now()
+
+    job.save(
+        update_fields=["status", "result", "error", "run_after", "finished_at"]
+    )
+    return job
+
+
+def purge_jobs():
+    """Delete the jobs finished more than JOB_RETENTION seconds ago, at most
+    once every JOB_PURGE_INTERVAL seconds per worker, and return how many
+    were deleted."""
+    if not cache.add(PURGE_KEY, True, settings.JOB_PURGE_INTERVAL):
+        return 0
+    cutoff = timezone.now() - timedelta(seconds=settings.JOB_RETENTION)
+    finished = Job.objects.filter(
+        status__in=[Job.SUCCEEDED, Job.FAILED], finished_at__lt=cutoff
+    )
+    purged = 0
+    while True:
+        ids = list(finished.values_list("pk", flat=True)[:PURGE_BATCH_SIZE])
+        purged += Job.objects.filter(pk__in=ids).delete()[0]
+        if len(ids) < PURGE_BATCH_SIZE:
+            return purged
+
+
+def run_next_job():
+    """Claim and run one due job, returning whether there was one, or None
+    when the database failed."""
+    try:
+        purge_jobs()
+        jobs = claim_jobs()
+        if jobs:
+            run_job(jobs[0])
+        return bool(jobs)
+    except DatabaseError:
+        # A job whose result could not be saved is claimed again once its
+        # lease expires.
+        logger.exception("The worker lost the database.")
+        return None
+
+
+def work(once=False, poll_interval=1.0):
+    """Run due jobs one at a time, polling every poll_interval seconds when
+    there are none, or returning the number of jobs run then if once.
+    Database errors are logged and retried after poll_interval."""
+    done = 0
+    while True:
+        # No request_started signal recycles the worker's connections:
+        # drop those past CONN_MAX_AGE or left unusable by an error.
+        close_old_connections()
+        ran = run_next_job()
+        if ran:
+            done += 1
+        elif once and ran is not None:
+            return done
+        else:
+            time.sleep(poll_interval)
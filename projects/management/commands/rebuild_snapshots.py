@@ -0,0 +1,69 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.db.models import F, Q
+
+from projects.documents import build_snapshots
+from projects.models import Profile
+
+
+def _init_worker():
+    django.setup()
+    connections.close_all()
+
+
+def _rebuild_chunk(profile_ids):
+    return len(build_snapshots(profile_ids))
+
+
+class Command(BaseCommand):
+    help = "Rebuild the precomputed profile snapshots."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of worker processes (1 rebuilds inline).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=200,
+            help="Number of profiles rebuilt per worker task.",
+        )
+        parser.add_argument(
+            "--stale-only",
+            action="store_true",
+            help="Only rebuild missing or stale snapshots.",
+        )
+
+    def handle(self, *args, **options):
+        profiles = Profile.objects.order_by("pk")
+        if options["stale_only"]:
+            profiles = profiles.filter(
+                Q(snapshot__isnull=True)
+                | Q(snapshot__stale_since__gte=F("snapshot__built_at"))
+            )
+
+        profile_ids = list(profiles.values_list("pk", flat=True))
+        size = options["batch_size"]
+        chunks = [
+            profile_ids[start:start + size]
+            for start in range(0, len(profile_ids), size)
+        ]
+
+        if options["workers"] <= 1:
+            rebuilt = sum(map(_rebuild_chunk, chunks))
+        else:
+            # Forked workers must not share the parent's connections.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=options["workers"], initializer=_init_worker
+            ) as executor:
+                rebuilt = sum(executor.map(_rebuild_chunk, chunks))
+
+        self.stdout.write(f"Rebuilt {rebuilt} profile snapshots.")
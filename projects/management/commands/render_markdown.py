@@ -0,0 +1,57 @@
+from django.core.management.base import BaseCommand
+
+from projects.models import Profile, Project
+from projects.signals import notify_profiles_changed
+
+# The attribute holding the profile whose document shows each model.
+PROFILE_ATTRIBUTES = {Profile: "pk", Project: "profile_id"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Re-render the stored HTML of the markdown fields, e.g. after the "
+        "renderer configuration changed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows read and updated at a time.",
+        )
+
+    def handle(self, *args, **options):
+        for model, profile_attribute in PROFILE_ATTRIBUTES.items():
+            changed = self.render(
+                model, profile_attribute, options["batch_size"]
+            )
+            self.stdout.write(
+                f"Re-rendered {changed} {model._meta.verbose_name_plural}."
+            )
+
+    def render(self, model, profile_attribute, batch_size):
+        """Re-render every row of model, saving and counting those whose
+        HTML changed."""
+        targets = list(model.markdown_fields.values())
+        queryset = model.objects.only(
+            "pk", profile_attribute, *model.markdown_fields, *targets
+        ).order_by("pk")
+
+        changed, last = 0, 0
+        while True:
+            batch = list(queryset.filter(pk__gt=last)[:batch_size])
+            if not batch:
+                return changed
+            last = batch[-1].pk
+            stale = [obj for obj in batch if self.rerender(obj, targets)]
+            model.objects.bulk_update(stale, targets)
+            notify_profiles_changed(
+                getattr(obj, profile_attribute) for obj in stale
+            )
+            changed += len(stale)
+
+    def rerender(self, obj, targets):
+        before = [getattr(obj, target) for target in targets]
+        obj.render_markdown()
+        return before != [getattr(obj, target) for target in targets]
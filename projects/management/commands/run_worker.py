@@ -0,0 +1,62 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from projects.jobs import work
+
+
+def _init_worker():
+    django.setup()
+    connections.close_all()
+
+
+def _work(once, poll_interval):
+    try:
+        return work(once=once, poll_interval=poll_interval)
+    except KeyboardInterrupt:
+        return 0
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of worker processes (1 runs jobs inline).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds to wait before looking for jobs again when idle.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once no job is due instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        once, poll_interval = options["once"], options["poll_interval"]
+        workers = options["workers"]
+
+        if workers <= 1:
+            done = _work(once, poll_interval)
+        else:
+            # Forked workers must not share the parent's connections.
+            connections.close_all()
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker
+            ) as executor:
+                done = sum(
+                    executor.map(
+                        _work, [once] * workers, [poll_interval] * workers
+                    )
+                )
+
+        self.stdout.write(f"Ran {done} jobs.")
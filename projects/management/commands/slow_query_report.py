@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from projects import slow_queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Report the slow query fingerprints with the most total time, with "
+        "their EXPLAIN plans."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Number of fingerprints to report.",
+        )
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Clear the totals afterwards, so that the next report only "
+            "covers the queries run since this one.",
+        )
+
+    def handle(self, *args, **options):
+        entries = slow_queries.top(options["limit"])
+        if not entries:
+            self.stdout.write("No slow queries recorded.")
+
+        for rank, entry in enumerate(entries, 1):
+            self.write_entry(rank, entry)
+
+        if options["reset"]:
+            slow_queries.reset()
+
+    def write_entry(self, rank, entry):
+        self.stdout.write(
+            f"#{rank} {entry['count']} executions, "
+            f"{entry['total']:.3f}s total, "
+            f"{entry['total'] / entry['count']:.3f}s average, "
+            f"{entry['max']:.3f}s max"
+        )
+        self.stdout.write(f"    {entry['fingerprint']}")
+        try:
+            plan = slow_queries.explain(entry, connection)
+        except Exception as error:
+            # The sample may reference rows or tables that are gone.
+            self.stdout.write(f"    EXPLAIN failed: {error}")
+            plan = None
+        for row in plan or []:
+            self.stdout.write(
+                "    | "
+                + ", ".join(
+                    f"{column}={value}" for column, value in row.items()
+                )
+            )
+        self.stdout.write("")
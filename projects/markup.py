@@ -0,0 +1,13 @@
+from markdown_it import MarkdownIt
+
+# CommonMark with tables and strikethrough but without raw HTML, which is
+# escaped, so the output only holds markup the renderer produced itself.
+# Links and images with javascript:, vbscript:, file: or data: URLs are
+# left as text, except data: URLs of GIF, PNG, JPEG and WebP images, which
+# cannot run script.
+markdown = MarkdownIt("js-default")
+
+
+def render_markdown(text):
+    """Render user-written markdown to HTML that is safe to embed."""
+    return markdown.render(text or "")
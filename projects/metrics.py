@@ -0,0 +1,27 @@
+from django.core.cache import cache
+
+INDEX_KEY = "projects:metrics"
+
+
+def metric_key(name):
+    return f"projects:metrics:{name}"
+
+
+def increment(name, delta=1):
+    """Add to a counter kept in the cache, shared by all workers when the
+    cache is."""
+    key = metric_key(name)
+    if cache.add(key, delta, None):
+        # First sighting: remember the name so that counters() lists it.
+        cache.set(INDEX_KEY, {*cache.get(INDEX_KEY, set()), name}, None)
+        return
+    try:
+        cache.incr(key, delta)
+    except ValueError:
+        cache.add(key, delta, None)
+
+
+def counters():
+    names = sorted(cache.get(INDEX_KEY, set()))
+    values = cache.get_many([metric_key(name) for name in names])
+    return {name: values.get(metric_key(name), 0) for name in names}
@@ -0,0 +1,422 @@
+import gzip
+import hashlib
+import re
+import threading
+import time
+import zlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError, connection
+from django.http import JsonResponse
+from django.urls import Resolver404, resolve
+from django.utils.cache import has_vary_header, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+
+from . import metrics, profiling
+from .exceptions import StatementTimeout
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = re.compile(
+    r"^(text/|application/(json|javascript|xml)|image/svg\+xml)"
+)
+# Dynamic content: the top qualities cost far more CPU than they save.
+BROTLI_QUALITY = 5
+GZIP_LEVEL = 6
+
+
+def accepted_encodings(header):
+    """Map the codings of an Accept-Encoding header to their q-values."""
+    codings = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        match = re.search(r"q=([0-9.]+)", params)
+        try:
+            codings[coding.strip().lower()] = float(match[1]) if match else 1
+        except ValueError:
+            continue
+    return codings
+
+
+def negotiate_encoding(header):
+    """The coding to use for a request, brotli winning ties with gzip, or
+    None if the client accepts neither."""
+    codings = accepted_encodings(header)
+    available = ["br", "gzip"] if brotli else ["gzip"]
+    q, _, coding = max(
+        (codings.get(coding, codings.get("*", 0)), -position, coding)
+        for position, coding in enumerate(available)
+    )
+    return coding if q > 0 else None
+
+
+def compress(content, encoding):
+    if encoding == "br":
+        return brotli.compress(content, quality=BROTLI_QUALITY)
+    return gzip.compress(content, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def stream_compressor(encoding):
+    """The (feed, finish) functions of an incremental compressor."""
+    if encoding == "br":
+        compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+        return compressor.process, compressor.finish
+    compressor = zlib.compressobj(
+        GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS
+    )
+    return compressor.compress, compressor.flush
+
+
+def compress_chunks(chunks, encoding):
+    feed, finish = stream_compressor(encoding)
+    for chunk in chunks:
+        data = feed(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def compress_async_chunks(chunks, encoding):
+    feed, finish = stream_compressor(encoding)
+    async for chunk in chunks:
+        data = feed(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+def variant_cache_key(content, encoding):
+    digest = hashlib.blake2b(content, digest_size=16).hexdigest()
+    return f"projects:compressed:{encoding}:{digest}"
+
+
+def cached_compress(content, encoding):
+    key = variant_cache_key(content, encoding)
+    compressed = cache.get(key)
+    if compressed is None:
+        compressed = compress(content, encoding)
+        cache.set(key, compressed, settings.COMPRESSION_CACHE_TIMEOUT)
+    return compressed
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress text and JSON responses with brotli (when installed) or
+    gzip, as negotiated with Accept-Encoding.
+
+    Responses under COMPRESSION_MIN_SIZE bytes are left alone. Streaming
+    responses are compressed chunk by chunk as they are sent. Responses
+    that carry an ETag are the representations served over and over from
+    the document and snapshot caches, so their compressed variants are
+    cached by content digest instead of being recompressed on every hit.
+
+    Responses that may reflect a secret next to attacker-controlled input
+    (BREACH) are never compressed: those that used the CSRF token and
+    those that vary on Cookie, such as the admin and login pages.
+    """
+
+    def process_response(self, request, response):
+        if not self.is_compressible(response) or self.may_carry_secrets(
+            request, response
+        ):
+            return response
+
+        patch_vary_headers(response, ("Accept-Encoding",))
+        encoding = negotiate_encoding(
+            request.META.get("HTTP_ACCEPT_ENCODING", "")
+        )
+        if encoding is None:
+            return response
+
+        if response.streaming:
+            self.compress_streaming(response, encoding)
+        elif not self.compress_content(response, encoding):
+            return response
+        self.mark_encoded(response, encoding)
+        return response
+
+    def mark_encoded(self, response, encoding):
+        response.headers["Content-Encoding"] = encoding
+        # Compression changes the bytes, so only weak comparison may match.
+        etag = response.get("ETag", "")
+        if etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+
+    def is_compressible(self, response):
+        return (
+            not response.has_header("Content-Encoding")
+            and COMPRESSIBLE_TYPES.match(response.get("Content-Type", ""))
+            and (
+                response.streaming
+                or len(response.content) >= settings.COMPRESSION_MIN_SIZE
+            )
+        )
+
+    def may_carry_secrets(self, request, response):
+        return request.META.get("CSRF_COOKIE_NEEDS_UPDATE") or (
+            has_vary_header(response, "Cookie")
+        )
+
+    def compress_content(self, response, encoding):
+        content = response.content
+        if response.has_header("ETag"):
+            compressed = cached_compress(content, encoding)
+        else:
+            compressed = compress(content, encoding)
+        if len(compressed) >= len(content):
+            return False
+
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        return True
+
+    def compress_streaming(self, response, encoding):
+        chunks = response.streaming_content
+        if response.is_async:
+            response.streaming_content = compress_async_chunks(
+                chunks, encoding
+            )
+        else:
+            response.streaming_content = compress_chunks(chunks, encoding)
+        # The compressed length is only known once the stream has ended.
+        del response.headers["Content-Length"]
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+HEAVY_VIEWS = re.compile(r"(-list|-facets|^changes|^admin:.*_changelist)$")
+
+
+def endpoint_class(request):
+    """The concurrency pool of a request, None for health checks.
+
+    Classifying runs before authentication: the Authorization header only
+    suggests that a write will be let through, it is not checked here.
+    """
+    path = request.path_info
+    if path == "/health/":
+        return None
+    if path.startswith("/token/"):
+        return "token"
+    if request.method in SAFE_METHODS:
+        return read_class(path)
+    # A batch costs as much as a list, whoever sends it; other anonymous
+    # writes are rejected by the API.
+    if path.startswith("/batch/"):
+        return "heavy"
+    return "writes" if "HTTP_AUTHORIZATION" in request.META else "heavy"
+
+
+def read_class(path):
+    try:
+        match = resolve(path)
+    except Resolver404:
+        return "cached"
+    return "heavy" if HEAVY_VIEWS.search(match.view_name) else "cached"
+
+
+class ConcurrencyLimiter:
+    """Bounds the requests of one pool in flight in this process and keeps
+    an exponentially weighted average of their latency."""
+
+    smoothing = 0.2
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.in_flight = 0
+        self.latency = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self, timeout):
+        with self.condition:
+            if not self.condition.wait_for(
+                lambda: self.in_flight < self.limit, timeout
+            ):
+                return False
+            self.in_flight += 1
+            return True
+
+    def release(self, elapsed):
+        with self.condition:
+            self.in_flight -= 1
+            self.latency += self.smoothing * (elapsed - self.latency)
+            self.condition.notify()
+
+
+class LoadSheddingMiddleware:
+    """Limit in-flight requests per endpoint class (CONCURRENCY_LIMITS):
+    cheap cached reads, heavy lists, writes and /token/.
+
+    A request that finds its pool full waits up to
+    CONCURRENCY_QUEUE_TIMEOUT for a slot and is then shed with a 503 and
+    Retry-After. While a pool's average latency is above
+    CONCURRENCY_LATENCY_TARGET its requests are shed at once instead of
+    queueing, except for writes, which always get their queue time.
+    Health checks are never limited, and every pool has its own capacity,
+    so read spikes cannot starve authenticated writes.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.limiters = {
+            name: ConcurrencyLimiter(limit)
+            for name, limit in settings.CONCURRENCY_LIMITS.items()
+        }
+
+    def __call__(self, request):
+        pool = endpoint_class(request)
+        limiter = self.limiters.get(pool)
+        if limiter is None:
+            return self.get_response(request)
+        if not limiter.acquire(self.queue_timeout(pool, limiter)):
+            metrics.increment(f"requests_shed:{pool}")
+            return self.shed()
+
+        start = time.monotonic()
+        try:
+            return self.get_response(request)
+        finally:
+            limiter.release(time.monotonic() - start)
+
+    def queue_timeout(self, pool, limiter):
+        if pool != "writes" and (
+            limiter.latency > settings.CONCURRENCY_LATENCY_TARGET
+        ):
+            return 0
+        return settings.CONCURRENCY_QUEUE_TIMEOUT
+
+    def shed(self):
+        return JsonResponse(
+            {"detail": "The server is overloaded, retry later."},
+            status=503,
+            headers={"Retry-After": str(settings.CONCURRENCY_RETRY_AFTER)},
+        )
+
+
+# MySQL: "maximum statement execution time exceeded".
+MYSQL_STATEMENT_TIMEOUT = 3024
+
+
+class StatementDeadline:
+    """Database execute wrapper that stops statements running past a
+    deadline: with a MAX_EXECUTION_TIME hint on MySQL SELECTs and with a
+    progress handler that interrupts the statement on SQLite.
+
+    Each statement gets the smaller of timeout and the time left until
+    the deadline. Statements that time out raise StatementTimeout.
+    """
+
+    def __init__(self, deadline, timeout):
+        self.deadline = deadline
+        self.timeout = timeout
+        self.view_name = None
+
+    def remaining(self):
+        return min(self.timeout, self.deadline - time.monotonic())
+
+    def __call__(self, execute, sql, params, many, context):
+        wrapper = context["connection"]
+        remaining = self.remaining()
+        if remaining <= 0:
+            self.timed_out()
+
+        try:
+            sql = self.arm(sql, wrapper, remaining)
+            return execute(sql, params, many, context)
+        except OperationalError as error:
+            if self.is_timeout(error, wrapper.vendor):
+                self.timed_out(error)
+            raise
+        finally:
+            if wrapper.vendor == "sqlite":
+                wrapper.connection.set_progress_handler(None, 0)
+
+    def arm(self, sql, wrapper, seconds):
+        """Make the statement stop after seconds, returning the SQL to run."""
+        if wrapper.vendor == "mysql" and sql.startswith("SELECT "):
+            milliseconds = max(1, int(seconds * 1000))
+            return (
+                f"SELECT /*+ MAX_EXECUTION_TIME({milliseconds}) */ {sql[7:]}"
+            )
+        if wrapper.vendor == "sqlite":
+            stop_at = time.monotonic() + seconds
+            wrapper.connection.set_progress_handler(
+                lambda: time.monotonic() > stop_at, 1000
+            )
+        return sql
+
+    def is_timeout(self, error, vendor):
+        if vendor == "mysql":
+            return error.args[0] == MYSQL_STATEMENT_TIMEOUT
+        return vendor == "sqlite" and str(error) == "interrupted"
+
+    def timed_out(self, error=None):
+        metrics.increment(f"statement_timeouts:{self.view_name}")
+        raise StatementTimeout() from error
+
+
+class StatementDeadlineMiddleware:
+    """Give each request a database budget of REQUEST_BUDGET seconds, or
+    less when the client says in X-Request-Timeout that it gives up
+    earlier, and cap every statement at the view's statement_timeouts
+    entry for the action (STATEMENT_TIMEOUT by default).
+
+    Timed-out statements become a 504 response, from DRF's exception
+    handler in API views and from process_exception elsewhere, and are
+    counted in the statement_timeouts:<view name> metric.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        deadline = StatementDeadline(
+            time.monotonic() + self.request_budget(request),
+            settings.STATEMENT_TIMEOUT,
+        )
+        request.statement_deadline = deadline
+        with connection.execute_wrapper(deadline):
+            return self.get_response(request)
+
+    def request_budget(self, request):
+        budget = settings.REQUEST_BUDGET
+        try:
+            return min(budget, float(request.headers["X-Request-Timeout"]))
+        except (KeyError, ValueError):
+            return budget
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        deadline = request.statement_deadline
+        deadline.view_name = request.resolver_match.view_name
+        action = getattr(view_func, "actions", {}).get(request.method.lower())
+        timeouts = getattr(
+            getattr(view_func, "cls", None), "statement_timeouts", {}
+        )
+        deadline.timeout = timeouts.get(action, deadline.timeout)
+
+    def process_exception(self, request, exception):
+        if isinstance(exception, StatementTimeout):
+            return JsonResponse(
+                {"detail": str(exception.detail)},
+                status=exception.status_code,
+            )
+
+
+class RequestProfilerMiddleware:
+    """Profile requests from staff users that add ?_profile=1, and a
+    REQUEST_PROFILER_SAMPLE_PERCENT share of all requests, with cProfile.
+
+    The call graph (a pstats dump) and the SQL each profiled request ran
+    are stored in REQUEST_PROFILER_DIR and listed for staff at
+    /admin/request-profiles/.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if profiling.should_profile(request):
+            return profiling.profile_request(request, self.get_response)
+        return self.get_response(request)
@@ -0,0 +1,55 @@
+from django.db import migrations
+
+
+def normalize(value):
+    return " ".join((value or "").split())
+
+
+def canonicalize_project_skills(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    Skill = apps.get_model("projects", "Skill")
+    ProjectSkill = Project.skills.through
+
+    projects = Project.objects.only("id", "keyword", "key_skill")
+    names = {}
+    for project in projects.iterator():
+        for value in (project.keyword, project.key_skill):
+            name = normalize(value)
+            if name:
+                names.setdefault(name.casefold()[:50], name)
+
+    Skill.objects.bulk_create(
+        [Skill(name=name, slug=slug) for slug, name in names.items()],
+        ignore_conflicts=True,
+    )
+    skill_ids = dict(Skill.objects.values_list("slug", "id"))
+
+    links = []
+    for project in projects.iterator():
+        keyword = normalize(project.keyword)
+        key_skill = normalize(project.key_skill)
+        if (keyword, key_skill) != (project.keyword, project.key_skill):
+            Project.objects.filter(pk=project.pk).update(
+                keyword=keyword, key_skill=key_skill
+            )
+        for slug in {keyword.casefold()[:50], key_skill.casefold()[:50]}:
+            if slug:
+                links.append(
+                    ProjectSkill(project_id=project.id, skill_id=skill_ids[slug])
+                )
+
+    ProjectSkill.objects.bulk_create(
+        links, batch_size=1000, ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0006_skill_project_skills"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            canonicalize_project_skills, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.3 on 2026-10-19 11:40
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0007_canonicalize_project_skills"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProfileSnapshot",
+            fields=[
+                (
+                    "profile",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="snapshot",
+                        serialize=False,
+                        to="projects.profile",
+                    ),
+                ),
+                ("document", models.JSONField()),
+                ("etag", models.CharField(max_length=34)),
+                ("built_at", models.DateTimeField()),
+                ("stale_since", models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
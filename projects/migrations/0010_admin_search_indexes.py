@@ -0,0 +1,39 @@
+# Generated by Django 4.2.3 on 2026-10-19 11:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0009_changelogentry"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="certificate",
+            name="name",
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name="certifyinginstitution",
+            name="name",
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name="profile",
+            name="name",
+            field=models.CharField(db_index=True, max_length=100),
+        ),
+        migrations.AlterField(
+            model_name="project",
+            name="name",
+            field=models.CharField(db_index=True, max_length=50),
+        ),
+        migrations.AddIndex(
+            model_name="certificate",
+            index=models.Index(
+                fields=["certifying_institution", "timestamp"],
+                name="projects_ce_certify_6ba3e9_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.3 on 2026-10-19 11:51
+
+from django.db import migrations, models
+from django.db.models import Count
+
+# The natural keys made unique below, as (model, fields).
+NATURAL_KEYS = [
+    ("CertifyingInstitution", ("url",)),
+    ("Profile", ("github",)),
+    ("Project", ("profile", "github_url")),
+]
+
+
+def check_duplicates(apps, schema_editor):
+    """Stop, before any constraint is added, on rows sharing a natural key.
+
+    Merging them would mean choosing which profile or project survives, so
+    they are listed for the operator to resolve and the migration rerun.
+    """
+    problems = []
+    for model_name, fields in NATURAL_KEYS:
+        model = apps.get_model("projects", model_name)
+        duplicates = (
+            model.objects.values(*fields)
+            .annotate(rows=Count("pk"))
+            .filter(rows__gt=1)
+            .order_by(*fields)
+        )
+        problems.extend(f"{model_name} {key}" for key in duplicates.iterator())
+    if problems:
+        raise RuntimeError(
+            "Resolve the rows sharing a natural key before migrating:\n"
+            + "\n".join(problems)
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0010_admin_search_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(check_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="certifyinginstitution",
+            name="url",
+            field=models.URLField(unique=True),
+        ),
+        migrations.AlterField(
+            model_name="profile",
+            name="github",
+            field=models.URLField(unique=True),
+        ),
+        migrations.AlterUniqueTogether(
+            name="project",
+            unique_together={("profile", "github_url")},
+        ),
+    ]
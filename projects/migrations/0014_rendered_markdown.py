@@ -0,0 +1,45 @@
+# Generated by Django 4.2.3 on 2026-10-19 12:31
+
+from django.db import migrations, models
+from django.utils import timezone
+from markdown_it import MarkdownIt
+
+
+def render_markdown_columns(apps, schema_editor):
+    markdown = MarkdownIt("js-default")
+    for model_name, source, target in [
+        ("Profile", "bio", "bio_html"),
+        ("Project", "description", "description_html"),
+    ]:
+        model = apps.get_model("projects", model_name)
+        batch = []
+        for obj in model.objects.only("id", source).iterator():
+            setattr(obj, target, markdown.render(getattr(obj, source)))
+            batch.append(obj)
+        model.objects.bulk_update(batch, [target], batch_size=1000)
+
+    # Snapshots built before have no HTML in them.
+    ProfileSnapshot = apps.get_model("projects", "ProfileSnapshot")
+    ProfileSnapshot.objects.update(stale_since=timezone.now())
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0013_job"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="bio_html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="description_html",
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(
+            render_markdown_columns, migrations.RunPython.noop
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 4.2.3 on 2026-10-19 12:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0014_rendered_markdown"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="profile",
+            name="avatar",
+            field=models.JSONField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="profile",
+            name="avatar_original",
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+    ]
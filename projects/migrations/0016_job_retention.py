@@ -0,0 +1,44 @@
+# Generated by Django 4.2.3 on 2026-10-19 13:30
+
+from django.db import migrations, models
+
+
+def keep_queued_dedup_keys(apps, schema_editor):
+    """dedup_key becomes unique and only marks queued jobs: clear it on the
+    other jobs and on all but the oldest queued job of each key."""
+    Job = apps.get_model("projects", "Job")
+    Job.objects.exclude(status="queued").update(dedup_key=None)
+    seen = set()
+    duplicates = []
+    queued = Job.objects.filter(dedup_key__isnull=False).order_by("pk")
+    for pk, key in queued.values_list("pk", "dedup_key").iterator():
+        if key in seen:
+            duplicates.append(pk)
+        seen.add(key)
+    Job.objects.filter(pk__in=duplicates).update(dedup_key=None)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("projects", "0015_profile_avatar"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            keep_queued_dedup_keys, migrations.RunPython.noop
+        ),
+        migrations.AlterField(
+            model_name="job",
+            name="dedup_key",
+            field=models.CharField(
+                blank=True, max_length=200, null=True, unique=True
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="job",
+            index=models.Index(
+                fields=["status", "finished_at"],
+                name="projects_jo_status_4b43d5_idx",
+            ),
+        ),
+    ]
@@ -1,41 +1,279 @@
 from django.db import models
 
+from .markup import render_markdown
 
-class Profile(models.Model):
-    name = models.CharField(max_length=100)
-    github = models.URLField()
+
+def normalize_skill(value):
+    return " ".join(value.split())
+
+
+def skill_slug(value):
+    return normalize_skill(value).casefold()[:50]
+
+
+class SkillQuerySet(models.QuerySet):
+    def for_values(self, *values):
+        names = {}
+        for value in values:
+            name = normalize_skill(value or "")
+            if name:
+                names.setdefault(skill_slug(name), name)
+
+        self.bulk_create(
+            [Skill(name=name, slug=slug) for slug, name in names.items()],
+            ignore_conflicts=True,
+        )
+        return self.filter(slug__in=names)
+
+
+class VersionedModel(models.Model):
+    version = models.PositiveIntegerField(default=1)
+
+    # Set to the version a write was based on to make the next save() a
+    # conditional UPDATE that only succeeds if nobody wrote in between.
+    expected_version = None
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        previous = self.version
+        if not self._state.adding and update_fields != []:
+            base = self.expected_version
+            self.version = (self.version if base is None else base) + 1
+            if update_fields is not None:
+                kwargs["update_fields"] = [*update_fields, "version"]
+        try:
+            super().save(*args, **kwargs)
+        except Exception:
+            self.version = previous
+            raise
+        finally:
+            self.expected_version = None
+
+    def _do_update(self, base_qs, using, pk_val, values, *args, **kwargs):
+        if self.expected_version is not None:
+            base_qs = base_qs.filter(version=self.expected_version)
+        return super()._do_update(
+            base_qs, using, pk_val, values, *args, **kwargs
+        )
+
+
+class RenderedMarkdownModel(models.Model):
+    """Keeps the HTML of each markdown field in the column named in
+    markdown_fields, rendered when the field is saved instead of on every
+    read. Writes that bypass save() call render_rows() on their rows."""
+
+    markdown_fields = {}
+
+    class Meta:
+        abstract = True
+
+    @classmethod
+    def render_rows(cls, rows):
+        for row in rows:
+            for source, target in cls.markdown_fields.items():
+                if source in row:
+                    row[target] = render_markdown(row[source])
+
+    def render_markdown(self, sources=None):
+        """Render the markdown fields in sources (all by default) and
+        return the names of the HTML columns written."""
+        targets = []
+        for source, target in self.markdown_fields.items():
+            if sources is None or source in sources:
+                setattr(self, target, render_markdown(getattr(self, source)))
+                targets.append(target)
+        return targets
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        targets = self.render_markdown(update_fields)
+        if update_fields is not None and targets:
+            kwargs["update_fields"] = [*update_fields, *targets]
+        super().save(*args, **kwargs)
+
+
+class Skill(models.Model):
+    name = models.CharField(max_length=50)
+    slug = models.CharField(max_length=50, unique=True)
+
+    objects = SkillQuerySet.as_manager()
+
+    def __str__(self):
+        return self.name
+
+
+class Profile(RenderedMarkdownModel, VersionedModel):
+    name = models.CharField(max_length=100, db_index=True)
+    github = models.URLField(unique=True)
     linkedin = models.URLField()
     bio = models.TextField()
+    bio_html = models.TextField(blank=True, editable=False)
+    # The latest uploaded image and, once rendered from it by a job, the
+    # names of its thumbnails by format and size (see projects.avatars).
+    avatar_original = models.CharField(
+        max_length=100, blank=True, editable=False
+    )
+    avatar = models.JSONField(null=True, blank=True, editable=False)
+
+    markdown_fields = {"bio": "bio_html"}
 
     def __str__(self):
         return self.name
-    
 
-class Project(models.Model):
-    name = models.CharField(max_length=50)
+
+class Project(RenderedMarkdownModel, VersionedModel):
+    name = models.CharField(max_length=50, db_index=True)
     description = models.TextField(max_length=500)
+    description_html = models.TextField(blank=True, editable=False)
     github_url = models.URLField()
     keyword = models.CharField(max_length=50)
     key_skill = models.CharField(max_length=50)
     profile = models.ForeignKey(Profile, on_delete=models.CASCADE, related_name='projects')
+    skills = models.ManyToManyField(Skill, related_name="projects", blank=True)
+
+    markdown_fields = {"description": "description_html"}
+
+    class Meta:
+        unique_together = [("profile", "github_url")]
 
     def __str__(self):
         return self.name
-    
 
-class CertifyingInstitution(models.Model):
-    name = models.CharField(max_length=100)
-    url = models.URLField()
+    def save(self, *args, **kwargs):
+        self.keyword = normalize_skill(self.keyword)
+        self.key_skill = normalize_skill(self.key_skill)
+        super().save(*args, **kwargs)
+
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or {"keyword", "key_skill"} & set(
+            update_fields
+        ):
+            self.skills.set(
+                Skill.objects.for_values(self.keyword, self.key_skill)
+            )
+
+    @classmethod
+    def sync_skills(cls, projects):
+        """Relink the skills of projects written without save()."""
+        skills = Skill.objects.for_values(
+            *(value for p in projects for value in (p.keyword, p.key_skill))
+        )
+        skill_ids = dict(skills.values_list("slug", "id"))
+
+        through = cls.skills.through
+        through.objects.filter(project__in=projects).delete()
+        through.objects.bulk_create(
+            [
+                through(project_id=project.pk, skill_id=skill_ids[slug])
+                for project in projects
+                for slug in {
+                    skill_slug(project.keyword),
+                    skill_slug(project.key_skill),
+                }
+                if slug
+            ],
+            ignore_conflicts=True,
+        )
+
+
+class CertifyingInstitution(VersionedModel):
+    name = models.CharField(max_length=100, db_index=True)
+    url = models.URLField(unique=True)
 
     def __str__(self):
         return self.name
 
 
-class Certificate(models.Model):
-    name = models.CharField(max_length=100)
+class Certificate(VersionedModel):
+    name = models.CharField(max_length=100, db_index=True)
     certifying_institution = models.ForeignKey(CertifyingInstitution, on_delete=models.CASCADE, related_name='certificates')
     timestamp = models.DateTimeField(auto_now_add=True)
     profiles = models.ManyToManyField(Profile, related_name='certificates')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["certifying_institution", "timestamp"]),
+        ]
+
+    def __str__(self):
+        return self.name
+
+
+class ProfileSnapshot(models.Model):
+    profile = models.OneToOneField(
+        Profile,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="snapshot",
+    )
+    document = models.JSONField()
+    etag = models.CharField(max_length=34)
+    built_at = models.DateTimeField()
+    stale_since = models.DateTimeField(null=True, blank=True)
+
+    @property
+    def is_stale(self):
+        return self.stale_since is not None and (
+            self.stale_since >= self.built_at
+        )
+
+    def __str__(self):
+        return f"Snapshot of profile {self.profile_id}"
+
+
+class ChangeLogEntry(models.Model):
+    UPSERT = "upsert"
+    DELETE = "delete"
+    ACTION_CHOICES = [(UPSERT, "Upsert"), (DELETE, "Delete")]
+
+    resource = models.CharField(max_length=30)
+    object_id = models.BigIntegerField()
+    action = models.CharField(max_length=6, choices=ACTION_CHOICES)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.action} {self.resource} {self.object_id}"
+
+
+class Job(models.Model):
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATUS_CHOICES = [
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+
+    task = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict)
+    status = models.CharField(
+        max_length=9, choices=STATUS_CHOICES, default=QUEUED
+    )
+    # Set while a deduplicated job is queued, cleared once it is claimed:
+    # at most one queued job per task and payload.
+    dedup_key = models.CharField(
+        max_length=200, null=True, blank=True, unique=True
+    )
+    attempts = models.PositiveSmallIntegerField(default=0)
+    max_attempts = models.PositiveSmallIntegerField(default=3)
+    run_after = models.DateTimeField()
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    result = models.JSONField(null=True, blank=True)
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+            models.Index(fields=["status", "finished_at"]),
+        ]
+
     def __str__(self):
-        return self.name
\ No newline at end of file
+        return f"{self.task} #{self.pk} ({self.status})"
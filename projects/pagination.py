@@ -0,0 +1,59 @@
+from django.conf import settings
+from rest_framework.pagination import LimitOffsetPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from .counting import cached_count, estimated_count
+
+
+class CountingLimitOffsetPagination(LimitOffsetPagination):
+    """Limit/offset pagination, enabled by ?limit=, whose totals stay cheap
+    on large tables.
+
+    Counts up to API_COUNT_THRESHOLD are exact and bounded by the threshold.
+    Above it an unfiltered listing reports the write-maintained cached
+    count or MySQL's estimate (API_COUNT_STRATEGY) and a filtered one
+    reports the threshold as a lower bound; count_exact tells them apart.
+    """
+
+    max_limit = 1000
+
+    def get_count(self, queryset):
+        threshold = settings.API_COUNT_THRESHOLD
+        count = queryset.order_by()[: threshold + 1].count()
+        self.count_exact = count <= threshold
+        if self.count_exact:
+            return count
+        if queryset.query.where:
+            return threshold
+        return self.get_approximate_count(queryset) or count
+
+    def get_approximate_count(self, queryset):
+        if settings.API_COUNT_STRATEGY == "estimated":
+            return estimated_count(queryset)
+        return cached_count(queryset.model)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page = super().paginate_queryset(queryset, request, view)
+        return self.page
+
+    def get_next_link(self):
+        if self.count_exact or len(self.page) < self.limit:
+            return super().get_next_link()
+        # An approximate total must not hide pages past it.
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.limit_query_param, self.limit)
+        return replace_query_param(
+            url, self.offset_query_param, self.offset + self.limit
+        )
+
+    def get_paginated_response(self, data):
+        return Response(
+            {
+                "count": self.count,
+                "count_exact": self.count_exact,
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
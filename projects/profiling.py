@@ -0,0 +1,139 @@
+import cProfile
+import json
+import random
+import re
+import time
+import uuid
+from pathlib import Path
+
+from django.conf import settings
+from django.contrib import admin
+from django.db import connection
+from django.http import FileResponse, Http404
+from django.shortcuts import render
+from django.utils import timezone
+from rest_framework.exceptions import APIException
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+PROFILE_NAME = re.compile(r"^\d{8}T\d{6}-[0-9a-f]{8}$")
+DOWNLOADS = {"prof": "application/octet-stream", "json": "application/json"}
+
+
+class QueryRecorder:
+    """Execute wrapper keeping the SQL, parameters and duration of every
+    statement."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(
+                {
+                    "sql": sql,
+                    "params": repr(params),
+                    "many": many,
+                    "duration": time.perf_counter() - started,
+                }
+            )
+
+
+def profiles_dir():
+    return Path(settings.REQUEST_PROFILER_DIR)
+
+
+def is_staff(request):
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return user.is_staff
+    # API clients authenticate inside the view, with a bearer token.
+    try:
+        authenticated = JWTAuthentication().authenticate(request)
+    except APIException:
+        return False
+    return authenticated is not None and authenticated[0].is_staff
+
+
+def should_profile(request):
+    if request.GET.get("_profile") == "1" and is_staff(request):
+        return True
+    return random.random() * 100 < settings.REQUEST_PROFILER_SAMPLE_PERCENT
+
+
+def profile_request(request, get_response):
+    """Run get_response(request) under cProfile, recording its SQL, and
+    store both under REQUEST_PROFILER_DIR."""
+    profiler = cProfile.Profile()
+    recorder = QueryRecorder()
+    started = time.perf_counter()
+    with connection.execute_wrapper(recorder):
+        profiler.enable()
+        try:
+            response = get_response(request)
+        finally:
+            profiler.disable()
+
+    name = save_profile(
+        profiler,
+        {
+            "method": request.method,
+            "path": request.get_full_path(),
+            "status": response.status_code,
+            "duration": time.perf_counter() - started,
+            "queries": recorder.queries,
+        },
+    )
+    response["X-Request-Profile"] = name
+    return response
+
+
+def save_profile(profiler, details):
+    now = timezone.now()
+    name = f"{now:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+    directory = profiles_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+
+    profiler.dump_stats(directory / f"{name}.prof")
+    details = {"name": name, "created_at": now.isoformat(), **details}
+    (directory / f"{name}.json").write_text(json.dumps(details))
+
+    saved = sorted(directory.glob("*.json"))
+    for old in saved[: -settings.REQUEST_PROFILER_KEEP]:
+        old.unlink(missing_ok=True)
+        old.with_suffix(".prof").unlink(missing_ok=True)
+    return name
+
+
+def recent_profiles():
+    profiles = []
+    for path in sorted(profiles_dir().glob("*.json"), reverse=True):
+        details = json.loads(path.read_text())
+        queries = details.pop("queries")
+        details["query_count"] = len(queries)
+        details["query_time"] = sum(query["duration"] for query in queries)
+        profiles.append(details)
+    return profiles
+
+
+def profile_list(request):
+    context = {
+        **admin.site.each_context(request),
+        "title": "Request profiles",
+        "profiles": recent_profiles(),
+    }
+    return render(request, "admin/request_profiles.html", context)
+
+
+def profile_download(request, name, kind):
+    path = profiles_dir() / f"{name}.{kind}"
+    if not (PROFILE_NAME.match(name) and kind in DOWNLOADS and path.exists()):
+        raise Http404()
+    return FileResponse(
+        path.open("rb"),
+        as_attachment=True,
+        filename=path.name,
+        content_type=DOWNLOADS[kind],
+    )
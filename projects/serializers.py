@@ -1,14 +1,91 @@
+from django.conf import settings
 from rest_framework import serializers
-from .models import Profile, Project, CertifyingInstitution, Certificate
+from rest_framework.serializers import raise_errors_on_nested_writes
+from rest_framework.validators import UniqueTogetherValidator
+from .avatars import avatar_representation
+from .models import Profile, Project, CertifyingInstitution, Certificate, Job
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class MinimalUpdateMixin:
+    """Save only the fields whose value changed, and nothing at all when
+    the update is a no-op."""
+
+    def update(self, instance, validated_data):
+        raise_errors_on_nested_writes("update", self, validated_data)
+
+        changed, many_to_many = self.apply_changes(instance, validated_data)
+        many_to_many = {
+            attr: value
+            for attr, value in many_to_many.items()
+            if self.has_changed_many(instance, attr, value)
+        }
+        if changed or many_to_many:
+            # A many-to-many change is a write too: it bumps the version,
+            # conditionally when the view set expected_version.
+            instance.save(update_fields=changed or ["version"])
+        for attr, value in many_to_many.items():
+            getattr(instance, attr).set(value)
+        return instance
+
+    def apply_changes(self, instance, validated_data):
+        changed, many_to_many = [], {}
+        for attr, value in validated_data.items():
+            field = instance._meta.get_field(attr)
+            if field.many_to_many:
+                many_to_many[attr] = value
+            elif self.has_changed(instance, field, value):
+                setattr(instance, attr, value)
+                changed.append(field.name)
+        return changed, many_to_many
+
+    def has_changed_many(self, instance, attr, value):
+        current = getattr(instance, attr).values_list("pk", flat=True)
+        return set(current) != {getattr(obj, "pk", obj) for obj in value}
+
+    def has_changed(self, instance, field, value):
+        current = getattr(instance, field.attname)
+        if field.many_to_one:
+            return current != getattr(value, "pk", None)
+        return current != value
+
+
+class MarkupMixin:
+    """Add the stored HTML rendering of the model's markdown fields, as
+    <field>_html, when the context asks for markup "html" (?markup=html
+    in API views)."""
+
+    def get_fields(self):
+        fields = super().get_fields()
+        if self.context.get("markup") == "html":
+            for source, target in self.Meta.model.markdown_fields.items():
+                if source in fields:
+                    fields[target] = serializers.CharField(read_only=True)
+        return fields
+
+
+class AvatarField(serializers.Field):
+    """The src and per-format srcset of a profile's avatar thumbnails."""
+
+    def __init__(self, **kwargs):
+        super().__init__(read_only=True, **kwargs)
+
+    def to_representation(self, value):
+        return avatar_representation(value)
+
+
+class ProfileSerializer(
+    MarkupMixin, MinimalUpdateMixin, serializers.ModelSerializer
+):
+    avatar = AvatarField()
+
     class Meta:
         model = Profile
-        fields = ["id", "name", "github", "linkedin", "bio"]
+        fields = ["id", "name", "github", "linkedin", "bio", "avatar"]
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(
+    MarkupMixin, MinimalUpdateMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Project
         fields = [
@@ -20,9 +97,20 @@ class ProjectSerializer(serializers.ModelSerializer):
             "key_skill",
             "profile",
         ]
+        # Checked in validate() only when the natural key is written, so
+        # that other partial updates do not pay for the lookup.
+        validators = []
 
+    def validate(self, attrs):
+        if self.instance is None or {"profile", "github_url"} & attrs.keys():
+            UniqueTogetherValidator(
+                queryset=Project.objects.all(),
+                fields=["profile", "github_url"],
+            )(attrs, self)
+        return attrs
 
-class CertificateSerializer(serializers.ModelSerializer):
+
+class CertificateSerializer(MinimalUpdateMixin, serializers.ModelSerializer):
     class Meta:
         model = Certificate
         fields = ["id", "name", "certifying_institution", "timestamp", "profiles"]
@@ -34,7 +122,9 @@ class NestedCertificateSerializer(serializers.ModelSerializer):
         fields = ["id", "name", "timestamp"]
 
 
-class CertifyingInstitutionSerializer(serializers.ModelSerializer):
+class CertifyingInstitutionSerializer(
+    MinimalUpdateMixin, serializers.ModelSerializer
+):
     certificates = NestedCertificateSerializer(many=True)
 
     class Meta:
@@ -51,4 +141,117 @@ class CertifyingInstitutionSerializer(serializers.ModelSerializer):
                     **certificate_data
                 }
             )
-        return certifying_institution
\ No newline at end of file
+        return certifying_institution
+
+
+class NestedProjectSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Project
+        fields = [
+            "id",
+            "name",
+            "description",
+            "description_html",
+            "github_url",
+            "keyword",
+            "key_skill",
+        ]
+
+
+class NestedCertifyingInstitutionSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CertifyingInstitution
+        fields = ["id", "name", "url"]
+
+
+class ProfileCertificateSerializer(serializers.ModelSerializer):
+    certifying_institution = NestedCertifyingInstitutionSerializer()
+
+    class Meta:
+        model = Certificate
+        fields = ["id", "name", "timestamp", "certifying_institution"]
+
+
+class ProfileDocumentSerializer(serializers.ModelSerializer):
+    avatar = AvatarField()
+    projects = NestedProjectSerializer(many=True)
+    certificates = ProfileCertificateSerializer(many=True)
+
+    class Meta:
+        model = Profile
+        fields = ProfileSerializer.Meta.fields + [
+            "bio_html",
+            "projects",
+            "certificates",
+        ]
+
+
+class ProfileUpsertSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Profile
+        fields = ["name", "github", "linkedin", "bio"]
+        extra_kwargs = {"github": {"validators": []}}
+
+
+class ProjectUpsertSerializer(serializers.ModelSerializer):
+    profile_id = serializers.IntegerField()
+
+    class Meta:
+        model = Project
+        fields = [
+            "name",
+            "description",
+            "github_url",
+            "keyword",
+            "key_skill",
+            "profile_id",
+        ]
+
+
+class CertifyingInstitutionUpsertSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CertifyingInstitution
+        fields = ["name", "url"]
+        extra_kwargs = {"url": {"validators": []}}
+
+
+class JobSerializer(serializers.ModelSerializer):
+    error = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Job
+        fields = [
+            "id",
+            "task",
+            "status",
+            "attempts",
+            "result",
+            "error",
+            "created_at",
+            "finished_at",
+        ]
+
+    def get_error(self, job):
+        # The exception line only; the traceback stays in the database.
+        return job.error.strip().splitlines()[-1] if job.error else None
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    method = serializers.ChoiceField(
+        choices=["GET", "HEAD", "POST", "PUT", "PATCH", "DELETE"]
+    )
+    path = serializers.RegexField(r"^/")
+    body = serializers.JSONField(required=False, allow_null=True)
+
+
+class BatchSerializer(serializers.Serializer):
+    requests = BatchRequestSerializer(many=True, allow_empty=False)
+    parallel = serializers.BooleanField(default=False)
+    atomic = serializers.BooleanField(default=False)
+
+    def validate_requests(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(
+                f"At most {settings.BATCH_MAX_REQUESTS} requests allowed."
+            )
+        return value
@@ -0,0 +1,195 @@
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed,
+    post_delete,
+    post_init,
+    post_save,
+    pre_delete,
+)
+from django.dispatch import Signal, receiver
+
+from .changes import record_changes
+from .counting import adjust_cached_count
+from .documents import (
+    invalidate_profile_documents,
+    schedule_snapshot_rebuild,
+)
+from .models import (
+    Certificate,
+    CertifyingInstitution,
+    ChangeLogEntry,
+    Profile,
+    Project,
+)
+
+# Sent once the transaction that wrote to any portfolio model commits,
+# with the ids of every profile whose document the write may have changed.
+profiles_changed = Signal()
+
+# Sent by code that writes through bulk_create(update_conflicts=True),
+# which bypasses the per-instance save signals, with the number of rows
+# the write created.
+post_bulk_upsert = Signal()
+
+
+def notify_profiles_changed(profile_ids):
+    profile_ids = {pk for pk in profile_ids if pk is not None}
+    if profile_ids:
+        transaction.on_commit(
+            lambda: profiles_changed.send(
+                sender=Profile, profile_ids=profile_ids
+            )
+        )
+
+
+def certificate_profile_ids(certificates):
+    through = Certificate.profiles.through
+    return through.objects.filter(certificate__in=certificates).values_list(
+        "profile_id", flat=True
+    )
+
+
+@receiver(profiles_changed)
+def invalidate_documents(sender, profile_ids, **kwargs):
+    invalidate_profile_documents(profile_ids)
+    schedule_snapshot_rebuild(profile_ids)
+
+
+@receiver(post_init, sender=Project)
+def remember_project_profile(sender, instance, **kwargs):
+    instance._loaded_profile_id = instance.__dict__.get("profile_id")
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_delete, sender=Profile)
+def profile_changed(sender, instance, **kwargs):
+    notify_profiles_changed([instance.pk])
+
+
+@receiver(post_save, sender=Project)
+@receiver(post_delete, sender=Project)
+def project_changed(sender, instance, **kwargs):
+    notify_profiles_changed([instance.profile_id, instance._loaded_profile_id])
+    instance._loaded_profile_id = instance.profile_id
+
+
+@receiver(post_save, sender=Certificate)
+def certificate_saved(sender, instance, created, **kwargs):
+    if not created:
+        notify_profiles_changed(certificate_profile_ids([instance.pk]))
+
+
+@receiver(pre_delete, sender=Certificate)
+def certificate_deleted(sender, instance, **kwargs):
+    notify_profiles_changed(certificate_profile_ids([instance.pk]))
+
+
+@receiver(post_save, sender=CertifyingInstitution)
+@receiver(pre_delete, sender=CertifyingInstitution)
+def institution_changed(sender, instance, **kwargs):
+    if not kwargs.get("created"):
+        notify_profiles_changed(
+            certificate_profile_ids(instance.certificates.values("id"))
+        )
+
+
+@receiver(m2m_changed, sender=Certificate.profiles.through)
+def certificate_profiles_changed(sender, instance, action, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if isinstance(instance, Profile):
+        notify_profiles_changed([instance.pk])
+    elif action == "pre_clear":
+        notify_profiles_changed(certificate_profile_ids([instance.pk]))
+    else:
+        notify_profiles_changed(pk_set)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Certificate)
+@receiver(post_save, sender=CertifyingInstitution)
+def log_upsert(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk], ChangeLogEntry.UPSERT)
+    if sender is Certificate:
+        # Institutions embed their certificates.
+        record_changes(
+            CertifyingInstitution,
+            [instance.certifying_institution_id],
+            ChangeLogEntry.UPSERT,
+        )
+
+
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Certificate)
+@receiver(post_delete, sender=CertifyingInstitution)
+def log_delete(sender, instance, **kwargs):
+    record_changes(sender, [instance.pk], ChangeLogEntry.DELETE)
+    if sender is Certificate:
+        record_changes(
+            CertifyingInstitution,
+            [instance.certifying_institution_id],
+            ChangeLogEntry.UPSERT,
+        )
+
+
+@receiver(pre_delete, sender=Profile)
+def log_profile_certificates(sender, instance, **kwargs):
+    record_changes(
+        Certificate,
+        instance.certificates.values_list("id", flat=True),
+        ChangeLogEntry.UPSERT,
+    )
+
+
+@receiver(m2m_changed, sender=Certificate.profiles.through)
+def log_certificate_profiles(sender, instance, action, reverse, **kwargs):
+    if action not in ("post_add", "post_remove", "pre_clear"):
+        return
+
+    if not reverse:
+        ids = [instance.pk]
+    elif action == "pre_clear":
+        ids = instance.certificates.values_list("id", flat=True)
+    else:
+        ids = kwargs["pk_set"]
+    record_changes(Certificate, ids, ChangeLogEntry.UPSERT)
+
+
+@receiver(post_save, sender=Profile)
+@receiver(post_save, sender=Project)
+@receiver(post_save, sender=Certificate)
+@receiver(post_save, sender=CertifyingInstitution)
+def count_created(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: adjust_cached_count(sender, 1))
+
+
+@receiver(post_delete, sender=Profile)
+@receiver(post_delete, sender=Project)
+@receiver(post_delete, sender=Certificate)
+@receiver(post_delete, sender=CertifyingInstitution)
+def count_deleted(sender, instance, **kwargs):
+    transaction.on_commit(lambda: adjust_cached_count(sender, -1))
+
+
+@receiver(post_bulk_upsert)
+def bulk_upserted(sender, objects, created, **kwargs):
+    ids = [obj.pk for obj in objects]
+    record_changes(sender, ids, ChangeLogEntry.UPSERT)
+    if created:
+        transaction.on_commit(lambda: adjust_cached_count(sender, created))
+
+    if sender is Profile:
+        notify_profiles_changed(ids)
+    elif sender is Project:
+        notify_profiles_changed([obj.profile_id for obj in objects])
+    elif sender is CertifyingInstitution:
+        certificates = Certificate.objects.filter(
+            certifying_institution__in=ids
+        )
+        notify_profiles_changed(
+            certificate_profile_ids(certificates.values("id"))
+        )
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+
+from django.conf import settings
+
+NORMALIZERS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),
+    (re.compile(r"%s"), "?"),
+    # IN lists and multi-row VALUES differ only in length.
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(...)"),
+    (re.compile(r"\(\.\.\.\)(?:\s*,\s*\(\.\.\.\))+"), "(...)"),
+    (re.compile(r"\s+"), " "),
+]
+EXPLAIN_PREFIXES = {
+    "mysql": "EXPLAIN ",
+    "postgresql": "EXPLAIN ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+EXPLAINABLE = re.compile(r"^\s*(SELECT|UPDATE|DELETE)\b", re.IGNORECASE)
+
+
+def fingerprint(sql):
+    """The statement with its literals and placeholders replaced by ?, so
+    that executions of one query with different values group together."""
+    for pattern, replacement in NORMALIZERS:
+        sql = pattern.sub(replacement, sql)
+    return sql.strip()
+
+
+def queries_dir():
+    return Path(settings.SLOW_QUERY_DIR)
+
+
+def log_path(fingerprint):
+    digest = hashlib.md5(fingerprint.encode()).hexdigest()
+    return queries_dir() / f"{digest}.jsonl"
+
+
+def record(sql, params, many, duration):
+    """Append one slow execution to the log of its fingerprint.
+
+    The logs under SLOW_QUERY_DIR are shared by the web workers, the job
+    workers and the report command. Each execution is a single append of
+    one line, which concurrent processes cannot interleave.
+    """
+    query = fingerprint(sql)
+    line = json.dumps(
+        {
+            "fingerprint": query,
+            "sql": sql,
+            "params": params,
+            "many": many,
+            "duration": duration,
+        },
+        default=str,
+    )
+    queries_dir().mkdir(parents=True, exist_ok=True)
+    fd = os.open(log_path(query), os.O_WRONLY | os.O_APPEND | os.O_CREAT)
+    try:
+        os.write(fd, f"{line}\n".encode())
+    finally:
+        os.close(fd)
+
+
+def load(path):
+    """The totals of one fingerprint's log, with its latest execution as
+    the sample to explain."""
+    entry = {"count": 0, "total": 0.0, "max": 0.0}
+    with path.open() as file:
+        for line in file:
+            try:
+                execution = json.loads(line)
+            except ValueError:
+                # An append still being written.
+                continue
+            duration = execution.pop("duration")
+            entry.update(
+                execution,
+                count=entry["count"] + 1,
+                total=entry["total"] + duration,
+                max=max(entry["max"], duration),
+            )
+    return entry
+
+
+class SlowQueryLogger:
+    """Execute wrapper recording statements slower than
+    SLOW_QUERY_THRESHOLD seconds."""
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            if duration >= settings.SLOW_QUERY_THRESHOLD and not (
+                sql.startswith("EXPLAIN ")
+            ):
+                try:
+                    record(sql, params, many, duration)
+                except OSError:
+                    # Losing a sample must not fail the query.
+                    pass
+
+
+logger = SlowQueryLogger()
+
+
+def install(sender, connection, **kwargs):
+    """connection_created receiver wrapping every connection, in requests,
+    jobs and commands alike, with the slow query logger."""
+    if settings.SLOW_QUERY_THRESHOLD is None:
+        return
+    if logger not in connection.execute_wrappers:
+        # First, since execute_wrapper() blocks pop the last wrapper and
+        # the connection may be opened inside one.
+        connection.execute_wrappers.insert(0, logger)
+
+
+def top(limit):
+    """The limit fingerprints with the most total time, slowest first."""
+    entries = [load(path) for path in queries_dir().glob("*.jsonl")]
+    return sorted(entries, key=lambda entry: entry["total"], reverse=True)[
+        :limit
+    ]
+
+
+def explain(entry, connection):
+    """The plan of an entry's sample statement, as a list of row dicts, or
+    None when it cannot be explained."""
+    prefix = EXPLAIN_PREFIXES.get(connection.vendor)
+    if prefix is None or entry["many"] or not EXPLAINABLE.match(entry["sql"]):
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(prefix + entry["sql"], entry["params"])
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+
+def reset():
+    for path in queries_dir().glob("*.jsonl"):
+        path.unlink(missing_ok=True)
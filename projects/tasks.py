@@ -0,0 +1,58 @@
+from django.db import transaction
+
+from . import avatars
+from .changes import RESOURCES, record_changes
+from .documents import build_snapshots
+from .jobs import task
+from .models import ChangeLogEntry, Profile
+from .serializers import CertifyingInstitutionSerializer
+from .signals import notify_profiles_changed
+from .views import (
+    CertifyingInstitutionViewSet,
+    ProfileViewSet,
+    ProjectViewSet,
+)
+
+UPSERT_VIEWSETS = {
+    RESOURCES[viewset.queryset.model]: viewset
+    for viewset in (
+        ProfileViewSet,
+        ProjectViewSet,
+        CertifyingInstitutionViewSet,
+    )
+}
+
+
+@task("rebuild_snapshots")
+def rebuild_snapshots(profile_ids):
+    return {"rebuilt": len(build_snapshots(profile_ids))}
+
+
+@task("upsert")
+def upsert(resource, rows):
+    with transaction.atomic():
+        objects = UPSERT_VIEWSETS[resource]().perform_upsert(rows)
+    return {"ids": [obj.pk for obj in objects]}
+
+
+@task("create_certifying_institution")
+def create_certifying_institution(data):
+    serializer = CertifyingInstitutionSerializer(data=data)
+    serializer.is_valid(raise_exception=True)
+    with transaction.atomic():
+        institution = serializer.save()
+    return {"id": institution.pk}
+
+
+@task("render_avatar")
+def render_avatar(profile_id, original):
+    variants = avatars.render_avatar(profile_id, original)
+    if variants is None:
+        return {"updated": False}
+    with transaction.atomic():
+        updated = avatars.link_avatar(profile_id, original, variants)
+        if updated:
+            record_changes(Profile, [profile_id], ChangeLogEntry.UPSERT)
+    if updated:
+        notify_profiles_changed([profile_id])
+    return {"updated": updated}
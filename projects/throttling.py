@@ -0,0 +1,96 @@
+import hashlib
+
+from django.core.cache import caches
+from django.utils.connection import ConnectionProxy
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Token bucket throttle, per scope and per user (or IP when anonymous).
+
+    The scope is looked up in the view's throttle_scopes by action, then in
+    its throttle_scope; views with neither, or whose scope has no entry in
+    DEFAULT_THROTTLE_RATES, are not throttled. A rate of "N/period" is a
+    bucket of N tokens refilled at N per period, so clients may burst up to
+    N requests and are then held to the steady rate. Scopes with a
+    "<scope>_username" rate also draw from a bucket per submitted username,
+    whatever address the attempts come from.
+
+    Each bucket is stored as one float in the "shared" cache (GCRA): the
+    time at which it would be full again. Checking costs one get_many and
+    a set per bucket on a cache all workers see. Concurrent requests from
+    one client may race past the limit by at most the number of requests
+    in flight.
+    """
+
+    cache = ConnectionProxy(caches, "shared")
+
+    def __init__(self):
+        # The rate depends on the view, so it is only known in allow_request.
+        pass
+
+    def get_scope(self, view):
+        scopes = getattr(view, "throttle_scopes", {})
+        return scopes.get(getattr(view, "action", None)) or getattr(
+            view, "throttle_scope", None
+        )
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            ident = f"user-{request.user.pk}"
+        else:
+            ident = self.get_ident(request)
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def get_username_key(self, request):
+        data = request.data
+        username = data.get("username") if isinstance(data, dict) else None
+        if not isinstance(username, str) or not username:
+            return None
+        # Hashed to keep the key short and free of characters memcached
+        # rejects; folded since MySQL compares usernames without case.
+        digest = hashlib.sha256(username.casefold().encode()).hexdigest()
+        return self.cache_format % {
+            "scope": self.scope,
+            "ident": f"username-{digest[:32]}",
+        }
+
+    def get_buckets(self, request, view):
+        """The (cache key, rate) of each bucket the request draws from."""
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        buckets = [(self.get_cache_key(request, view), rates[self.scope])]
+        username_rate = rates.get(f"{self.scope}_username")
+        if username_rate is not None:
+            key = self.get_username_key(request)
+            if key is not None:
+                buckets.append((key, username_rate))
+        return buckets
+
+    def allow_request(self, request, view):
+        self.scope = self.get_scope(view)
+        if api_settings.DEFAULT_THROTTLE_RATES.get(self.scope) is None:
+            return True
+
+        buckets = self.get_buckets(request, view)
+        stored = self.cache.get_many([key for key, _ in buckets])
+        self.now = self.timer()
+        self.wait_seconds = 0
+        full_at = {}
+        for key, rate in buckets:
+            num_requests, duration = self.parse_rate(rate)
+            full_at[key] = max(stored.get(key, self.now), self.now) + (
+                duration / num_requests
+            )
+            self.wait_seconds = max(
+                self.wait_seconds, full_at[key] - self.now - duration
+            )
+        if self.wait_seconds > 0:
+            return False
+
+        for key, value in full_at.items():
+            self.cache.set(key, value, int(value - self.now) + 1)
+        return True
+
+    def wait(self):
+        return self.wait_seconds
@@ -1,6 +1,17 @@
 from django.urls import path, include
 from rest_framework import routers
-from .views import ProfileViewSet, ProjectViewSet, CertifyingInstitutionViewSet, CertificateViewSet
+from .avatars import avatar_file
+from .views import (
+    ProfileViewSet,
+    ProjectViewSet,
+    CertifyingInstitutionViewSet,
+    CertificateViewSet,
+    JobViewSet,
+    BatchView,
+    ChangesView,
+    HealthView,
+    MetricsView,
+)
 
 
 router = routers.DefaultRouter()
@@ -8,7 +19,13 @@ router.register(r"profiles", ProfileViewSet)
 router.register(r"projects", ProjectViewSet)
 router.register(r"certifying-institutions", CertifyingInstitutionViewSet)
 router.register(r"certificates", CertificateViewSet)
+router.register(r"jobs", JobViewSet)
 
 urlpatterns = [
+    path("avatars/<str:name>", avatar_file, name="avatar-file"),
+    path("batch/", BatchView.as_view(), name="batch"),
+    path("changes/", ChangesView.as_view(), name="changes"),
+    path("health/", HealthView.as_view(), name="health"),
+    path("metrics/", MetricsView.as_view(), name="metrics"),
     path("", include(router.urls)),
 ]
\ No newline at end of file
@@ -0,0 +1,98 @@
+from functools import cached_property
+
+from rest_framework import fields, relations
+
+# Fields whose to_representation() returns database values unchanged.
+PASSTHROUGH_FIELDS = (
+    fields.BooleanField,
+    fields.CharField,
+    fields.IntegerField,
+    fields.ReadOnlyField,
+    relations.PrimaryKeyRelatedField,
+)
+
+
+class ValuesSerializer:
+    """Render querysets exactly as serializer_class(many=True) would, but
+    from values_list() rows, without creating model instances.
+
+    The serializer's fields are compiled once into the columns to select
+    and the few conversions the database values still need. Only fields
+    backed by a model column or a many-to-many of primary keys are
+    supported, and "id" must be one of them.
+    """
+
+    def __init__(self, serializer_class, context=None):
+        self.serializer_class = serializer_class
+        self.context = context or {}
+        self.variants = {}
+
+    def with_context(self, **context):
+        """The ValuesSerializer for a serializer context that changes the
+        fields, e.g. markup="html". None values are ignored."""
+        context = {
+            key: value for key, value in context.items() if value is not None
+        }
+        if not context:
+            return self
+        key = tuple(sorted(context.items()))
+        if key not in self.variants:
+            self.variants[key] = ValuesSerializer(
+                self.serializer_class, {**self.context, **context}
+            )
+        return self.variants[key]
+
+    @cached_property
+    def plan(self):
+        serializer = self.serializer_class(context=self.context)
+        model = serializer.Meta.model
+        names = list(serializer.fields)
+        columns, converters, many = [], [], []
+        for position, (name, field) in enumerate(serializer.fields.items()):
+            if isinstance(field, relations.ManyRelatedField):
+                many.append((position, model._meta.get_field(field.source)))
+                continue
+            if field.source == "*" or "." in field.source:
+                raise ValueError(f"{name} is not backed by a model column.")
+            if not isinstance(field, PASSTHROUGH_FIELDS):
+                converters.append((len(columns), field.to_representation))
+            columns.append(field.source)
+        return names, columns, converters, many
+
+    def values(self, queryset):
+        _, columns, _, _ = self.plan
+        return queryset.prefetch_related(None).values_list(*columns)
+
+    def serialize(self, rows):
+        names, columns, converters, many = self.plan
+        rows = [list(row) for row in rows]
+        if not rows:
+            return []
+        for index, convert in converters:
+            self.convert_column(rows, index, convert)
+
+        pk_index = columns.index("id")
+        ids = [row[pk_index] for row in rows]
+        for position, field in many:
+            related = self.related_ids(field, ids)
+            for row in rows:
+                row.insert(position, related.get(row[pk_index], []))
+        return [dict(zip(names, row)) for row in rows]
+
+    def convert_column(self, rows, index, convert):
+        for row in rows:
+            if row[index] is not None:
+                row[index] = convert(row[index])
+
+    def related_ids(self, field, ids):
+        through = field.remote_field.through
+        source = through._meta.get_field(field.m2m_field_name()).attname
+        target = through._meta.get_field(field.m2m_reverse_field_name())
+        links = through.objects.filter(**{f"{source}__in": ids})
+
+        related = {}
+        for pk, target_id in links.order_by(target.attname).values_list(
+            source, target.attname
+        ):
+            related.setdefault(pk, []).append(target_id)
+        return related
@@ -1,13 +1,236 @@
+from django.conf import settings
+from django.db import DatabaseError, transaction
+from django.db.models import Count, Prefetch, prefetch_related_objects
+from django.http import Http404
 from django.shortcuts import render
-from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticated, AllowAny
-from .models import Profile, Project, CertifyingInstitution, Certificate
-from .serializers import ProfileSerializer, ProjectSerializer, CertifyingInstitutionSerializer, CertificateSerializer
+from django.urls import reverse
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView,
+    TokenRefreshView,
+    TokenVerifyView,
+)
+from .avatars import store_original
+from .batch import dispatch_all, dispatch_atomic
+from .bulk import upsert_objects
+from . import metrics
+from .changes import RESOURCES, collect_changes
+from .deletion import delete_institution, delete_profile
+from .models import (
+    Job,
+    Profile,
+    Project,
+    RenderedMarkdownModel,
+    CertifyingInstitution,
+    Certificate,
+    Skill,
+    normalize_skill,
+    skill_slug,
+)
+from .documents import get_profile_document
+from .exceptions import PreconditionFailed
+from .jobs import enqueue
+from .serializers import (
+    ProfileSerializer,
+    ProjectSerializer,
+    CertifyingInstitutionSerializer,
+    CertificateSerializer,
+    BatchSerializer,
+    JobSerializer,
+    CertifyingInstitutionUpsertSerializer,
+    ProfileUpsertSerializer,
+    ProjectUpsertSerializer,
+)
+from .signals import post_bulk_upsert
+from .values import ValuesSerializer
 
 
-class ProfileViewSet(viewsets.ModelViewSet):
+def prefers_async(request):
+    return "respond-async" in request.headers.get("Prefer", "")
+
+
+def job_accepted(job):
+    """202 response pointing at the job doing the work of the request."""
+    return Response(
+        JobSerializer(job).data,
+        status=status.HTTP_202_ACCEPTED,
+        headers={
+            "Location": reverse("job-detail", args=[job.pk]),
+            "Preference-Applied": "respond-async",
+        },
+    )
+
+
+class MultiGetMixin:
+    def list(self, request, *args, **kwargs):
+        if "ids" not in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        ids = self.get_requested_ids()
+        queryset = self.filter_queryset(self.get_queryset())
+        objects = queryset.in_bulk(ids)
+        serializer = self.get_serializer(
+            [objects[pk] for pk in ids if pk in objects], many=True
+        )
+        return Response(
+            {
+                "results": serializer.data,
+                "missing": [pk for pk in ids if pk not in objects],
+            }
+        )
+
+    def get_requested_ids(self):
+        values = [
+            value.strip()
+            for value in self.request.query_params["ids"].split(",")
+            if value.strip()
+        ]
+        if not all(value.isdigit() for value in values):
+            raise ValidationError({"ids": "Must be a list of ids."})
+
+        ids = list(dict.fromkeys(int(value) for value in values))
+        if len(ids) > settings.MULTI_GET_MAX_IDS:
+            raise ValidationError(
+                {"ids": f"At most {settings.MULTI_GET_MAX_IDS} ids allowed."}
+            )
+        return ids
+
+
+class ValuesListMixin:
+    """Serve the list action from values_list() rows when the viewset sets
+    values_serializer, skipping model instances and serializer fields."""
+
+    values_serializer = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        values_serializer = self.values_serializer.with_context(
+            markup=self.get_serializer_context().get("markup")
+        )
+        queryset = values_serializer.values(
+            self.filter_queryset(self.get_queryset())
+        )
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(
+                values_serializer.serialize(page)
+            )
+        return Response(values_serializer.serialize(queryset))
+
+
+class UpsertMixin:
+    upsert_serializer_class = None
+    upsert_key = []
+
+    @action(detail=False, methods=["post"])
+    def upsert(self, request):
+        many = isinstance(request.data, list)
+        serializer = self.upsert_serializer_class(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        rows = serializer.validated_data
+        if not many:
+            rows = [rows]
+        elif not rows:
+            return Response([])
+
+        if prefers_async(request):
+            model = self.get_queryset().model
+            payload = {"resource": RESOURCES[model], "rows": rows}
+            return job_accepted(enqueue("upsert", payload, dedup=True))
+
+        with transaction.atomic():
+            objects = self.perform_upsert(rows)
+        queryset = self.get_queryset()
+        prefetch_related_objects(objects, *queryset._prefetch_related_lookups)
+
+        data = self.get_serializer(objects, many=True).data
+        return Response(data if many else data[0])
+
+    def perform_upsert(self, rows):
+        model = self.get_queryset().model
+        if issubclass(model, RenderedMarkdownModel):
+            model.render_rows(rows)
+        objects, created = upsert_objects(model, rows, self.upsert_key)
+        post_bulk_upsert.send(sender=model, objects=objects, created=created)
+        return objects
+
+
+class OptimisticUpdateMixin:
+    def get_object(self):
+        self.object = super().get_object()
+        return self.object
+
+    def get_expected_version(self, instance):
+        """The version named by If-Match, which must be the instance's, or
+        None without a precondition."""
+        header = self.request.headers.get("If-Match", "*").strip()
+        if header == "*":
+            return None
+        tag = header.removeprefix("W/").strip('"')
+        if not tag.isdigit() or int(tag) != instance.version:
+            raise PreconditionFailed()
+        return int(tag)
+
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        expected = self.get_expected_version(instance)
+        if expected is None:
+            # No precondition was sent: the last writer wins.
+            serializer.save()
+            return
+
+        instance.expected_version = expected
+        try:
+            with transaction.atomic():
+                serializer.save()
+        except DatabaseError as error:
+            # Raised by Model.save() itself, not the database, when the
+            # conditional UPDATE matched no row: someone wrote first.
+            if type(error) is not DatabaseError:
+                raise
+            raise PreconditionFailed()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        instance = getattr(self, "object", None)
+        if instance is not None and request.method != "DELETE" and (
+            status.is_success(response.status_code)
+        ):
+            response["ETag"] = f'"{instance.version}"'
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class PortfolioViewSet(
+    MultiGetMixin,
+    ValuesListMixin,
+    OptimisticUpdateMixin,
+    viewsets.ModelViewSet,
+):
+    throttle_scopes = dict.fromkeys(
+        ["create", "update", "partial_update", "destroy", "upsert"], "writes"
+    )
+    statement_timeouts = {"list": 2.0, "facets": 2.0}
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        if self.request.query_params.get("markup") == "html":
+            context["markup"] = "html"
+        return context
+
+
+class ProfileViewSet(UpsertMixin, PortfolioViewSet):
     queryset = Profile.objects.all()
     serializer_class = ProfileSerializer
+    upsert_serializer_class = ProfileUpsertSerializer
+    upsert_key = ["github"]
+    throttle_scopes = {**PortfolioViewSet.throttle_scopes, "avatar": "writes"}
 
     def get_permissions(self):
         if self.request.method == "GET":
@@ -17,25 +240,192 @@ class ProfileViewSet(viewsets.ModelViewSet):
 
         return super().get_permissions()
 
+    def perform_destroy(self, instance):
+        delete_profile(instance, chunked=settings.DELETE_IN_CHUNKS)
+
     def retrieve(self, request, *args, **kwargs):
         if self.request.method == "GET":
-            id = self.kwargs["pk"]
-            profile = Profile.objects.get(id=id)
-            return render(request, "profile_detail.html", {"profile": profile})
+            document = self.get_document()
+            return render(
+                request,
+                "profile_detail.html",
+                {
+                    "profile": document["data"],
+                    "avatar_size": settings.AVATAR_DISPLAY_SIZE,
+                },
+            )
 
         return super().retrieve(request, *args, **kwargs)
 
+    def get_document(self):
+        pk = self.kwargs["pk"]
+        document = get_profile_document(pk) if pk.isdigit() else None
+        if document is None:
+            raise Http404()
+        return document
+
+    @action(detail=True, methods=["post"], parser_classes=[MultiPartParser])
+    def avatar(self, request, pk=None):
+        """Store the uploaded image and queue the job that renders its
+        thumbnails, which replace the current ones when done."""
+        profile = self.get_object()
+        if "image" not in request.FILES:
+            raise ValidationError({"image": "No image was uploaded."})
+        original = store_original(request.FILES["image"])
+
+        profile.avatar_original = original
+        profile.save(update_fields=["avatar_original"])
+        payload = {"profile_id": profile.pk, "original": original}
+        return job_accepted(enqueue("render_avatar", payload, dedup=True))
+
+    @action(detail=True)
+    def document(self, request, pk=None):
+        document = self.get_document()
 
-class ProjectViewSet(viewsets.ModelViewSet):
+        headers = {"ETag": document["etag"], "Cache-Control": "no-cache"}
+        if document["etag"] in request.headers.get("If-None-Match", ""):
+            return Response(
+                status=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+        return Response(document["data"], headers=headers)
+
+
+class ProjectViewSet(UpsertMixin, PortfolioViewSet):
     queryset = Project.objects.all()
     serializer_class = ProjectSerializer
+    values_serializer = ValuesSerializer(ProjectSerializer)
+    upsert_serializer_class = ProjectUpsertSerializer
+    upsert_key = ["profile_id", "github_url"]
+
+    def perform_upsert(self, rows):
+        profile_ids = {row["profile_id"] for row in rows}
+        found = Profile.objects.filter(pk__in=profile_ids).values_list(
+            "pk", flat=True
+        )
+        missing = sorted(profile_ids - set(found))
+        if missing:
+            raise ValidationError({"profile_id": f"Unknown ids: {missing}"})
+
+        for row in rows:
+            row["keyword"] = normalize_skill(row["keyword"])
+            row["key_skill"] = normalize_skill(row["key_skill"])
+        projects = super().perform_upsert(rows)
+        Project.sync_skills(projects)
+        return projects
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        params = self.request.query_params
 
+        if "profile" in params:
+            if not params["profile"].isdigit():
+                raise ValidationError({"profile": "Must be a profile id."})
+            queryset = queryset.filter(profile_id=params["profile"])
+        for skill in params.getlist("skill"):
+            queryset = queryset.filter(skills__slug=skill_slug(skill))
 
-class CertificateViewSet(viewsets.ModelViewSet):
-    queryset = Certificate.objects.all()
+        return queryset
+
+    @action(detail=False)
+    def facets(self, request):
+        projects = self.filter_queryset(self.get_queryset())
+        skills = (
+            Skill.objects.filter(projects__in=projects.values("id"))
+            .annotate(count=Count("projects", distinct=True))
+            .order_by("-count", "slug")
+            .values("slug", "name", "count")
+        )
+        return Response(list(skills))
+
+
+class CertificateViewSet(PortfolioViewSet):
+    queryset = Certificate.objects.prefetch_related(
+        Prefetch("profiles", queryset=Profile.objects.order_by("pk"))
+    )
     serializer_class = CertificateSerializer
+    values_serializer = ValuesSerializer(CertificateSerializer)
+
+
+class CertifyingInstitutionViewSet(UpsertMixin, PortfolioViewSet):
+    queryset = CertifyingInstitution.objects.prefetch_related(
+        "certificates"
+    )
+    serializer_class = CertifyingInstitutionSerializer
+    upsert_serializer_class = CertifyingInstitutionUpsertSerializer
+    upsert_key = ["url"]
+
+    def create(self, request, *args, **kwargs):
+        if not prefers_async(request):
+            return super().create(request, *args, **kwargs)
+
+        # Validated here so that bad input still gets an immediate 400.
+        self.get_serializer(data=request.data).is_valid(raise_exception=True)
+        payload = {"data": request.data}
+        return job_accepted(
+            enqueue("create_certifying_institution", payload, dedup=True)
+        )
+
+    def perform_destroy(self, instance):
+        delete_institution(instance, chunked=settings.DELETE_IN_CHUNKS)
+
+
+class JobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+
+
+class BatchView(APIView):
+    permission_classes = [AllowAny]
+
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        items = serializer.validated_data["requests"]
+
+        if serializer.validated_data["atomic"]:
+            responses, committed = dispatch_atomic(request, items)
+            return Response({"responses": responses, "committed": committed})
+
+        workers = 1
+        if serializer.validated_data["parallel"]:
+            workers = settings.BATCH_MAX_WORKERS
+        return Response({"responses": dispatch_all(request, items, workers)})
+
+
+class HealthView(APIView):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+
+    def get(self, request):
+        return Response({"status": "ok"})
+
+
+class MetricsView(APIView):
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(metrics.counters())
+
+
+class ChangesView(APIView):
+    def get(self, request):
+        since = request.query_params.get("since", "0")
+        limit = request.query_params.get("limit", "")
+        if not since.isdigit() or not (limit.isdigit() or limit == ""):
+            raise ValidationError("since and limit must be integers.")
+
+        limit = int(limit) if limit else settings.CHANGES_PAGE_SIZE
+        limit = max(1, min(limit, settings.CHANGES_PAGE_SIZE))
+        return Response(collect_changes(int(since), limit))
+
+
+class ThrottledTokenObtainPairView(TokenObtainPairView):
+    throttle_scope = "token"
+
+
+class ThrottledTokenRefreshView(TokenRefreshView):
+    throttle_scope = "token_refresh"
 
 
-class CertifyingInstitutionViewSet(viewsets.ModelViewSet):
-    queryset = CertifyingInstitution.objects.all()
-    serializer_class = CertifyingInstitutionSerializer
\ No newline at end of file
+class ThrottledTokenVerifyView(TokenVerifyView):
+    throttle_scope = "token_verify"
@@ -0,0 +1,87 @@
+import functools
+import logging
+import os
+
+from django.conf import settings
+from django.db import DatabaseError, connections
+from django.template.loader import get_template
+from django.urls import get_resolver
+from rest_framework import serializers as drf_serializers
+
+from . import serializers, views
+
+logger = logging.getLogger(__name__)
+
+
+def warm_templates():
+    """Compile the WARMUP_TEMPLATES into the cached loader."""
+    for name in settings.WARMUP_TEMPLATES:
+        get_template(name)
+
+
+def warm_urls():
+    """Import the URLconfs, which builds the routers' patterns, and
+    compile every pattern's regex."""
+    resolver = get_resolver()
+    resolver.reverse_dict
+    for namespace in resolver.namespace_dict.values():
+        namespace[1].reverse_dict
+
+
+def warm_serializers():
+    """Build the fields of every serializer once, filling the model
+    metadata caches they read, and the viewsets' values plans."""
+    for serializer_class in vars(serializers).values():
+        if (
+            isinstance(serializer_class, type)
+            and issubclass(serializer_class, drf_serializers.Serializer)
+            and serializer_class.__module__ == serializers.__name__
+        ):
+            serializer_class().fields
+    for viewset in vars(views).values():
+        values_serializer = getattr(viewset, "values_serializer", None)
+        if values_serializer is not None:
+            values_serializer.plan
+
+
+def open_connections():
+    for connection in connections.all():
+        try:
+            connection.ensure_connection()
+        except DatabaseError:
+            # Requests will retry; a database that is briefly down must
+            # not keep the worker from booting.
+            logger.warning(
+                "Warm-up could not connect to %s.", connection.alias
+            )
+
+
+@functools.cache
+def register_fork_hooks():
+    """A server forking workers from a preloaded application, as gunicorn
+    --preload does, would share the parent's sockets with every worker: the
+    parent closes its connections before each fork and the worker opens its
+    own."""
+    os.register_at_fork(
+        before=connections.close_all, after_in_child=open_connections
+    )
+
+
+def warm_connections():
+    """Open the database connections, which CONN_MAX_AGE keeps for the
+    first requests instead of closing them when a request starts."""
+    register_fork_hooks()
+    open_connections()
+
+
+def warm_up():
+    """Pay at boot for what the first requests of a worker would: template
+    compilation, URL resolver and router setup, serializer field
+    introspection and database connections. Called by the WSGI and ASGI
+    entry points when WARMUP_ON_BOOT is set."""
+    if not settings.WARMUP_ON_BOOT:
+        return
+    warm_templates()
+    warm_urls()
+    warm_serializers()
+    warm_connections()
@@ -14,3 +14,8 @@ from django.core.asgi import get_asgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "super_portfolio.settings")
 
 application = get_asgi_application()
+
+# Imported once the app registry is ready.
+from projects.warmup import warm_up  # noqa: E402
+
+warm_up()
@@ -48,12 +48,17 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "projects.middleware.LoadSheddingMiddleware",
+    "projects.middleware.StatementDeadlineMiddleware",
+    "projects.middleware.CompressionMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "projects.middleware.RequestProfilerMiddleware",
 ]
 
 
@@ -68,15 +73,103 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    "DEFAULT_PAGINATION_CLASS": (
+        "projects.pagination.CountingLimitOffsetPagination"
+    ),
+    # orjson based when it is installed, DRF's stdlib json classes if not.
+    "DEFAULT_RENDERER_CLASSES": [
+        "projects.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "projects.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    # Token buckets kept in the "shared" cache. Viewsets map actions to
+    # scopes with throttle_scopes; "<scope>_username" rates add a bucket
+    # per submitted username.
+    "DEFAULT_THROTTLE_CLASSES": ["projects.throttling.TokenBucketThrottle"],
+    "DEFAULT_THROTTLE_RATES": {
+        "writes": "120/min",
+        "token": "10/min",
+        "token_username": "10/min",
+        "token_refresh": "30/min",
+        "token_verify": "120/min",
+    },
+    # Anonymous clients are told apart by REMOTE_ADDR. Set to the number
+    # of reverse proxies in front of the application to trust that many
+    # X-Forwarded-For entries instead; trusting the header with no proxy
+    # lets clients pick their own address.
+    "NUM_PROXIES": 0,
 }
 
+# Paginated API listings count exactly up to API_COUNT_THRESHOLD rows and
+# then fall back to "cached" (signal maintained) or "estimated" (MySQL
+# optimizer statistics) totals.
+API_COUNT_THRESHOLD = 10_000
+API_COUNT_STRATEGY = "cached"
+
+MULTI_GET_MAX_IDS = 100
+
+BATCH_MAX_REQUESTS = 25
+BATCH_MAX_WORKERS = 4
+
+CHANGES_PAGE_SIZE = 500
+# /changes/ holds back entries younger than this many seconds, so that its
+# cursor never passes a transaction still in flight. It must outlast the
+# longest writing transaction; requests are bounded by REQUEST_BUDGET.
+CHANGES_SETTLE_TIME = 15
+
+# Profiles and institutions are deleted with set-based DELETEs of this many
+# dependent rows at a time, committing after every batch when chunked.
+DELETE_BATCH_SIZE = 1000
+DELETE_IN_CHUNKS = False
+
+# Requests in flight per worker process and endpoint class. Requests wait
+# up to CONCURRENCY_QUEUE_TIMEOUT seconds for a slot and are then answered
+# 503. Pools whose average latency exceeds CONCURRENCY_LATENCY_TARGET
+# seconds shed at once instead, except for writes.
+CONCURRENCY_LIMITS = {
+    "cached": 64,
+    "heavy": 8,
+    "writes": 16,
+    "token": 4,
+}
+CONCURRENCY_QUEUE_TIMEOUT = 0.5
+CONCURRENCY_LATENCY_TARGET = 2.0
+CONCURRENCY_RETRY_AFTER = 1
+
+# Seconds a request may spend in the database, lowered by a smaller
+# X-Request-Timeout header. Each statement runs for at most the view's
+# statement_timeouts entry for its action, STATEMENT_TIMEOUT if it has
+# none, and never past the request budget; overruns answer 504.
+REQUEST_BUDGET = 10.0
+STATEMENT_TIMEOUT = 5.0
+
+# Staff can profile any request by adding ?_profile=1, and this share of all
+# requests is profiled as well. The newest REQUEST_PROFILER_KEEP profiles
+# are kept and listed at /admin/request-profiles/.
+REQUEST_PROFILER_DIR = os.path.join(BASE_DIR, "request_profiles")
+REQUEST_PROFILER_SAMPLE_PERCENT = 0
+REQUEST_PROFILER_KEEP = 100
+
+# Statements slower than this many seconds are logged by fingerprint under
+# SLOW_QUERY_DIR and reported, worst first and with their plans, by
+# slow_query_report. None turns the capture off.
+SLOW_QUERY_THRESHOLD = 0.5
+SLOW_QUERY_DIR = os.path.join(BASE_DIR, "slow_queries")
+
+# Above this many rows, unfiltered admin changelists report MySQL's
+# estimated row count instead of running COUNT(*).
+ESTIMATED_COUNT_THRESHOLD = 100_000
+
 ROOT_URLCONF = "super_portfolio.urls"
 
 TEMPLATES = [
     {
         "BACKEND": "django.template.backends.django.DjangoTemplates",
         "DIRS": [],
-        "APP_DIRS": True,
         "OPTIONS": {
             "context_processors": [
                 "django.template.context_processors.debug",
@@ -84,12 +177,28 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
             ],
+            # Compiled templates are kept for the life of the worker.
+            "loaders": [
+                (
+                    "django.template.loaders.cached.Loader",
+                    [
+                        "django.template.loaders.filesystem.Loader",
+                        "django.template.loaders.app_directories.Loader",
+                    ],
+                ),
+            ],
         },
     },
 ]
 
 WSGI_APPLICATION = "super_portfolio.wsgi.application"
 
+# The WSGI and ASGI entry points warm each worker up before it takes
+# traffic: these templates are compiled, the URL resolvers and serializer
+# fields built and the database connections opened.
+WARMUP_ON_BOOT = True
+WARMUP_TEMPLATES = ["base.html", "profile_detail.html"]
+
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -102,10 +211,54 @@ DATABASES = {
         "PASSWORD": "password",
         "HOST": "127.0.0.1",
         "PORT": "3306",
+        # Connections are kept across requests, including the one opened by
+        # the warm-up, and checked before reuse instead of being closed as
+        # each request starts.
+        "CONN_MAX_AGE": 60,
+        "CONN_HEALTH_CHECKS": True,
     }
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    # Counters every worker must see: the throttle buckets. Files are
+    # shared by the processes of one host; point it at memcached or redis
+    # when the application runs on several.
+    "shared": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.path.join(BASE_DIR, "shared_cache"),
+    },
+}
+
+PROFILE_DOCUMENT_CACHE_TIMEOUT = 300
+
+# Responses smaller than this are sent uncompressed. Compressed variants of
+# responses with an ETag are cached for COMPRESSION_CACHE_TIMEOUT seconds.
+COMPRESSION_MIN_SIZE = 1024
+COMPRESSION_CACHE_TIMEOUT = 300
+
+# Rebuild profile snapshots in a background job rather than inline.
+PROFILE_SNAPSHOT_ASYNC = True
+
+# Jobs run by "manage.py run_worker" are tried JOB_MAX_ATTEMPTS times,
+# waiting JOB_RETRY_BACKOFF seconds before the first retry and twice as
+# long before each next one. Jobs running for longer than JOB_LEASE
+# seconds are assumed lost with their worker and run again.
+JOB_MAX_ATTEMPTS = 3
+JOB_RETRY_BACKOFF = 10
+JOB_LEASE = 600
+# Workers delete jobs finished more than JOB_RETENTION seconds ago, checking
+# every JOB_PURGE_INTERVAL seconds; /jobs/<id>/ answers 404 for them.
+JOB_RETENTION = 7 * 24 * 60 * 60
+JOB_PURGE_INTERVAL = 60
+
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -142,6 +295,34 @@ USE_TZ = True
 
 STATIC_URL = "static/"
 STATIC_ROOT = os.path.join(BASE_DIR, "static")
+STATICFILES_DIRS = [
+    os.path.join(BASE_DIR, "mova_static"),
+    os.path.join(BASE_DIR, "assets"),
+]
+
+# collectstatic writes content-hashed copies of every asset plus their gzip
+# and (with Brotli installed) brotli variants. WhiteNoise serves them from
+# an index built at startup, with far-future immutable Cache-Control on the
+# hashed names and without compressing anything per request.
+STORAGES = {
+    "default": {
+        "BACKEND": "django.core.files.storage.FileSystemStorage",
+    },
+    "staticfiles": {
+        "BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage",
+    },
+}
+
+MEDIA_ROOT = os.path.join(BASE_DIR, "media")
+
+# Uploaded avatars are cropped to squares of these sizes, in WebP and JPEG,
+# by a background job. The variants are stored under their content digest
+# and served at /avatars/ with immutable caching. AVATAR_DISPLAY_SIZE is
+# the size pages show, and the JPEG used as the src fallback.
+AVATAR_SIZES = [64, 128, 256]
+AVATAR_DISPLAY_SIZE = 128
+AVATAR_MAX_UPLOAD_SIZE = 5 * 1024 * 1024
+AVATAR_MAX_PIXELS = 40_000_000
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
@@ -16,16 +16,39 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
-from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
-    TokenRefreshView,
-    TokenVerifyView,
+from projects.profiling import profile_download, profile_list
+from projects.views import (
+    ThrottledTokenObtainPairView,
+    ThrottledTokenRefreshView,
+    ThrottledTokenVerifyView,
 )
 
 urlpatterns = [
+    path(
+        "admin/request-profiles/",
+        admin.site.admin_view(profile_list),
+        name="request_profiles",
+    ),
+    path(
+        "admin/request-profiles/<str:name>.<str:kind>",
+        admin.site.admin_view(profile_download),
+        name="request_profile_download",
+    ),
     path("admin/", admin.site.urls),
-    path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
-    path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
-    path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path(
+        "token/",
+        ThrottledTokenObtainPairView.as_view(),
+        name="token_obtain_pair",
+    ),
+    path(
+        "token/refresh/",
+        ThrottledTokenRefreshView.as_view(),
+        name="token_refresh",
+    ),
+    path(
+        "token/verify/",
+        ThrottledTokenVerifyView.as_view(),
+        name="token_verify",
+    ),
     path("", include("projects.urls")),
 ]
@@ -0,0 +1,85 @@
+"""Throughput of the API's JSON renderer and parser on list and bulk
+payloads, against DRF's stdlib json classes.
+
+Not collected by default; run explicitly with
+    python -m pytest tests/benchmarks/bench_json.py
+"""
+import datetime
+import io
+import timeit
+
+import pytest
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from projects.parsers import FastJSONParser
+from projects.renderers import FastJSONRenderer
+
+REPEAT = 5
+
+
+def projects_page(rows):
+    return {
+        "count": rows,
+        "count_exact": True,
+        "next": None,
+        "previous": None,
+        "results": [
+            {
+                "id": index,
+                "name": f"Projeto {index}",
+                "description": "Descrição do projeto " * 10,
+                "github_url": f"https://github.com/user/projeto-{index}",
+                "keyword": "django",
+                "key_skill": "python",
+                "profile": index % 50,
+            }
+            for index in range(rows)
+        ],
+    }
+
+
+def certificates_page(rows):
+    timestamp = datetime.datetime(2023, 7, 1, tzinfo=datetime.timezone.utc)
+    return [
+        {
+            "id": index,
+            "name": f"Certificate {index}",
+            "certifying_institution": index % 20,
+            "timestamp": timestamp + datetime.timedelta(minutes=index),
+            "profiles": list(range(index % 7)),
+        }
+        for index in range(rows)
+    ]
+
+
+def best_of(function):
+    return min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+
+def report(name, size, baseline, optimized):
+    megabytes = size / 1_000_000
+    print(
+        f"\n{name}: {megabytes / baseline:.0f}MB/s -> "
+        f"{megabytes / optimized:.0f}MB/s ({baseline / optimized:.1f}x)"
+    )
+
+
+@pytest.mark.parametrize(
+    "name, payload",
+    [
+        ("projects x1000", projects_page(1000)),
+        ("projects x10000", projects_page(10_000)),
+        ("certificates x10000", certificates_page(10_000)),
+    ],
+)
+def test_json_throughput(name, payload):
+    body = JSONRenderer().render(payload)
+    assert FastJSONRenderer().render(payload) == body
+
+    baseline = best_of(lambda: JSONRenderer().render(payload))
+    optimized = best_of(lambda: FastJSONRenderer().render(payload))
+    report(f"render {name}", len(body), baseline, optimized)
+
+    baseline = best_of(lambda: JSONParser().parse(io.BytesIO(body)))
+    optimized = best_of(lambda: FastJSONParser().parse(io.BytesIO(body)))
+    report(f"parse {name}", len(body), baseline, optimized)
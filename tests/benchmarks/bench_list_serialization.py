@@ -0,0 +1,74 @@
+"""Serialization cost of a 1,000 row /projects/ and /certificates/ page.
+
+Not collected by default; run explicitly with
+    python -m pytest tests/benchmarks/bench_list_serialization.py
+"""
+import timeit
+
+import pytest
+from projects.models import Certificate, Project
+from projects.serializers import CertificateSerializer, ProjectSerializer
+from projects.values import ValuesSerializer
+
+ROWS = 1000
+REPEAT = 5
+
+
+@pytest.fixture()
+def rows_seed(profile_seed, certificate_and_institution_seed):
+    _, institution = certificate_and_institution_seed
+    Project.objects.bulk_create(
+        Project(
+            name=f"Projeto {index}",
+            description="Descrição",
+            github_url=f"http://myfakeurl{index}.com",
+            keyword="keyword1",
+            key_skill="key_skill1",
+            profile=profile_seed,
+        )
+        for index in range(ROWS)
+    )
+    certificates = Certificate.objects.bulk_create(
+        Certificate(
+            name=f"Certificate {index}", certifying_institution=institution
+        )
+        for index in range(ROWS)
+    )
+    profile_seed.certificates.add(*certificates)
+
+
+def best_of(function):
+    return min(timeit.repeat(function, number=1, repeat=REPEAT))
+
+
+@pytest.mark.parametrize(
+    "serializer_class, queryset",
+    [
+        (ProjectSerializer, lambda: Project.objects.all()[:ROWS]),
+        (
+            CertificateSerializer,
+            lambda: Certificate.objects.prefetch_related("profiles")[:ROWS],
+        ),
+    ],
+)
+def test_values_serializer_speedup(rows_seed, serializer_class, queryset):
+    values_serializer = ValuesSerializer(serializer_class)
+
+    def model_serializer():
+        return serializer_class(queryset(), many=True).data
+
+    def values():
+        return values_serializer.serialize(
+            values_serializer.values(queryset())
+        )
+
+    assert values() == model_serializer()
+
+    baseline = best_of(model_serializer)
+    optimized = best_of(values)
+    print(
+        f"\n{serializer_class.__name__}: "
+        f"{baseline * 1000:.1f}ms -> {optimized * 1000:.1f}ms "
+        f"({baseline / optimized:.1f}x)"
+    )
+    assert optimized < baseline
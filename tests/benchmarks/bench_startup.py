@@ -0,0 +1,119 @@
+"""Worker boot time and first-request latency of the WSGI application,
+with and without the warm-up phase.
+
+Every run boots a fresh interpreter against a migrated SQLite database.
+Not collected by default; run explicitly with
+    python -m pytest tests/benchmarks/bench_startup.py
+"""
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parents[2]
+REPEAT = 5
+
+BOOT = """
+import json, time
+from wsgiref.util import setup_testing_defaults
+
+started = time.perf_counter()
+from super_portfolio.wsgi import application
+booted = time.perf_counter()
+
+
+def get(path):
+    environ = {
+        "PATH_INFO": path,
+        "HTTP_HOST": "localhost",
+        "HTTP_ACCEPT": "text/html",
+    }
+    setup_testing_defaults(environ)
+    statuses = []
+    started = time.perf_counter()
+    body = application(
+        environ, lambda status, headers: statuses.append(status)
+    )
+    b"".join(body)
+    assert statuses[0].startswith("200"), statuses
+    return time.perf_counter() - started
+
+
+first = get("/profiles/1/")
+second = get("/profiles/1/")
+print(json.dumps({"boot": booted - started, "first": first, "second": second}))
+"""
+
+SETTINGS = """
+from {base} import *  # noqa
+
+DATABASES = {{
+    "default": {{"ENGINE": "django.db.backends.sqlite3", "NAME": {db!r}}}
+}}
+WARMUP_ON_BOOT = {warm}
+"""
+
+
+@pytest.fixture(scope="module")
+def environment(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("startup")
+    base = os.environ["DJANGO_SETTINGS_MODULE"]
+    for warm in (True, False):
+        (directory / f"startup_{warm}.py").write_text(
+            SETTINGS.format(base=base, db=str(directory / "db"), warm=warm)
+        )
+
+    env = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(
+            [str(directory), str(REPO), os.environ.get("PYTHONPATH", "")]
+        ),
+        "DJANGO_SETTINGS_MODULE": "startup_False",
+    }
+    manage = [sys.executable, str(REPO / "manage.py")]
+    subprocess.run([*manage, "migrate", "-v0"], env=env, check=True)
+    subprocess.run(
+        [
+            *manage,
+            "shell",
+            "-c",
+            "from projects.models import Profile; "
+            "Profile.objects.create(pk=1, name='Profile 1', "
+            "github='http://myfakeurl.com', linkedin='http://myfakeurl.com', "
+            "bio='Bio')",
+        ],
+        env=env,
+        check=True,
+    )
+    return env
+
+
+def boot(environment, warm):
+    result = subprocess.run(
+        [sys.executable, "-c", BOOT],
+        env={**environment, "DJANGO_SETTINGS_MODULE": f"startup_{warm}"},
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return json.loads(result.stdout)
+
+
+def best(runs, key):
+    return min(run[key] for run in runs)
+
+
+def test_warm_up_moves_first_request_cost_to_boot(environment):
+    cold = [boot(environment, warm=False) for _ in range(REPEAT)]
+    warm = [boot(environment, warm=True) for _ in range(REPEAT)]
+
+    for name, runs in (("cold", cold), ("warm", warm)):
+        print(
+            f"\n{name}: boot {best(runs, 'boot') * 1000:.1f}ms, "
+            f"first request {best(runs, 'first') * 1000:.1f}ms, "
+            f"second request {best(runs, 'second') * 1000:.1f}ms"
+        )
+    assert best(warm, "first") < best(cold, "first")
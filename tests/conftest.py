@@ -1,5 +1,6 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import caches
 from rest_framework.test import APIClient
 try:
     from projects import models
@@ -39,6 +40,23 @@ def project_seed(profile_seed):
     )
 
 
+@pytest.fixture()
+def projects_seed(request, profile_seed):
+    """Projects of profile_seed, bulk created: 30 of them unless the test
+    parametrizes the fixture indirectly with another count."""
+    return models.Project.objects.bulk_create(
+        models.Project(
+            name=f"Projeto {index}",
+            description=f"Descrição do projeto {index}",
+            github_url=f"http://myfakeurl{index}.com",
+            keyword="keyword1",
+            key_skill="key_skill1",
+            profile=profile_seed,
+        )
+        for index in range(getattr(request, "param", 30))
+    )
+
+
 @pytest.fixture()
 def certificate_and_institution_seed(project_seed, profile_seed):
     cert_institution = models.CertifyingInstitution.objects.create(
@@ -60,6 +78,44 @@ def allow_database(db):
     ...
 
 
+@pytest.fixture(autouse=True)
+def keep_test_connection(monkeypatch):
+    # The worker loop must not close the connection holding the test's
+    # transaction, as the test client's requests do not either.
+    from projects import jobs
+
+    monkeypatch.setattr(jobs, "close_old_connections", lambda: None)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache(settings, tmp_path_factory):
+    caches["default"].clear()
+    location = str(tmp_path_factory.mktemp("shared_cache"))
+    shared = {**settings.CACHES["shared"], "LOCATION": location}
+    settings.CACHES = {**settings.CACHES, "shared": shared}
+
+
+@pytest.fixture(autouse=True)
+def slow_query_dir(settings, tmp_path_factory):
+    settings.SLOW_QUERY_DIR = str(tmp_path_factory.mktemp("slow_queries"))
+
+
+@pytest.fixture(autouse=True)
+def inline_snapshot_rebuilds(settings):
+    settings.PROFILE_SNAPSHOT_ASYNC = False
+
+
+@pytest.fixture(autouse=True)
+def unhashed_static_files(settings):
+    # The manifest only exists after collectstatic.
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"
+        },
+    }
+
+
 @pytest.fixture
 def client():
     return APIClient()
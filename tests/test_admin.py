@@ -0,0 +1,87 @@
+import pytest
+from projects import counting
+from projects.models import Certificate, Profile
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.fixture()
+def admin_client(client, user_seed):
+    client.force_login(user_seed)
+    return client
+
+
+def test_certificate_inline_is_paginated(
+    admin_client, certificate_and_institution_seed
+):
+    _, institution = certificate_and_institution_seed
+    Certificate.objects.bulk_create(
+        Certificate(
+            name=f"Certificate {index}", certifying_institution=institution
+        )
+        for index in range(2, 26)
+    )
+    url = f"/admin/projects/certifyinginstitution/{institution.id}/change/"
+
+    first = admin_client.get(url)
+    last = admin_client.get(url, {"certificates_page": 2})
+
+    assert first.status_code == 200
+    formset = first.context["inline_admin_formsets"][0].formset
+    assert len(formset.forms) == 20
+    assert len(last.context["inline_admin_formsets"][0].formset.forms) == 5
+    assert "All 25 certificates" in first.content.decode()
+
+
+def test_certificate_admin_search(
+    admin_client, certificate_and_institution_seed
+):
+    response = admin_client.get(
+        "/admin/projects/certificate/", {"q": "Certif"}
+    )
+
+    assert response.status_code == 200
+    assert response.context["cl"].result_count == 1
+
+
+def test_profile_admin_autocomplete(admin_client, profile_seed):
+    response = admin_client.get(
+        "/admin/autocomplete/",
+        {
+            "term": "Prof",
+            "app_label": "projects",
+            "model_name": "certificate",
+            "field_name": "profiles",
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["results"] == [
+        {"id": str(profile_seed.id), "text": profile_seed.name}
+    ]
+
+
+def test_estimated_count_paginator(monkeypatch, settings, profile_seed):
+    settings.ESTIMATED_COUNT_THRESHOLD = 1000
+    paginator = counting.EstimatedCountPaginator(
+        Profile.objects.order_by("pk"), 10
+    )
+    monkeypatch.setattr(counting, "estimated_count", lambda queryset: 5000)
+
+    assert paginator.count == 5000
+
+
+def test_estimated_count_paginator_below_threshold(
+    monkeypatch, settings, profile_seed
+):
+    settings.ESTIMATED_COUNT_THRESHOLD = 1000
+    monkeypatch.setattr(counting, "estimated_count", lambda queryset: 50)
+    paginator = counting.EstimatedCountPaginator(
+        Profile.objects.order_by("pk"), 10
+    )
+
+    assert paginator.count == 1
+
+
+def test_estimated_count_requires_mysql(profile_seed):
+    assert counting.estimated_count(Profile.objects.all()) is None
@@ -0,0 +1,131 @@
+import hashlib
+import io
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from PIL import Image
+from projects.jobs import work
+from projects.models import ChangeLogEntry, Job, Profile
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.fixture(autouse=True)
+def media_root(settings, tmp_path):
+    settings.MEDIA_ROOT = str(tmp_path)
+    return tmp_path
+
+
+def image_upload(size=(300, 200), color="red", image_format="PNG"):
+    output = io.BytesIO()
+    Image.new("RGB", size, color).save(output, image_format)
+    return SimpleUploadedFile("avatar.png", output.getvalue())
+
+
+def upload(client, profile, image):
+    return client.post(
+        f"/profiles/{profile.id}/avatar/", {"image": image}, format="multipart"
+    )
+
+
+def test_avatar_is_rendered_by_a_job(
+    auth_client, profile_seed, media_root, django_capture_on_commit_callbacks
+):
+    response = upload(auth_client, profile_seed, image_upload())
+
+    assert response.status_code == 202
+    assert Job.objects.get().task == "render_avatar"
+    profile_seed.refresh_from_db()
+    assert profile_seed.avatar is None
+    ChangeLogEntry.objects.all().delete()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        assert work(once=True) == 1
+
+    profile_seed.refresh_from_db()
+    assert set(profile_seed.avatar) == {"webp", "jpeg"}
+    # /changes/ clients learn about the new avatar.
+    assert list(
+        ChangeLogEntry.objects.values_list("resource", "object_id", "action")
+    ) == [("profiles", profile_seed.id, "upsert")]
+    for variant_format, names in profile_seed.avatar.items():
+        assert set(names) == {"64", "128", "256"}
+        for size, name in names.items():
+            content = (media_root / name).read_bytes()
+            assert name.endswith(
+                hashlib.sha256(content).hexdigest()
+                + (".webp" if variant_format == "webp" else ".jpg")
+            )
+            with Image.open(io.BytesIO(content)) as image:
+                assert image.format == variant_format.upper()
+                assert image.size == (int(size), int(size))
+
+
+def test_profiles_reference_the_variants(
+    auth_client, profile_seed, django_capture_on_commit_callbacks
+):
+    upload(auth_client, profile_seed, image_upload())
+    with django_capture_on_commit_callbacks(execute=True):
+        work(once=True)
+    profile_seed.refresh_from_db()
+    webp = profile_seed.avatar["webp"]
+
+    avatar = auth_client.get("/profiles/").json()[0]["avatar"]
+
+    assert avatar["src"] == "/avatars/" + (
+        profile_seed.avatar["jpeg"]["128"].split("/")[-1]
+    )
+    assert avatar["srcset"]["webp"] == ", ".join(
+        f"/avatars/{webp[size].split('/')[-1]} {size}w"
+        for size in ["64", "128", "256"]
+    )
+    page = auth_client.get(f"/profiles/{profile_seed.id}/").content.decode()
+    assert f'srcset="{avatar["srcset"]["webp"]}"' in page
+    assert f'src="{avatar["src"]}"' in page
+
+
+def test_variants_are_served_immutable(auth_client, profile_seed, client):
+    upload(auth_client, profile_seed, image_upload())
+    work(once=True)
+    name = Profile.objects.get().avatar["webp"]["64"].split("/")[-1]
+
+    response = client.get(f"/avatars/{name}")
+
+    assert response.status_code == 200
+    assert response["Content-Type"] == "image/webp"
+    assert response["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert client.get(f"/avatars/{'0' * 64}.webp").status_code == 404
+    assert client.get("/avatars/originals").status_code == 404
+
+
+def test_a_newer_upload_wins(auth_client, profile_seed, media_root):
+    upload(auth_client, profile_seed, image_upload(color="red"))
+    upload(auth_client, profile_seed, image_upload(color="blue"))
+
+    assert work(once=True) == 2
+
+    name = Profile.objects.get().avatar["jpeg"]["64"]
+    with Image.open(media_root / name) as image:
+        red, _, blue = image.getpixel((32, 32))
+    assert blue > red
+
+
+def test_invalid_uploads_are_rejected(auth_client, profile_seed, settings):
+    not_an_image = SimpleUploadedFile("avatar.png", b"not an image")
+    assert upload(auth_client, profile_seed, not_an_image).status_code == 400
+    assert (
+        auth_client.post(
+            f"/profiles/{profile_seed.id}/avatar/", {}, format="multipart"
+        ).status_code
+        == 400
+    )
+
+    settings.AVATAR_MAX_PIXELS = 100
+    response = upload(auth_client, profile_seed, image_upload())
+    assert response.status_code == 400
+    assert response.json() == {"image": "The image has too many pixels."}
+    assert Job.objects.count() == 0
+
+
+def test_uploads_require_authentication(client, profile_seed):
+    assert upload(client, profile_seed, image_upload()).status_code == 401
@@ -0,0 +1,180 @@
+import pytest
+from projects.models import Project
+
+pytestmark = pytest.mark.dependency()
+
+
+def test_batch_request(auth_client, project_seed, profile_seed):
+    response = auth_client.post(
+        "/batch/",
+        {
+            "requests": [
+                {"method": "GET", "path": "/profiles/"},
+                {"method": "GET", "path": f"/projects/{project_seed.id}/"},
+                {
+                    "method": "PATCH",
+                    "path": f"/projects/{project_seed.id}/",
+                    "body": {"name": "Projeto 1 alterado"},
+                },
+                {"method": "GET", "path": "/missing/"},
+            ]
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    responses = response.json()["responses"]
+    assert [item["status"] for item in responses] == [200, 200, 200, 404]
+    assert responses[0]["body"][0]["id"] == profile_seed.id
+    assert responses[1]["body"]["name"] == "Projeto 1"
+    assert responses[2]["body"]["name"] == "Projeto 1 alterado"
+
+
+def test_batch_request_authenticates_once(client, user_seed, project_seed):
+    token = client.post(
+        "/token/",
+        {"username": "superuser", "password": "lookathowgoodandbigisthepass"},
+    ).json()["access"]
+
+    response = client.post(
+        "/batch/",
+        {
+            "requests": [
+                {
+                    "method": "POST",
+                    "path": "/token/verify/",
+                    "body": {"token": token},
+                },
+                {"method": "GET", "path": "/projects/"},
+            ]
+        },
+        format="json",
+    )
+
+    assert [item["status"] for item in response.json()["responses"]] == [
+        200,
+        401,
+    ]
+
+
+def test_batch_request_rolls_back_atomic_writes(auth_client, project_seed):
+    response = auth_client.post(
+        "/batch/",
+        {
+            "atomic": True,
+            "requests": [
+                {
+                    "method": "PATCH",
+                    "path": f"/projects/{project_seed.id}/",
+                    "body": {"name": "Projeto 1 alterado"},
+                },
+                {
+                    "method": "POST",
+                    "path": "/projects/",
+                    "body": {"name": "Projeto sem dados"},
+                },
+                {"method": "DELETE", "path": f"/projects/{project_seed.id}/"},
+            ],
+        },
+        format="json",
+    )
+
+    assert response.json()["committed"] is False
+    assert [item["status"] for item in response.json()["responses"]] == [
+        200,
+        400,
+    ]
+    assert Project.objects.get().name == "Projeto 1"
+
+
+def test_batch_request_isolates_failing_requests(
+    auth_client, certificate_and_institution_seed, caplog
+):
+    _, institution = certificate_and_institution_seed
+    failing = {
+        "method": "PUT",
+        "path": f"/certifying-institutions/{institution.id}/",
+        "body": {
+            "name": "Instituição alterada",
+            "url": institution.url,
+            "certificates": [{"name": "Certificado 2"}],
+        },
+    }
+    response = auth_client.post(
+        "/batch/",
+        {"requests": [failing, {"method": "GET", "path": "/profiles/"}]},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert [item["status"] for item in response.json()["responses"]] == [
+        500,
+        200,
+    ]
+    assert "Batch sub-request PUT" in caplog.text
+
+
+def test_batch_request_rolls_back_atomic_failures(
+    auth_client, project_seed, certificate_and_institution_seed
+):
+    _, institution = certificate_and_institution_seed
+    response = auth_client.post(
+        "/batch/",
+        {
+            "atomic": True,
+            "requests": [
+                {
+                    "method": "PATCH",
+                    "path": f"/projects/{project_seed.id}/",
+                    "body": {"name": "Projeto 1 alterado"},
+                },
+                {
+                    "method": "PUT",
+                    "path": f"/certifying-institutions/{institution.id}/",
+                    "body": {
+                        "name": "Instituição alterada",
+                        "url": institution.url,
+                        "certificates": [{"name": "Certificado 2"}],
+                    },
+                },
+            ],
+        },
+        format="json",
+    )
+
+    assert response.json()["committed"] is False
+    assert [item["status"] for item in response.json()["responses"]] == [
+        200,
+        500,
+    ]
+    assert Project.objects.get().name == "Projeto 1"
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batch_request_in_parallel(auth_client, project_seed):
+    response = auth_client.post(
+        "/batch/",
+        {
+            "parallel": True,
+            "requests": [
+                {"method": "GET", "path": "/profiles/"},
+                {"method": "GET", "path": "/projects/"},
+                {"method": "GET", "path": "/certificates/"},
+            ],
+        },
+        format="json",
+    )
+
+    responses = response.json()["responses"]
+    assert [item["status"] for item in responses] == [200, 200, 200]
+    assert responses[1]["body"][0]["id"] == project_seed.id
+
+
+def test_batch_request_over_the_limit(auth_client, settings):
+    settings.BATCH_MAX_REQUESTS = 1
+    response = auth_client.post(
+        "/batch/",
+        {"requests": [{"method": "GET", "path": "/profiles/"}] * 2},
+        format="json",
+    )
+    assert response.status_code == 400
@@ -164,7 +164,7 @@ def test_certifying_institution_post_request(
         "/certifying-institutions/",
         {
             "name": "Certifying Institution 2",
-            "url": "http://myfakeurl.com",
+            "url": "http://myfakeurl2.com",
             "certificates": [{"name": "Certificate 2"}],
         },
         format="json",
@@ -178,7 +178,7 @@ def test_certifying_institution_post_request(
 
     assert response_json["id"] == certifying_institution.id + 1
     assert response_json["name"] == "Certifying Institution 2"
-    assert response_json["url"] == "http://myfakeurl.com"
+    assert response_json["url"] == "http://myfakeurl2.com"
     assert response_json["certificates"][0]["name"] == "Certificate 2"
     assert CertifyingInstitution.objects.count() == 2
     assert Certificate.objects.count() == 2
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.db import transaction
+from django.utils import timezone
+from projects.models import ChangeLogEntry, Project
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.fixture(autouse=True)
+def no_settle_time(settings):
+    settings.CHANGES_SETTLE_TIME = 0
+
+
+def test_changes_request(auth_client, project_seed, profile_seed):
+    response = auth_client.get("/changes/")
+
+    assert response.status_code == 200
+    assert response.json()["has_more"] is False
+    assert [
+        (change["resource"], change["id"], change["action"])
+        for change in response.json()["changes"]
+    ] == [
+        ("profiles", profile_seed.id, "upsert"),
+        ("projects", project_seed.id, "upsert"),
+    ]
+    assert response.json()["changes"][1]["data"]["name"] == project_seed.name
+
+
+def test_changes_request_since_cursor(auth_client, project_seed):
+    cursor = auth_client.get("/changes/").json()["cursor"]
+    project_id = project_seed.id
+    project_seed.delete()
+
+    response = auth_client.get("/changes/", {"since": cursor})
+
+    assert response.json()["changes"] == [
+        {"resource": "projects", "id": project_id, "action": "delete"}
+    ]
+    assert response.json()["cursor"] > cursor
+
+
+def test_changes_request_is_paginated(auth_client, profile_seed):
+    for index in range(3):
+        Project.objects.create(
+            name=f"Projeto {index}",
+            description="Descrição",
+            github_url=f"http://myfakeurl{index}.com",
+            keyword="keyword1",
+            key_skill="key_skill1",
+            profile=profile_seed,
+        )
+
+    first = auth_client.get("/changes/", {"limit": 2}).json()
+    second = auth_client.get(
+        "/changes/", {"since": first["cursor"], "limit": 2}
+    ).json()
+
+    assert first["has_more"] is True
+    assert second["has_more"] is False
+    assert len(first["changes"]) + len(second["changes"]) == 4
+
+
+def test_changes_track_certificate_profiles(
+    auth_client, certificate_and_institution_seed, profile_seed
+):
+    certificate, institution = certificate_and_institution_seed
+    cursor = auth_client.get("/changes/").json()["cursor"]
+    profile_seed.certificates.remove(certificate)
+
+    changes = auth_client.get("/changes/", {"since": cursor}).json()
+    assert changes["changes"][0]["resource"] == "certificates"
+    assert changes["changes"][0]["data"]["profiles"] == []
+    assert ChangeLogEntry.objects.filter(pk__gt=cursor).count() == 1
+
+
+def test_changes_request_without_authentication(client):
+    response = client.get("/changes/")
+    assert response.status_code == 401
+
+
+def test_changes_are_rolled_back_with_the_data(profile_seed):
+    before = ChangeLogEntry.objects.count()
+
+    with pytest.raises(ValueError), transaction.atomic():
+        profile_seed.name = "Profile 1 alterado"
+        profile_seed.save()
+        assert ChangeLogEntry.objects.count() == before + 1
+        raise ValueError()
+
+    assert ChangeLogEntry.objects.count() == before
+
+
+def test_recent_changes_are_held_back(auth_client, settings, project_seed):
+    settings.CHANGES_SETTLE_TIME = 60
+    # Only the project entry has settled; the older id of the profile entry
+    # stands for a transaction that may still be in flight.
+    ChangeLogEntry.objects.filter(resource="projects").update(
+        created_at=timezone.now() - timedelta(minutes=5)
+    )
+
+    response = auth_client.get("/changes/").json()
+
+    assert response["changes"] == []
+    assert response["cursor"] == 0
+    assert response["has_more"] is False
@@ -0,0 +1,164 @@
+import asyncio
+import gzip
+
+import pytest
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory
+from projects import middleware
+from projects.middleware import CompressionMiddleware, negotiate_encoding
+
+pytestmark = pytest.mark.dependency()
+
+
+def process(response, accept_encoding="gzip"):
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING=accept_encoding)
+    return CompressionMiddleware(lambda request: response)(request)
+
+
+@pytest.mark.parametrize(
+    "header, encoding",
+    [
+        ("gzip, deflate", "gzip"),
+        ("GZIP;q=0.5", "gzip"),
+        ("*", "gzip"),
+        ("gzip;q=0", None),
+        ("*;q=0, identity", None),
+        ("deflate", None),
+        ("", None),
+    ],
+)
+def test_negotiate_encoding(monkeypatch, header, encoding):
+    monkeypatch.setattr(middleware, "brotli", None)
+
+    assert negotiate_encoding(header) == encoding
+
+
+def test_negotiate_encoding_prefers_brotli():
+    pytest.importorskip("brotli")
+
+    assert negotiate_encoding("gzip, deflate, br") == "br"
+    assert negotiate_encoding("gzip, br;q=0.5") == "gzip"
+
+
+def test_list_request_is_compressed(auth_client, projects_seed):
+    identity = auth_client.get("/projects/")
+    response = auth_client.get("/projects/", HTTP_ACCEPT_ENCODING="gzip")
+
+    assert response["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response["Vary"]
+    assert int(response["Content-Length"]) < len(identity.content)
+    assert gzip.decompress(response.content) == identity.content
+
+
+def test_small_response_is_not_compressed(auth_client, project_seed):
+    response = auth_client.get(
+        f"/projects/{project_seed.id}/", HTTP_ACCEPT_ENCODING="gzip"
+    )
+
+    assert not response.has_header("Content-Encoding")
+    assert response["ETag"] == '"1"'
+
+
+def test_compressed_variants_are_cached(monkeypatch):
+    content = b'{"bio": "' + b"a" * 2000 + b'"}'
+    calls = []
+    compress = middleware.compress
+    monkeypatch.setattr(
+        middleware,
+        "compress",
+        lambda *args: calls.append(args) or compress(*args),
+    )
+
+    for _ in range(3):
+        response = process(
+            HttpResponse(
+                content,
+                content_type="application/json",
+                headers={"ETag": '"abc"'},
+            )
+        )
+
+    assert len(calls) == 1
+    assert response["ETag"] == 'W/"abc"'
+    assert gzip.decompress(response.content) == content
+
+
+def test_document_not_modified_with_compressed_etag(client, profile_seed):
+    profile_seed.bio = "Bio do profile 1 " * 100
+    profile_seed.save()
+
+    url = f"/profiles/{profile_seed.id}/document/"
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+    assert response["Content-Encoding"] == "gzip"
+
+    response = client.get(
+        url,
+        HTTP_ACCEPT_ENCODING="gzip",
+        HTTP_IF_NONE_MATCH=response["ETag"],
+    )
+    assert response.status_code == 304
+
+
+def test_streaming_response_is_compressed():
+    chunks = [b"chunk %d\n" % index for index in range(100)]
+
+    response = process(
+        StreamingHttpResponse(iter(chunks), content_type="text/plain")
+    )
+
+    assert response["Content-Encoding"] == "gzip"
+    assert not response.has_header("Content-Length")
+    assert gzip.decompress(b"".join(response.streaming_content)) == b"".join(
+        chunks
+    )
+
+
+def test_async_streaming_response_is_compressed():
+    chunks = [b"chunk %d\n" % index for index in range(100)]
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    async def consume(response):
+        return b"".join([chunk async for chunk in response.streaming_content])
+
+    response = process(
+        StreamingHttpResponse(stream(), content_type="text/plain")
+    )
+
+    assert response["Content-Encoding"] == "gzip"
+    assert gzip.decompress(asyncio.run(consume(response))) == b"".join(chunks)
+
+
+def test_binary_response_is_not_compressed():
+    response = process(HttpResponse(b"\0" * 5000, content_type="image/png"))
+
+    assert not response.has_header("Content-Encoding")
+
+
+@pytest.mark.parametrize(
+    "url, logged_in",
+    [("/admin/login/", False), ("/admin/projects/project/", True)],
+)
+def test_pages_with_secrets_are_not_compressed(
+    client, user_seed, url, logged_in
+):
+    if logged_in:
+        client.force_login(user_seed)
+
+    response = client.get(url, HTTP_ACCEPT_ENCODING="gzip")
+
+    assert response.status_code == 200
+    assert len(response.content) >= 1024
+    assert not response.has_header("Content-Encoding")
+
+
+def test_response_using_the_csrf_token_is_not_compressed():
+    request = RequestFactory().get("/", HTTP_ACCEPT_ENCODING="gzip")
+    request.META["CSRF_COOKIE_NEEDS_UPDATE"] = True
+    response = HttpResponse("a" * 2000)
+
+    response = CompressionMiddleware(lambda request: response)(request)
+
+    assert not response.has_header("Content-Encoding")
@@ -0,0 +1,109 @@
+import pytest
+from django.db.models.signals import post_delete
+from projects.models import (
+    Certificate,
+    ChangeLogEntry,
+    Profile,
+    ProfileSnapshot,
+    Project,
+)
+
+pytestmark = pytest.mark.dependency()
+
+
+def logged(resource, action):
+    return set(
+        ChangeLogEntry.objects.filter(
+            resource=resource, action=action
+        ).values_list("object_id", flat=True)
+    )
+
+
+def test_profile_delete_is_set_based(
+    auth_client,
+    projects_seed,
+    certificate_and_institution_seed,
+    django_assert_max_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    certificate, _ = certificate_and_institution_seed
+    profile = certificate.profiles.get()
+    project_ids = set(Project.objects.values_list("id", flat=True))
+    Project.sync_skills(projects_seed)
+    auth_client.get(f"/profiles/{profile.id}/document/")
+    ChangeLogEntry.objects.all().delete()
+
+    # Independent of the number of projects: one query per table and batch,
+    # the change log entries of each, plus the snapshot invalidation run on
+    # commit.
+    with django_capture_on_commit_callbacks(execute=True):
+        with django_assert_max_num_queries(18):
+            response = auth_client.delete(f"/profiles/{profile.id}/")
+
+    assert response.status_code == 204
+    assert not Profile.objects.exists()
+    assert not Project.objects.exists()
+    assert not Project.skills.through.objects.exists()
+    assert not ProfileSnapshot.objects.exists()
+    assert certificate.profiles.count() == 0
+    assert Certificate.objects.filter(pk=certificate.pk).exists()
+    assert logged("profiles", "delete") == {profile.id}
+    assert logged("projects", "delete") == project_ids
+    assert logged("certificates", "upsert") == {certificate.id}
+
+
+def test_profile_delete_in_chunks(
+    auth_client, projects_seed, settings, django_capture_on_commit_callbacks
+):
+    settings.DELETE_BATCH_SIZE = 7
+    settings.DELETE_IN_CHUNKS = True
+    profile_id = projects_seed[0].profile_id
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = auth_client.delete(f"/profiles/{profile_id}/")
+
+    assert response.status_code == 204
+    assert not Profile.objects.exists()
+    assert not Project.objects.exists()
+    assert len(logged("projects", "delete")) == 30
+
+
+def test_institution_delete_is_set_based(
+    auth_client,
+    certificate_and_institution_seed,
+    django_capture_on_commit_callbacks,
+):
+    certificate, institution = certificate_and_institution_seed
+    profile = certificate.profiles.get()
+    ChangeLogEntry.objects.all().delete()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = auth_client.delete(
+            f"/certifying-institutions/{institution.id}/"
+        )
+
+    assert response.status_code == 204
+    assert not Certificate.objects.exists()
+    assert profile.certificates.count() == 0
+    assert logged("certificates", "delete") == {certificate.id}
+    assert logged("certifying-institutions", "delete") == {institution.id}
+
+
+def test_profile_delete_falls_back_with_other_receivers(
+    auth_client, projects_seed
+):
+    deleted = []
+
+    def receiver(sender, instance, **kwargs):
+        deleted.append(instance.pk)
+
+    post_delete.connect(receiver, sender=Project)
+    try:
+        response = auth_client.delete(
+            f"/profiles/{projects_seed[0].profile_id}/"
+        )
+    finally:
+        post_delete.disconnect(receiver, sender=Project)
+
+    assert response.status_code == 204
+    assert sorted(deleted) == sorted(p.id for p in projects_seed)
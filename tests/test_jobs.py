@@ -0,0 +1,240 @@
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError
+from django.utils import timezone
+from projects import jobs
+from projects.jobs import claim_jobs, enqueue, run_job
+from projects.models import CertifyingInstitution, Job, Profile
+
+pytestmark = pytest.mark.dependency()
+
+PROFILE = {
+    "name": "Profile 2",
+    "github": "http://myfakeurl2.com",
+    "linkedin": "http://myfakeurl2.com",
+    "bio": "Bio do profile 2",
+}
+
+
+@pytest.fixture()
+def flaky_task(monkeypatch):
+    calls = []
+
+    def flaky(fail):
+        calls.append(fail)
+        if fail:
+            raise RuntimeError("Still failing.")
+        return {"ok": True}
+
+    monkeypatch.setitem(jobs.TASKS, "flaky", flaky)
+    return calls
+
+
+def test_upsert_request_can_respond_async(auth_client):
+    response = auth_client.post(
+        "/profiles/upsert/",
+        [PROFILE],
+        format="json",
+        HTTP_PREFER="respond-async",
+    )
+
+    assert response.status_code == 202
+    assert response["Location"] == f"/jobs/{response.json()['id']}/"
+    assert response["Preference-Applied"] == "respond-async"
+    assert response.json()["status"] == "queued"
+    assert not Profile.objects.exists()
+
+    call_command("run_worker", once=True, stdout=None)
+
+    job = auth_client.get(response["Location"]).json()
+    profile = Profile.objects.get()
+    assert job["status"] == "succeeded"
+    assert job["result"] == {"ids": [profile.id]}
+    assert profile.github == PROFILE["github"]
+
+
+def test_queued_duplicate_requests_share_a_job(auth_client):
+    first, second = [
+        auth_client.post(
+            "/profiles/upsert/",
+            PROFILE,
+            format="json",
+            HTTP_PREFER="respond-async",
+        )
+        for _ in range(2)
+    ]
+
+    assert first.json()["id"] == second.json()["id"]
+    assert Job.objects.count() == 1
+
+
+def test_institution_create_can_respond_async(auth_client):
+    data = {
+        "name": "Institution 2",
+        "url": "http://myfakeurl2.com",
+        "certificates": [{"name": "Certificate 2"}],
+    }
+
+    response = auth_client.post(
+        "/certifying-institutions/",
+        data,
+        format="json",
+        HTTP_PREFER="respond-async",
+    )
+    assert response.status_code == 202
+
+    call_command("run_worker", once=True, stdout=None)
+
+    institution = CertifyingInstitution.objects.get()
+    assert institution.certificates.get().name == "Certificate 2"
+    assert Job.objects.get().result == {"id": institution.id}
+
+
+def test_invalid_async_create_fails_at_once(auth_client):
+    response = auth_client.post(
+        "/certifying-institutions/",
+        {"name": "Institution 2"},
+        format="json",
+        HTTP_PREFER="respond-async",
+    )
+
+    assert response.status_code == 400
+    assert not Job.objects.exists()
+
+
+def test_failed_job_is_retried_with_backoff(flaky_task, settings):
+    settings.JOB_RETRY_BACKOFF = 10
+    settings.JOB_MAX_ATTEMPTS = 2
+    job = enqueue("flaky", {"fail": True})
+
+    before = timezone.now()
+    run_job(claim_jobs()[0])
+    job.refresh_from_db()
+
+    assert job.status == Job.QUEUED
+    assert job.attempts == 1
+    assert job.run_after >= before + timedelta(seconds=10)
+    assert claim_jobs() == []
+
+    Job.objects.update(run_after=timezone.now())
+    run_job(claim_jobs()[0])
+    job.refresh_from_db()
+
+    assert job.status == Job.FAILED
+    assert job.attempts == 2
+    assert flaky_task == [True, True]
+    assert "RuntimeError: Still failing." in job.error
+
+
+def test_job_request_hides_the_traceback(auth_client, flaky_task, settings):
+    settings.JOB_MAX_ATTEMPTS = 1
+    job = enqueue("flaky", {"fail": True})
+    run_job(claim_jobs()[0])
+
+    response = auth_client.get(f"/jobs/{job.id}/")
+
+    assert response.json()["status"] == "failed"
+    assert response.json()["error"] == "RuntimeError: Still failing."
+
+
+def test_jobs_of_a_lost_worker_are_claimed_again(flaky_task, settings):
+    job = enqueue("flaky", {"fail": False})
+    claim_jobs()
+    assert claim_jobs() == []
+
+    Job.objects.update(
+        started_at=timezone.now() - timedelta(seconds=settings.JOB_LEASE + 1)
+    )
+
+    assert [claimed.id for claimed in claim_jobs()] == [job.id]
+
+
+def test_snapshot_rebuilds_are_queued(
+    settings, profile_seed, django_capture_on_commit_callbacks
+):
+    settings.PROFILE_SNAPSHOT_ASYNC = True
+
+    with django_capture_on_commit_callbacks(execute=True):
+        profile_seed.bio = "Nova bio"
+        profile_seed.save()
+    with django_capture_on_commit_callbacks(execute=True):
+        profile_seed.name = "Novo nome"
+        profile_seed.save()
+
+    job = Job.objects.get()
+    assert job.task == "rebuild_snapshots"
+    assert job.payload == {"profile_ids": [profile_seed.id]}
+
+    call_command("run_worker", once=True, stdout=None)
+
+    profile_seed.snapshot.refresh_from_db()
+    assert profile_seed.snapshot.document["name"] == "Novo nome"
+
+
+def test_claimed_jobs_no_longer_absorb_duplicates(flaky_task):
+    first = enqueue("flaky", {"fail": False}, dedup=True)
+    claim_jobs()
+
+    second = enqueue("flaky", {"fail": False}, dedup=True)
+
+    assert second.id != first.id
+    assert enqueue("flaky", {"fail": False}, dedup=True).id == second.id
+
+
+def test_one_job_is_queued_per_dedup_key(flaky_task):
+    job = enqueue("flaky", {"fail": False}, dedup=True)
+
+    # As a concurrent writer that missed the queued job would.
+    with pytest.raises(IntegrityError):
+        Job.objects.create(
+            task="flaky", dedup_key=job.dedup_key, run_after=timezone.now()
+        )
+
+
+def test_old_finished_jobs_are_purged(flaky_task, settings):
+    settings.JOB_RETENTION = 3600
+    settings.JOB_MAX_ATTEMPTS = 1
+    old = timezone.now() - timedelta(seconds=3601)
+    for fail in (False, True, False):
+        enqueue("flaky", {"fail": fail})
+        run_job(claim_jobs()[0])
+    Job.objects.exclude(pk=Job.objects.last().pk).update(finished_at=old)
+    queued = enqueue("flaky", {"fail": False})
+    Job.objects.filter(pk=queued.pk).update(created_at=old)
+
+    assert jobs.purge_jobs() == 2
+    assert set(Job.objects.values_list("status", flat=True)) == {
+        Job.SUCCEEDED,
+        Job.QUEUED,
+    }
+    Job.objects.update(finished_at=old)
+    # Not again before JOB_PURGE_INTERVAL.
+    assert jobs.purge_jobs() == 0
+
+
+def test_job_request_requires_authentication(client, flaky_task):
+    job = enqueue("flaky", {"fail": False})
+
+    assert client.get(f"/jobs/{job.id}/").status_code == 401
+
+
+def test_worker_survives_database_errors(monkeypatch, flaky_task, caplog):
+    enqueue("flaky", {"fail": False})
+    errors = iter([OperationalError("Gone away.")])
+    closed = []
+
+    def claim_jobs(claim_jobs=jobs.claim_jobs):
+        for error in errors:
+            raise error
+        return claim_jobs()
+
+    monkeypatch.setattr(jobs, "claim_jobs", claim_jobs)
+    monkeypatch.setattr(
+        jobs, "close_old_connections", lambda: closed.append(True)
+    )
+
+    assert jobs.work(once=True, poll_interval=0) == 1
+    assert "The worker lost the database." in caplog.text
+    assert len(closed) == 3
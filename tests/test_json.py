@@ -0,0 +1,104 @@
+import datetime
+import decimal
+import io
+import uuid
+import zoneinfo
+
+import pytest
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from projects import parsers, renderers
+from projects.parsers import FastJSONParser
+from projects.renderers import FastJSONRenderer
+
+pytestmark = pytest.mark.dependency()
+
+PAYLOADS = [
+    None,
+    [],
+    {"id": 1, "name": "Profile 1", "bio": "Bio com acentuação e 😀"},
+    {
+        "timestamp": datetime.datetime(
+            2023, 7, 1, 1, 2, 3, 5, datetime.timezone.utc
+        )
+    },
+    {
+        "timestamp": datetime.datetime(
+            2023, 1, 1, tzinfo=zoneinfo.ZoneInfo("America/Sao_Paulo")
+        )
+    },
+    {
+        "naive": datetime.datetime(2023, 1, 1),
+        "date": datetime.date(2023, 1, 2),
+    },
+    {"time": datetime.time(1, 2, 3, 4), "delta": datetime.timedelta(5)},
+    {"amount": decimal.Decimal("10.50"), "uuid": uuid.UUID(int=1)},
+    {"control": "tab\tnew\nline\x1f\x7f", "separators": "  "},
+    {1: "integer key", "nested": [{"a": [1.5, True, None]}]},
+    {"big": 2**70},
+]
+
+
+@pytest.mark.parametrize("payload", PAYLOADS)
+def test_renderer_matches_drf_json_renderer(payload):
+    assert FastJSONRenderer().render(payload) == JSONRenderer().render(payload)
+
+
+def test_renderer_matches_drf_json_renderer_with_indent():
+    payload = {"id": 1, "names": ["a", "b"]}
+    media_type = "application/json; indent=4"
+
+    assert FastJSONRenderer().render(
+        payload, media_type
+    ) == JSONRenderer().render(payload, media_type)
+
+
+def test_renderer_falls_back_without_orjson(monkeypatch):
+    monkeypatch.setattr(renderers, "orjson", None)
+    payload = PAYLOADS[3]
+
+    assert FastJSONRenderer().render(payload) == JSONRenderer().render(payload)
+
+
+@pytest.mark.parametrize(
+    "body",
+    [
+        b'{"name": "Profile 1", "bio": "acentua\\u00e7\\u00e3o \xc3\xa9"}',
+        b"[1, 2.5, true, null]",
+        b'{"big": 1180591620717411303424}',
+    ],
+)
+def test_parser_matches_drf_json_parser(body):
+    assert FastJSONParser().parse(io.BytesIO(body)) == JSONParser().parse(
+        io.BytesIO(body)
+    )
+
+
+@pytest.mark.parametrize("body", [b"{", b'{"value": NaN}', b"\xff"])
+def test_parser_rejects_invalid_json(body):
+    with pytest.raises(ParseError):
+        FastJSONParser().parse(io.BytesIO(body))
+
+
+def test_parser_falls_back_without_orjson(monkeypatch):
+    monkeypatch.setattr(parsers, "orjson", None)
+
+    assert FastJSONParser().parse(io.BytesIO(b'{"a": [1]}')) == {"a": [1]}
+
+
+def test_api_uses_fast_json_classes(auth_client):
+    response = auth_client.post(
+        "/profiles/",
+        {
+            "name": "Profile 😀",
+            "github": "http://myfakeurl.com",
+            "linkedin": "http://myfakeurl.com",
+            "bio": "Bio",
+        },
+        format="json",
+    )
+
+    assert response.status_code == 201
+    assert isinstance(response.accepted_renderer, FastJSONRenderer)
+    assert response.content == JSONRenderer().render(response.data)
@@ -0,0 +1,128 @@
+import threading
+
+import pytest
+from django.http import HttpResponse
+from django.test import RequestFactory
+from projects import metrics
+from projects.middleware import LoadSheddingMiddleware, endpoint_class
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.fixture()
+def limits(settings):
+    settings.CONCURRENCY_LIMITS = {
+        "cached": 1,
+        "heavy": 1,
+        "writes": 1,
+        "token": 1,
+    }
+    settings.CONCURRENCY_QUEUE_TIMEOUT = 0.05
+    settings.CONCURRENCY_LATENCY_TARGET = 1.0
+
+
+class BlockingView:
+    def __init__(self):
+        self.started = threading.Event()
+        self.finish = threading.Event()
+
+    def __call__(self, request):
+        if request.path_info == "/projects/1/":
+            self.started.set()
+            self.finish.wait(5)
+        return HttpResponse("ok")
+
+
+@pytest.fixture()
+def blocked(limits):
+    """A middleware whose cached-read pool is held by a request to
+    /projects/1/ until the test finishes."""
+    view = BlockingView()
+    middleware = LoadSheddingMiddleware(view)
+    thread = threading.Thread(
+        target=middleware, args=[RequestFactory().get("/projects/1/")]
+    )
+    thread.start()
+    view.started.wait(5)
+    yield middleware
+    view.finish.set()
+    thread.join()
+
+
+@pytest.mark.parametrize(
+    "method, path, headers, pool",
+    [
+        ("get", "/health/", {}, None),
+        ("post", "/token/", {}, "token"),
+        ("post", "/token/refresh/", {}, "token"),
+        ("get", "/projects/", {}, "heavy"),
+        ("get", "/projects/facets/", {}, "heavy"),
+        ("get", "/changes/", {}, "heavy"),
+        ("get", "/admin/projects/profile/", {}, "heavy"),
+        ("get", "/projects/1/", {}, "cached"),
+        ("get", "/profiles/1/document/", {}, "cached"),
+        ("get", "/missing/", {}, "cached"),
+        (
+            "patch",
+            "/projects/1/",
+            {"HTTP_AUTHORIZATION": "Bearer x"},
+            "writes",
+        ),
+        ("post", "/batch/", {}, "heavy"),
+        ("post", "/batch/", {"HTTP_AUTHORIZATION": "Bearer x"}, "heavy"),
+    ],
+)
+def test_endpoint_class(method, path, headers, pool):
+    request = getattr(RequestFactory(), method)(path, **headers)
+
+    assert endpoint_class(request) == pool
+
+
+def test_request_is_shed_when_its_pool_is_full(blocked):
+    response = blocked(RequestFactory().get("/projects/2/"))
+
+    assert response.status_code == 503
+    assert response["Retry-After"] == "1"
+    assert metrics.counters() == {"requests_shed:cached": 1}
+
+
+def test_other_pools_keep_their_capacity(blocked):
+    factory = RequestFactory()
+    write = factory.patch("/projects/2/", HTTP_AUTHORIZATION="Bearer x")
+
+    assert blocked(write).status_code == 200
+    assert blocked(factory.get("/projects/")).status_code == 200
+    assert blocked(factory.get("/health/")).status_code == 200
+
+
+def test_queued_request_gets_a_released_slot(limits, settings):
+    settings.CONCURRENCY_QUEUE_TIMEOUT = 5
+    view = BlockingView()
+    middleware = LoadSheddingMiddleware(view)
+    thread = threading.Thread(
+        target=middleware, args=[RequestFactory().get("/projects/1/")]
+    )
+    thread.start()
+    view.started.wait(5)
+
+    threading.Timer(0.05, view.finish.set).start()
+    response = middleware(RequestFactory().get("/projects/2/"))
+    thread.join()
+
+    assert response.status_code == 200
+
+
+def test_slow_pool_sheds_without_queueing(blocked, settings):
+    settings.CONCURRENCY_QUEUE_TIMEOUT = 5
+    blocked.limiters["cached"].latency = 2.0
+
+    response = blocked(RequestFactory().get("/projects/2/"))
+
+    assert response.status_code == 503
+
+
+def test_health_request(client):
+    response = client.get("/health/")
+
+    assert response.status_code == 200
+    assert response.json() == {"status": "ok"}
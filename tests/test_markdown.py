@@ -0,0 +1,121 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from projects.markup import render_markdown
+from projects.models import Profile, Project
+
+pytestmark = pytest.mark.dependency()
+
+BIO = "Hi, **I** build [APIs](http://myfakeurl.com)."
+BIO_HTML = (
+    '<p>Hi, <strong>I</strong> build <a href="http://myfakeurl.com">APIs</a>'
+    ".</p>\n"
+)
+
+
+def test_markdown_is_rendered_on_save(profile_seed):
+    profile_seed.bio = BIO
+    profile_seed.save()
+
+    assert Profile.objects.get().bio_html == BIO_HTML
+
+
+def test_rendered_markdown_is_sanitized(profile_seed):
+    profile_seed.bio = (
+        "<script>alert(1)</script> [x](javascript:alert(1)) "
+        '<img src=x onerror="alert(1)">'
+    )
+    profile_seed.save()
+
+    assert "<script>" not in profile_seed.bio_html
+    assert "<img" not in profile_seed.bio_html
+    assert "href" not in profile_seed.bio_html
+
+
+def test_only_image_data_urls_are_rendered():
+    html = render_markdown(
+        "[x](data:text/html;base64,PHNjcmlwdD4=) "
+        "![i](data:image/png;base64,iVBORw0KGgo=) "
+        "[f](file:///etc/passwd)"
+    )
+
+    assert "href" not in html
+    assert '<img src="data:image/png;base64,iVBORw0KGgo="' in html
+
+
+def test_partial_update_renders_markdown(auth_client, project_seed):
+    response = auth_client.patch(
+        f"/projects/{project_seed.id}/",
+        {"description": "*nova*"},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert "description_html" not in response.json()
+    project_seed.refresh_from_db()
+    assert project_seed.description_html == "<p><em>nova</em></p>\n"
+
+
+def test_upsert_renders_markdown(auth_client, profile_seed):
+    response = auth_client.post(
+        "/profiles/upsert/?markup=html",
+        {
+            "name": profile_seed.name,
+            "github": profile_seed.github,
+            "linkedin": profile_seed.linkedin,
+            "bio": BIO,
+        },
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert response.json()["bio_html"] == BIO_HTML
+    assert Profile.objects.get().bio_html == BIO_HTML
+
+
+def test_html_is_served_on_request(auth_client, profile_seed, project_seed):
+    profile_seed.bio = BIO
+    profile_seed.save()
+
+    profiles = auth_client.get("/profiles/?markup=html").json()
+    projects = auth_client.get("/projects/?markup=html").json()
+
+    assert profiles[0]["bio_html"] == BIO_HTML
+    assert projects[0]["description_html"] == project_seed.description_html
+    assert "bio_html" not in auth_client.get("/profiles/").json()[0]
+    assert "description_html" not in auth_client.get("/projects/").json()[0]
+
+
+def test_profile_page_shows_rendered_markdown(client, profile_seed):
+    profile_seed.bio = BIO
+    profile_seed.save()
+
+    response = client.get(f"/profiles/{profile_seed.id}/")
+
+    assert BIO_HTML in response.content.decode()
+
+
+def test_render_markdown_command(
+    client, profile_seed, project_seed, django_capture_on_commit_callbacks
+):
+    url = f"/profiles/{profile_seed.id}/"
+    Profile.objects.update(bio=BIO)
+    Project.objects.update(description_html="")
+    client.get(url)
+    out = StringIO()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        call_command("render_markdown", stdout=out)
+
+    assert (
+        out.getvalue() == "Re-rendered 1 profiles.\nRe-rendered 1 projects.\n"
+    )
+    assert Profile.objects.get().bio_html == BIO_HTML
+    assert BIO_HTML in client.get(url).content.decode()
+
+    out = StringIO()
+    call_command("render_markdown", stdout=out)
+    assert (
+        out.getvalue() == "Re-rendered 0 profiles.\nRe-rendered 0 projects.\n"
+    )
@@ -0,0 +1,129 @@
+import tracemalloc
+
+import pytest
+from django.core.cache import cache
+from projects.models import (
+    Certificate,
+    CertifyingInstitution,
+    Profile,
+    Project,
+)
+
+pytestmark = pytest.mark.dependency()
+
+SIZES = [100, 1000]
+PAGE = 50
+KB = 1024
+
+# Budgets are about twice what the endpoints need today, as measured by
+# tracemalloc: Python objects only, not the worker's RSS.
+#
+# Peak bytes allocated while serving one page of PAGE rows, or the profile
+# page of a profile with PAGE projects and certificates. Neither may grow
+# with the size of the tables.
+PAGE_BUDGETS = {
+    "/projects/": 192 * KB,
+    "/certificates/": 160 * KB,
+    "/certifying-institutions/": 576 * KB,
+    "profile-page": 384 * KB,
+}
+# Peak bytes per row while serving a whole, unpaginated list.
+ROW_BUDGETS = {
+    "/projects/": 2.5 * KB,
+    "/certificates/": 2 * KB,
+    # Still model serialized, with the nested certificates.
+    "/certifying-institutions/": 10 * KB,
+}
+# How much the peak of a page may grow when the tables grow tenfold.
+GROWTH_ALLOWANCE = 1.25
+
+
+def seed(profile, rows):
+    """Add rows projects, institutions and certificates, each certificate
+    from its own institution and held by profile."""
+    start = Project.objects.count()
+    Project.objects.bulk_create(
+        Project(
+            name=f"Projeto {index}",
+            description="Descrição do projeto " * 5,
+            github_url=f"http://myfakeurl{index}.com",
+            keyword="keyword1",
+            key_skill="key_skill1",
+            profile=profile,
+        )
+        for index in range(start, start + rows)
+    )
+    institutions = CertifyingInstitution.objects.bulk_create(
+        CertifyingInstitution(
+            name=f"Institution {index}", url=f"http://myfakeurl{index}.com"
+        )
+        for index in range(start, start + rows)
+    )
+    certificates = Certificate.objects.bulk_create(
+        Certificate(name=f"Certificate {index}", certifying_institution=i)
+        for index, i in enumerate(institutions, start)
+    )
+    profile.certificates.add(*certificates)
+
+
+def peak_allocation(client, url, **extra):
+    """Peak bytes allocated by one request, after a warm-up request has
+    paid for imports, compiled templates and the like."""
+    assert client.get(url, **extra).status_code == 200
+    cache.clear()
+
+    tracemalloc.start()
+    try:
+        response = client.get(url, **extra)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert response.status_code == 200
+    return peak
+
+
+@pytest.fixture()
+def other_profile():
+    return Profile.objects.create(
+        name="Profile 2",
+        github="http://myfakeurl2.com",
+        linkedin="http://myfakeurl2.com",
+        bio="Bio do profile 2",
+    )
+
+
+@pytest.mark.parametrize("endpoint", ROW_BUDGETS)
+def test_page_memory_does_not_grow_with_tables(
+    client, auth_client, other_profile, endpoint
+):
+    peaks = []
+    for size in SIZES:
+        seed(other_profile, size - Project.objects.count())
+        peaks.append(peak_allocation(client, f"{endpoint}?limit={PAGE}"))
+
+    assert max(peaks) <= PAGE_BUDGETS[endpoint]
+    assert peaks[-1] <= peaks[0] * GROWTH_ALLOWANCE
+
+
+def test_profile_page_memory_does_not_grow_with_tables(
+    client, profile_seed, other_profile
+):
+    seed(profile_seed, PAGE)
+    url = f"/profiles/{profile_seed.id}/"
+
+    peaks = []
+    for size in SIZES:
+        seed(other_profile, size - Project.objects.count())
+        peaks.append(peak_allocation(client, url, HTTP_ACCEPT="text/html"))
+
+    assert max(peaks) <= PAGE_BUDGETS["profile-page"]
+    assert peaks[-1] <= peaks[0] * GROWTH_ALLOWANCE
+
+
+@pytest.mark.parametrize("endpoint", ROW_BUDGETS)
+def test_list_memory_per_row(client, auth_client, other_profile, endpoint):
+    seed(other_profile, SIZES[-1])
+
+    peak = peak_allocation(client, endpoint)
+
+    assert peak / SIZES[-1] <= ROW_BUDGETS[endpoint]
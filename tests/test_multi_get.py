@@ -0,0 +1,53 @@
+import pytest
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.mark.parametrize("projects_seed", [3], indirect=True)
+def test_project_multi_get_request(
+    auth_client, projects_seed, django_assert_num_queries
+):
+    first, second, third = projects_seed
+    ids = f"{third.id},{first.id},999"
+
+    with django_assert_num_queries(2):
+        response = auth_client.get("/projects/", {"ids": ids})
+
+    assert response.status_code == 200
+    assert [project["id"] for project in response.json()["results"]] == [
+        third.id,
+        first.id,
+    ]
+    assert response.json()["missing"] == [999]
+
+
+def test_certificate_multi_get_request(
+    auth_client, certificate_and_institution_seed
+):
+    certificate, _ = certificate_and_institution_seed
+    response = auth_client.get(
+        "/certificates/", {"ids": f"{certificate.id},{certificate.id}"}
+    )
+
+    assert response.status_code == 200
+    assert len(response.json()["results"]) == 1
+    assert response.json()["results"][0]["profiles"] == [
+        profile.id for profile in certificate.profiles.all()
+    ]
+    assert response.json()["missing"] == []
+
+
+def test_multi_get_request_with_invalid_ids(auth_client, profile_seed):
+    response = auth_client.get("/profiles/", {"ids": "1,abc"})
+    assert response.status_code == 400
+
+
+def test_multi_get_request_over_the_limit(auth_client, settings):
+    settings.MULTI_GET_MAX_IDS = 2
+    response = auth_client.get("/certifying-institutions/", {"ids": "1,2,3"})
+    assert response.status_code == 400
+
+
+def test_multi_get_request_without_authentication(client, projects_seed):
+    response = client.get("/projects/", {"ids": str(projects_seed[0].id)})
+    assert response.status_code == 401
@@ -0,0 +1,88 @@
+import pytest
+from projects.models import Project
+
+pytestmark = [
+    pytest.mark.dependency(),
+    pytest.mark.parametrize("projects_seed", [5], indirect=True),
+]
+
+
+def test_paginated_list_with_exact_count(auth_client, projects_seed):
+    response = auth_client.get("/projects/", {"limit": 2})
+
+    assert response.status_code == 200
+    assert response.json()["count"] == 5
+    assert response.json()["count_exact"] is True
+    assert len(response.json()["results"]) == 2
+    assert "offset=2" in response.json()["next"]
+
+
+def test_paginated_list_with_cached_count(
+    auth_client,
+    projects_seed,
+    settings,
+    django_capture_on_commit_callbacks,
+    django_assert_num_queries,
+):
+    settings.API_COUNT_THRESHOLD = 3
+    response = auth_client.get("/projects/", {"limit": 2})
+    assert response.json()["count"] == 5
+    assert response.json()["count_exact"] is False
+
+    with django_capture_on_commit_callbacks(execute=True):
+        Project.objects.filter(pk=projects_seed[0].pk).delete()
+
+    # User lookup, bounded count and page; the total comes from the cache.
+    with django_assert_num_queries(3):
+        response = auth_client.get("/projects/", {"limit": 2})
+    assert response.json()["count"] == 4
+
+
+def test_upserts_adjust_the_cached_count(
+    auth_client,
+    projects_seed,
+    settings,
+    django_capture_on_commit_callbacks,
+    django_assert_num_queries,
+):
+    settings.API_COUNT_THRESHOLD = 3
+    auth_client.get("/projects/", {"limit": 2})
+    payload = [
+        {
+            "name": "Projeto importado",
+            "description": "Descrição",
+            "github_url": github_url,
+            "keyword": "keyword1",
+            "key_skill": "key_skill1",
+            "profile_id": projects_seed[0].profile_id,
+        }
+        for github_url in [projects_seed[0].github_url, "http://novo.com"]
+    ]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        auth_client.post("/projects/upsert/", payload, format="json")
+
+    # Only the inserted row is counted, without counting the table again.
+    with django_assert_num_queries(3):
+        response = auth_client.get("/projects/", {"limit": 2})
+    assert response.json()["count"] == 6
+
+
+def test_paginated_filtered_list_over_threshold(
+    auth_client, projects_seed, settings
+):
+    settings.API_COUNT_THRESHOLD = 3
+    response = auth_client.get(
+        "/projects/",
+        {"limit": 3, "offset": 3, "profile": projects_seed[0].profile_id},
+    )
+
+    assert response.json()["count"] == 3
+    assert response.json()["count_exact"] is False
+    assert len(response.json()["results"]) == 2
+    assert response.json()["next"] is None
+
+
+def test_unpaginated_list_is_unchanged(auth_client, projects_seed):
+    response = auth_client.get("/projects/")
+    assert len(response.json()) == 5
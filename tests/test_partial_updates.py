@@ -0,0 +1,171 @@
+import pytest
+from django.db import DatabaseError, transaction
+from projects.models import Profile, Project
+from projects.views import ProjectViewSet
+
+pytestmark = pytest.mark.dependency()
+
+
+def statements(captured):
+    return [
+        query["sql"]
+        for query in captured
+        if not query["sql"].startswith(("SAVEPOINT", "RELEASE SAVEPOINT"))
+    ]
+
+
+def test_partial_update_writes_only_changed_fields(
+    auth_client, project_seed, django_assert_max_num_queries
+):
+    with django_assert_max_num_queries(6) as captured:
+        response = auth_client.patch(
+            f"/projects/{project_seed.id}/",
+            {"name": "Projeto 1 alterado", "keyword": project_seed.keyword},
+            format="json",
+        )
+
+    assert response.status_code == 200
+    # User lookup, project lookup, a single UPDATE and its change log entry.
+    assert len(statements(captured)) == 4
+    update = statements(captured)[-2]
+    assert update.startswith("UPDATE")
+    assert '"name"' in update and '"version"' in update
+    assert '"keyword"' not in update
+    assert response["ETag"] == '"2"'
+
+
+def test_partial_update_without_changes_skips_the_write(
+    auth_client, project_seed, django_assert_max_num_queries
+):
+    with django_assert_max_num_queries(4) as captured:
+        response = auth_client.patch(
+            f"/projects/{project_seed.id}/",
+            {"name": project_seed.name},
+            format="json",
+        )
+
+    assert response.status_code == 200
+    # User lookup and project lookup only.
+    assert len(statements(captured)) == 2
+    assert response["ETag"] == '"1"'
+
+
+def test_retrieve_returns_version_etag(
+    auth_client, certificate_and_institution_seed
+):
+    certificate, _ = certificate_and_institution_seed
+    response = auth_client.get(f"/certificates/{certificate.id}/")
+    assert response["ETag"] == f'"{certificate.version}"'
+
+
+def test_partial_update_with_matching_if_match(auth_client, project_seed):
+    response = auth_client.patch(
+        f"/projects/{project_seed.id}/",
+        {"name": "Projeto 1 alterado"},
+        format="json",
+        HTTP_IF_MATCH='"1"',
+    )
+
+    assert response.status_code == 200
+    assert Project.objects.get().version == 2
+
+
+def test_partial_update_with_stale_if_match(auth_client, project_seed):
+    project_seed.name = "Projeto 1 alterado por outra pessoa"
+    project_seed.save()
+
+    response = auth_client.patch(
+        f"/projects/{project_seed.id}/",
+        {"name": "Projeto 1 alterado"},
+        format="json",
+        HTTP_IF_MATCH='"1"',
+    )
+
+    assert response.status_code == 412
+    assert Project.objects.get().name == "Projeto 1 alterado por outra pessoa"
+
+
+@pytest.mark.parametrize(
+    "headers, status_code, name",
+    [
+        ({}, 200, "Projeto 1 alterado"),
+        ({"HTTP_IF_MATCH": '"1"'}, 412, "Projeto concorrente"),
+    ],
+)
+def test_write_landing_after_the_read(
+    auth_client, project_seed, monkeypatch, headers, status_code, name
+):
+    get_object = ProjectViewSet.get_object
+
+    def get_object_then_write(self):
+        instance = get_object(self)
+        Project.objects.filter(pk=instance.pk).update(
+            name="Projeto concorrente", version=2
+        )
+        return instance
+
+    monkeypatch.setattr(ProjectViewSet, "get_object", get_object_then_write)
+    response = auth_client.patch(
+        f"/projects/{project_seed.id}/",
+        {"name": "Projeto 1 alterado"},
+        format="json",
+        **headers,
+    )
+
+    # Only a precondition the client sent can fail.
+    assert response.status_code == status_code
+    assert Project.objects.get().name == name
+
+
+def test_concurrent_write_is_detected_without_re_reading(project_seed):
+    stale = Project.objects.get(pk=project_seed.pk)
+    project_seed.name = "Projeto 1 alterado"
+    project_seed.save()
+
+    stale.name = "Projeto 1 sobrescrito"
+    stale.expected_version = stale.version
+    with pytest.raises(DatabaseError), transaction.atomic():
+        stale.save(update_fields=["name"])
+
+    assert Project.objects.get().name == "Projeto 1 alterado"
+    assert stale.version == 1
+
+
+def test_many_to_many_update_with_stale_if_match(
+    auth_client, certificate_and_institution_seed, profile_seed
+):
+    certificate, _ = certificate_and_institution_seed
+    other = Profile.objects.create(
+        name="Profile 2", github="http://myfakeurl2.com", bio="Bio"
+    )
+    url = f"/certificates/{certificate.id}/"
+
+    response = auth_client.patch(
+        url, {"profiles": [other.id]}, format="json", HTTP_IF_MATCH='"1"'
+    )
+    assert response.status_code == 200
+    assert response["ETag"] == '"2"'
+
+    response = auth_client.patch(
+        url,
+        {"profiles": [profile_seed.id]},
+        format="json",
+        HTTP_IF_MATCH='"1"',
+    )
+    assert response.status_code == 412
+    assert list(certificate.profiles.all()) == [other]
+
+
+def test_unchanged_many_to_many_skips_the_write(
+    auth_client, certificate_and_institution_seed, profile_seed
+):
+    certificate, _ = certificate_and_institution_seed
+
+    response = auth_client.patch(
+        f"/certificates/{certificate.id}/",
+        {"profiles": [profile_seed.id]},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert response["ETag"] == '"1"'
@@ -0,0 +1,100 @@
+import pytest
+
+pytestmark = pytest.mark.dependency()
+
+
+def test_profile_document_request(
+    client,
+    profile_seed,
+    project_seed,
+    certificate_and_institution_seed,
+    django_assert_num_queries,
+):
+    certificate, institution = certificate_and_institution_seed
+
+    # Snapshot lookup, three document queries and the snapshot upsert.
+    with django_assert_num_queries(5):
+        response = client.get(f"/profiles/{profile_seed.id}/document/")
+
+    assert response.status_code == 200
+    assert response.json().keys() == {
+        "id",
+        "name",
+        "github",
+        "linkedin",
+        "bio",
+        "avatar",
+        "bio_html",
+        "projects",
+        "certificates",
+    }
+    assert response.json()["projects"] == [
+        {
+            "id": project_seed.id,
+            "name": project_seed.name,
+            "description": project_seed.description,
+            "description_html": project_seed.description_html,
+            "github_url": project_seed.github_url,
+            "keyword": project_seed.keyword,
+            "key_skill": project_seed.key_skill,
+        }
+    ]
+    assert response.json()["certificates"][0]["id"] == certificate.id
+    assert response.json()["certificates"][0]["certifying_institution"] == {
+        "id": institution.id,
+        "name": institution.name,
+        "url": institution.url,
+    }
+
+
+def test_profile_document_is_cached(
+    client, profile_seed, project_seed, django_assert_num_queries
+):
+    first = client.get(f"/profiles/{profile_seed.id}/document/")
+
+    with django_assert_num_queries(0):
+        second = client.get(f"/profiles/{profile_seed.id}/document/")
+
+    assert second.json() == first.json()
+    assert second["ETag"] == first["ETag"]
+
+
+def test_profile_document_not_modified(client, profile_seed):
+    response = client.get(f"/profiles/{profile_seed.id}/document/")
+    response = client.get(
+        f"/profiles/{profile_seed.id}/document/",
+        HTTP_IF_NONE_MATCH=response["ETag"],
+    )
+
+    assert response.status_code == 304
+
+
+def test_profile_document_is_invalidated_on_write(
+    client,
+    project_seed,
+    certificate_and_institution_seed,
+    django_capture_on_commit_callbacks,
+):
+    _, institution = certificate_and_institution_seed
+    url = f"/profiles/{project_seed.profile_id}/document/"
+    client.get(url)
+
+    with django_capture_on_commit_callbacks(execute=True):
+        project_seed.name = "Projeto 1 alterado"
+        project_seed.save()
+    assert client.get(url).json()["projects"][0]["name"] == (
+        "Projeto 1 alterado"
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        institution.name = "Certifying Institution 2"
+        institution.save()
+    certificates = client.get(url).json()["certificates"]
+    assert certificates[0]["certifying_institution"]["name"] == (
+        "Certifying Institution 2"
+    )
+
+
+def test_profile_document_not_found(client):
+    response = client.get("/profiles/999/document/")
+    assert response.status_code == 404
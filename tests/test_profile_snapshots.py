@@ -0,0 +1,65 @@
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from projects.documents import invalidate_profile_documents
+from projects.models import ProfileSnapshot, Project
+from pytest_django.asserts import assertContains
+
+pytestmark = pytest.mark.dependency()
+
+
+def test_profile_snapshot_is_built_on_first_read(client, project_seed):
+    client.get(f"/profiles/{project_seed.profile_id}/document/")
+
+    snapshot = ProfileSnapshot.objects.get(profile_id=project_seed.profile_id)
+    assert not snapshot.is_stale
+    assert snapshot.document["projects"][0]["name"] == project_seed.name
+
+
+def test_profile_snapshot_is_served_directly(
+    client, project_seed, django_assert_num_queries
+):
+    url = f"/profiles/{project_seed.profile_id}/document/"
+    client.get(url)
+    cache.clear()
+
+    with django_assert_num_queries(1):
+        response = client.get(url)
+    assert response.json()["projects"][0]["name"] == project_seed.name
+
+
+def test_profile_snapshot_is_rebuilt_after_write(
+    client, project_seed, django_capture_on_commit_callbacks
+):
+    client.get(f"/profiles/{project_seed.profile_id}/")
+
+    with django_capture_on_commit_callbacks(execute=True):
+        project_seed.name = "Projeto 1 alterado"
+        project_seed.save()
+
+    snapshot = ProfileSnapshot.objects.get(profile_id=project_seed.profile_id)
+    assert not snapshot.is_stale
+    assert snapshot.document["projects"][0]["name"] == "Projeto 1 alterado"
+
+
+def test_stale_profile_snapshot_is_not_served(client, project_seed):
+    url = f"/profiles/{project_seed.profile_id}/"
+    client.get(url)
+
+    Project.objects.filter(pk=project_seed.pk).update(
+        name="Projeto 1 alterado"
+    )
+    invalidate_profile_documents([project_seed.profile_id])
+
+    assert ProfileSnapshot.objects.get().is_stale
+    assertContains(client.get(url), "Projeto 1 alterado")
+
+
+def test_rebuild_snapshots_command(profile_seed, project_seed, capsys):
+    call_command("rebuild_snapshots", workers=1)
+
+    assert ProfileSnapshot.objects.count() == 1
+    assert "Rebuilt 1 profile snapshots." in capsys.readouterr().out
+
+    call_command("rebuild_snapshots", workers=1, stale_only=True)
+    assert "Rebuilt 0 profile snapshots." in capsys.readouterr().out
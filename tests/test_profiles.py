@@ -10,7 +10,7 @@ def test_profile_post_request(auth_client, profile_seed):
         "/profiles/",
         {
             "name": "Profile 2",
-            "github": "http://myfakeurl.com",
+            "github": "http://myfakeurl2.com",
             "linkedin": "http://myfakeurl.com",
             "bio": "Bio do profile 2",
         },
@@ -47,6 +47,7 @@ def test_profile_get_all_request(auth_client, profile_seed):
             "github": profile_seed.github,
             "linkedin": profile_seed.linkedin,
             "bio": profile_seed.bio,
+            "avatar": None,
         }
     ]
 
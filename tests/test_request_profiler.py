@@ -0,0 +1,122 @@
+import json
+import pstats
+
+import pytest
+from django.contrib.auth.models import User
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.fixture(autouse=True)
+def profiles_dir(settings, tmp_path):
+    settings.REQUEST_PROFILER_DIR = str(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture()
+def regular_user():
+    return User.objects.create_user(username="regular", password="pass")
+
+
+def test_staff_can_profile_an_api_request(
+    client, auth_client, project_seed, profiles_dir
+):
+    res = client.get("/projects/?_profile=1")
+
+    assert res.status_code == 200
+    name = res["X-Request-Profile"]
+    stats = pstats.Stats(str(profiles_dir / f"{name}.prof"))
+    assert stats.total_calls > 0
+
+    details = json.loads((profiles_dir / f"{name}.json").read_text())
+    assert details["method"] == "GET"
+    assert details["path"] == "/projects/?_profile=1"
+    assert details["status"] == 200
+    assert any("projects_project" in q["sql"] for q in details["queries"])
+
+
+def test_requests_are_not_profiled_without_the_parameter(
+    client, auth_client, project_seed, profiles_dir
+):
+    res = client.get("/projects/")
+
+    assert "X-Request-Profile" not in res
+    assert list(profiles_dir.iterdir()) == []
+
+
+def test_non_staff_cannot_profile(client, regular_user, profiles_dir):
+    client.force_login(regular_user)
+
+    res = client.get("/profiles/?_profile=1")
+
+    assert "X-Request-Profile" not in res
+    assert list(profiles_dir.iterdir()) == []
+
+
+def test_staff_session_can_profile_html_pages(client, user_seed, profile_seed):
+    client.force_login(user_seed)
+
+    res = client.get(
+        f"/profiles/{profile_seed.id}/?_profile=1", HTTP_ACCEPT="text/html"
+    )
+
+    assert res.status_code == 200
+    assert "X-Request-Profile" in res
+
+
+def test_sampled_requests_are_profiled(client, settings, profiles_dir):
+    settings.REQUEST_PROFILER_SAMPLE_PERCENT = 100
+
+    res = client.get("/profiles/")
+
+    assert "X-Request-Profile" in res
+    assert len(list(profiles_dir.glob("*.prof"))) == 1
+
+
+def test_only_the_newest_profiles_are_kept(client, settings, profiles_dir):
+    settings.REQUEST_PROFILER_SAMPLE_PERCENT = 100
+    settings.REQUEST_PROFILER_KEEP = 2
+
+    names = [client.get("/profiles/")["X-Request-Profile"] for _ in range(3)]
+
+    assert (
+        sorted(path.stem for path in profiles_dir.glob("*.json"))
+        == sorted(names)[1:]
+    )
+    assert len(list(profiles_dir.glob("*.prof"))) == 2
+
+
+def test_admin_lists_and_downloads_profiles(client, user_seed, settings):
+    settings.REQUEST_PROFILER_SAMPLE_PERCENT = 100
+    name = client.get("/profiles/")["X-Request-Profile"]
+    settings.REQUEST_PROFILER_SAMPLE_PERCENT = 0
+    client.force_login(user_seed)
+
+    res = client.get("/admin/request-profiles/")
+    assert res.status_code == 200
+    assert f"/admin/request-profiles/{name}.prof" in res.content.decode()
+
+    res = client.get(f"/admin/request-profiles/{name}.json")
+    assert res.status_code == 200
+    assert res["Content-Disposition"] == (
+        f'attachment; filename="{name}.json"'
+    )
+    assert json.loads(b"".join(res.streaming_content))["path"] == "/profiles/"
+
+
+def test_profile_downloads_are_validated(client, user_seed):
+    client.force_login(user_seed)
+
+    assert client.get("/admin/request-profiles/nope.prof").status_code == 404
+    assert (
+        client.get("/admin/request-profiles/20240101T000000-0000abcd.py")
+    ).status_code == 404
+
+
+def test_profiles_are_staff_only(client, regular_user):
+    client.force_login(regular_user)
+
+    res = client.get("/admin/request-profiles/")
+
+    assert res.status_code == 302
+    assert res["Location"].startswith("/admin/login/")
@@ -0,0 +1,83 @@
+import pytest
+from projects.models import Project, Skill
+
+pytestmark = pytest.mark.dependency()
+
+
+def test_project_skills_are_normalized(project_seed, profile_seed):
+    project = Project.objects.create(
+        name="Projeto 2",
+        description="Descrição do projeto 2",
+        github_url="http://myfakeurl2.com",
+        keyword="  Python ",
+        key_skill="PYTHON",
+        profile=profile_seed,
+    )
+
+    assert project.keyword == "Python"
+    assert Skill.objects.filter(slug="python").count() == 1
+    assert list(project.skills.values_list("slug", flat=True)) == ["python"]
+    assert project_seed.skills.count() == 2
+
+
+def test_project_skills_follow_keyword_updates(project_seed):
+    project_seed.keyword = "Django"
+    project_seed.save()
+
+    assert set(project_seed.skills.values_list("slug", flat=True)) == {
+        "django",
+        "key_skill1",
+    }
+
+
+def test_project_filter_by_skill(auth_client, project_seed, profile_seed):
+    Project.objects.create(
+        name="Projeto 2",
+        description="Descrição do projeto 2",
+        github_url="http://myfakeurl2.com",
+        keyword="python",
+        key_skill="django",
+        profile=profile_seed,
+    )
+
+    response = auth_client.get("/projects/", {"skill": "KEYWORD1"})
+
+    assert response.status_code == 200
+    assert [project["id"] for project in response.json()] == [
+        project_seed.id
+    ]
+
+
+def test_project_skill_facets(
+    auth_client, project_seed, profile_seed, django_assert_num_queries
+):
+    Project.objects.create(
+        name="Projeto 2",
+        description="Descrição do projeto 2",
+        github_url="http://myfakeurl2.com",
+        keyword="Keyword1",
+        key_skill="django",
+        profile=profile_seed,
+    )
+
+    response = auth_client.get("/projects/facets/")
+
+    assert response.status_code == 200
+    assert response.json() == [
+        {"slug": "keyword1", "name": "keyword1", "count": 2},
+        {"slug": "django", "name": "django", "count": 1},
+        {"slug": "key_skill1", "name": "key_skill1", "count": 1},
+    ]
+
+    with django_assert_num_queries(2):
+        response = auth_client.get("/projects/facets/", {"skill": "django"})
+
+    assert response.json() == [
+        {"slug": "django", "name": "django", "count": 1},
+        {"slug": "keyword1", "name": "keyword1", "count": 1},
+    ]
+
+
+def test_project_skill_facets_without_authentication(client):
+    response = client.get("/projects/facets/")
+    assert response.status_code == 401
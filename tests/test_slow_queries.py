@@ -0,0 +1,119 @@
+import multiprocessing
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from projects import slow_queries
+from projects.models import Project
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.fixture()
+def log_every_query(settings):
+    settings.SLOW_QUERY_THRESHOLD = 0
+    slow_queries.reset()
+
+
+def report(*args):
+    out = StringIO()
+    call_command("slow_query_report", *args, stdout=out)
+    return out.getvalue()
+
+
+def test_fingerprints_ignore_values():
+    assert (
+        slow_queries.fingerprint(
+            "SELECT * FROM t WHERE a = %s AND b IN (%s, %s, %s) AND c = 'x''y'"
+            "\n  LIMIT 21"
+        )
+        == "SELECT * FROM t WHERE a = ? AND b IN (...) AND c = ? LIMIT ?"
+    )
+    assert slow_queries.fingerprint(
+        "INSERT INTO t (a, b) VALUES (%s, %s), (%s, %s)"
+    ) == slow_queries.fingerprint("INSERT INTO t (a, b) VALUES (%s, %s)")
+
+
+def test_connections_are_wrapped():
+    connection.ensure_connection()
+
+    assert slow_queries.logger in connection.execute_wrappers
+
+
+def test_wrapping_inside_an_execute_wrapper_block():
+    def passthrough(execute, sql, params, many, context):
+        return execute(sql, params, many, context)
+
+    wrappers = connection.execute_wrappers
+    with connection.execute_wrapper(passthrough):
+        wrappers.remove(slow_queries.logger)
+        slow_queries.install(None, connection)
+    assert wrappers[0] is slow_queries.logger
+    assert passthrough not in wrappers
+
+
+def test_fast_queries_are_not_recorded(client, project_seed):
+    slow_queries.reset()
+
+    client.get("/projects/")
+
+    assert slow_queries.top(10) == []
+
+
+def test_slow_queries_are_aggregated(client, project_seed, log_every_query):
+    for _ in range(3):
+        list(Project.objects.filter(name__in=["a", "b"]))
+    list(Project.objects.filter(name__in=["c"]))
+
+    entry = next(
+        entry
+        for entry in slow_queries.top(100)
+        if "IN (...)" in entry["fingerprint"]
+    )
+    assert entry["count"] == 4
+    assert entry["total"] >= entry["max"] > 0
+    assert entry["params"] == ["c"]
+
+
+def test_queries_recorded_by_other_processes_are_reported():
+    slow_queries.reset()
+    worker = multiprocessing.get_context("fork").Process(
+        target=slow_queries.record, args=("SELECT %s", (1,), False, 1.0)
+    )
+    worker.start()
+    worker.join()
+
+    assert [entry["fingerprint"] for entry in slow_queries.top(10)] == [
+        "SELECT ?"
+    ]
+
+
+def test_report_explains_the_worst_queries(project_seed):
+    slow_queries.reset()
+    sql, params = Project.objects.filter(
+        description="x"
+    ).query.sql_with_params()
+    for duration in (1.0, 2.0):
+        slow_queries.record(sql, params, False, duration)
+    slow_queries.record(
+        "SELECT * FROM projects_project WHERE id = %s", (1,), False, 2.5
+    )
+
+    output = report("--limit", "1")
+
+    assert output.startswith(
+        "#1 2 executions, 3.000s total, 1.500s average, 2.000s max"
+    )
+    assert '"projects_project"."description" = ?' in output
+    assert "detail=SCAN projects_project" in output
+    assert "#2" not in output
+
+
+def test_report_reset(project_seed, log_every_query):
+    list(Project.objects.all())
+
+    report("--reset")
+
+    assert slow_queries.top(10) == []
+    assert report() == "No slow queries recorded.\n"
@@ -0,0 +1,88 @@
+import time
+
+import pytest
+from django.db import connection
+from projects import metrics
+from projects.exceptions import StatementTimeout
+from projects.middleware import StatementDeadline
+from projects.views import ProjectViewSet
+
+pytestmark = pytest.mark.dependency()
+
+ENDLESS_QUERY = (
+    "WITH RECURSIVE n(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM n) "
+    "SELECT max(x) FROM n"
+)
+
+
+def test_slow_statement_is_interrupted():
+    deadline = StatementDeadline(time.monotonic() + 10, timeout=0.05)
+
+    started = time.monotonic()
+    with pytest.raises(StatementTimeout):
+        with connection.execute_wrapper(deadline):
+            with connection.cursor() as cursor:
+                cursor.execute(ENDLESS_QUERY)
+
+    assert time.monotonic() - started < 1
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT 1")
+
+
+def test_statement_is_capped_by_the_request_deadline():
+    deadline = StatementDeadline(time.monotonic() + 0.05, timeout=10)
+
+    with pytest.raises(StatementTimeout):
+        with connection.execute_wrapper(deadline):
+            with connection.cursor() as cursor:
+                cursor.execute(ENDLESS_QUERY)
+
+
+def test_mysql_selects_get_an_execution_time_hint():
+    class MySQL:
+        vendor = "mysql"
+
+    deadline = StatementDeadline(time.monotonic() + 10, timeout=1.5)
+
+    assert deadline.arm("SELECT 1", MySQL(), 1.5) == (
+        "SELECT /*+ MAX_EXECUTION_TIME(1500) */ 1"
+    )
+    assert deadline.arm("UPDATE t SET a = 1", MySQL(), 1.5) == (
+        "UPDATE t SET a = 1"
+    )
+
+
+def test_spent_request_budget_answers_504(auth_client, project_seed):
+    response = auth_client.get("/projects/", HTTP_X_REQUEST_TIMEOUT="0")
+
+    assert response.status_code == 504
+    assert response.json()["detail"] == StatementTimeout.default_detail
+    assert metrics.counters()["statement_timeouts:project-list"] == 1
+
+
+def test_action_timeout_applies(auth_client, project_seed, monkeypatch):
+    monkeypatch.setattr(ProjectViewSet, "statement_timeouts", {"list": 0.05})
+    monkeypatch.setattr(
+        ProjectViewSet,
+        "filter_queryset",
+        lambda self, queryset: queryset.extra(
+            where=[f"({ENDLESS_QUERY}) > 0"]
+        ),
+    )
+
+    response = auth_client.get("/projects/")
+
+    assert response.status_code == 504
+
+
+def test_metrics_request(auth_client):
+    metrics.increment("statement_timeouts:project-list")
+    metrics.increment("statement_timeouts:project-list", 2)
+
+    response = auth_client.get("/metrics/")
+
+    assert response.json() == {"statement_timeouts:project-list": 3}
+
+
+def test_metrics_request_requires_staff(client):
+    assert client.get("/metrics/").status_code == 401
@@ -0,0 +1,54 @@
+import pytest
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.http import HttpResponse
+from django.test import RequestFactory
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.fixture()
+def collected_static(settings, tmp_path):
+    settings.STATIC_ROOT = str(tmp_path)
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {
+            "BACKEND": (
+                "whitenoise.storage.CompressedManifestStaticFilesStorage"
+            )
+        },
+    }
+    call_command("collectstatic", interactive=False, verbosity=0)
+    return tmp_path
+
+
+def serve(path, **headers):
+    whitenoise = WhiteNoiseMiddleware(lambda request: HttpResponse(status=404))
+    return whitenoise(RequestFactory().get(path, **headers))
+
+
+def test_collectstatic_writes_hashed_and_compressed_files(collected_static):
+    css = list((collected_static / "css").iterdir())
+
+    hashed = [p.name for p in css if p.name.startswith("style.")]
+    assert "style.css" in hashed
+    assert any(
+        name.endswith(".css") and name != "style.css" for name in hashed
+    )
+    assert any(name.endswith(".css.gz") for name in hashed)
+    assert (collected_static / "home-page.png").exists()
+
+
+def test_hashed_files_are_served_immutable_and_precompressed(
+    collected_static,
+):
+    url = staticfiles_storage.url("css/style.css")
+    assert url != "/static/css/style.css"
+
+    response = serve(url, HTTP_ACCEPT_ENCODING="gzip")
+
+    assert response.status_code == 200
+    assert response["Content-Encoding"] == "gzip"
+    assert "immutable" in response["Cache-Control"]
+    assert "max-age=315360000" in response["Cache-Control"]
@@ -0,0 +1,123 @@
+import pytest
+from django.contrib.auth.models import User
+from rest_framework.test import APIClient
+from projects.throttling import TokenBucketThrottle
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.fixture()
+def rates(settings):
+    def set_rates(**rates):
+        settings.REST_FRAMEWORK = {
+            **settings.REST_FRAMEWORK,
+            "DEFAULT_THROTTLE_RATES": rates,
+        }
+
+    return set_rates
+
+
+@pytest.fixture()
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(TokenBucketThrottle, "timer", lambda self: now[0])
+    return now
+
+
+def patch_project(client, project):
+    return client.patch(
+        f"/projects/{project.id}/", {"name": "Projeto"}, format="json"
+    )
+
+
+def test_writes_are_throttled_per_user(
+    auth_client, project_seed, rates, clock
+):
+    rates(writes="2/min")
+
+    assert patch_project(auth_client, project_seed).status_code == 200
+    assert patch_project(auth_client, project_seed).status_code == 200
+    response = patch_project(auth_client, project_seed)
+
+    assert response.status_code == 429
+    assert response["Retry-After"] == "30"
+    assert auth_client.get("/projects/").status_code == 200
+
+    other = APIClient()
+    other.force_authenticate(User.objects.create_user(username="other"))
+    assert patch_project(other, project_seed).status_code == 200
+
+
+def test_bucket_refills_at_the_steady_rate(
+    auth_client, project_seed, rates, clock
+):
+    rates(writes="2/min")
+    patch_project(auth_client, project_seed)
+    patch_project(auth_client, project_seed)
+
+    clock[0] += 29
+    assert patch_project(auth_client, project_seed).status_code == 429
+    clock[0] += 1
+    assert patch_project(auth_client, project_seed).status_code == 200
+    assert patch_project(auth_client, project_seed).status_code == 429
+
+    clock[0] += 60
+    assert patch_project(auth_client, project_seed).status_code == 200
+    assert patch_project(auth_client, project_seed).status_code == 200
+
+
+def test_token_requests_are_throttled_per_ip(client, user_seed, rates, clock):
+    rates(token="1/min")
+    credentials = {"username": user_seed.username, "password": "wrong"}
+
+    assert client.post("/token/", credentials).status_code == 401
+    assert client.post("/token/", credentials).status_code == 429
+    assert (
+        client.post("/token/", credentials, REMOTE_ADDR="10.0.0.2").status_code
+        == 401
+    )
+
+
+def test_token_requests_ignore_spoofed_forwarded_for(
+    client, user_seed, rates, clock
+):
+    rates(token="1/min")
+    credentials = {"username": user_seed.username, "password": "wrong"}
+
+    responses = [
+        client.post("/token/", credentials, HTTP_X_FORWARDED_FOR=f"10.1.0.{i}")
+        for i in range(3)
+    ]
+
+    assert [response.status_code for response in responses] == [
+        401,
+        429,
+        429,
+    ]
+
+
+def test_token_requests_are_throttled_per_username(
+    client, user_seed, rates, clock
+):
+    rates(token="10/min", token_username="2/min")
+    credentials = {"username": user_seed.username, "password": "wrong"}
+
+    statuses = [
+        client.post(
+            "/token/", credentials, REMOTE_ADDR=f"10.0.0.{i}"
+        ).status_code
+        for i in range(3)
+    ]
+    other = client.post(
+        "/token/", {**credentials, "username": "other"}, REMOTE_ADDR="10.0.0.9"
+    )
+
+    assert statuses == [401, 401, 429]
+    assert other.status_code == 401
+
+
+def test_unscoped_views_are_not_throttled(auth_client, rates, clock):
+    rates(writes="1/min")
+
+    for _ in range(3):
+        assert auth_client.get("/projects/").status_code == 200
@@ -0,0 +1,135 @@
+import pytest
+from projects.models import CertifyingInstitution, Profile, Project
+
+pytestmark = pytest.mark.dependency()
+
+
+def test_profile_upsert_request(auth_client, profile_seed):
+    response = auth_client.post(
+        "/profiles/upsert/",
+        [
+            {
+                "name": "Profile 1 alterado",
+                "github": profile_seed.github,
+                "linkedin": profile_seed.linkedin,
+                "bio": profile_seed.bio,
+            },
+            {
+                "name": "Profile 2",
+                "github": "http://myfakeurl2.com",
+                "linkedin": "http://myfakeurl2.com",
+                "bio": "Bio do profile 2",
+            },
+        ],
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert [profile["name"] for profile in response.json()] == [
+        "Profile 1 alterado",
+        "Profile 2",
+    ]
+    assert response.json()[0]["id"] == profile_seed.id
+    assert Profile.objects.count() == 2
+    # Only the overwritten row gets a new version.
+    assert dict(Profile.objects.values_list("name", "version")) == {
+        "Profile 1 alterado": 2,
+        "Profile 2": 1,
+    }
+
+
+def test_project_upsert_request(
+    auth_client, project_seed, profile_seed
+):
+    payload = [
+        {
+            "name": f"Projeto {index} importado",
+            "description": "Descrição",
+            "github_url": github_url,
+            "keyword": " Python ",
+            "key_skill": "Django",
+            "profile_id": profile_seed.id,
+        }
+        for index, github_url in [
+            (1, project_seed.github_url),
+            (2, "http://myfakeurl2.com"),
+            (3, "http://myfakeurl3.com"),
+        ]
+    ]
+
+    response = auth_client.post("/projects/upsert/", payload, format="json")
+
+    assert response.status_code == 200
+    assert response.json()[0]["id"] == project_seed.id
+    assert response.json()[0]["name"] == "Projeto 1 importado"
+    assert response.json()[1]["keyword"] == "Python"
+    assert Project.objects.count() == 3
+    assert set(
+        Project.objects.get(pk=project_seed.pk).skills.values_list(
+            "slug", flat=True
+        )
+    ) == {"python", "django"}
+
+
+def test_project_upsert_request_with_unknown_profile(auth_client):
+    response = auth_client.post(
+        "/projects/upsert/",
+        {
+            "name": "Projeto 1",
+            "description": "Descrição",
+            "github_url": "http://myfakeurl.com",
+            "keyword": "keyword1",
+            "key_skill": "key_skill1",
+            "profile_id": 999,
+        },
+        format="json",
+    )
+    assert response.status_code == 400
+
+
+def test_certifying_institution_upsert_request(
+    auth_client, certificate_and_institution_seed
+):
+    certificate, institution = certificate_and_institution_seed
+    response = auth_client.post(
+        "/certifying-institutions/upsert/",
+        {"name": "Certifying Institution 1 alterada", "url": institution.url},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    assert response.json()["id"] == institution.id
+    assert response.json()["certificates"][0]["id"] == certificate.id
+    assert CertifyingInstitution.objects.get().name == (
+        "Certifying Institution 1 alterada"
+    )
+
+
+def test_duplicated_natural_key_is_rejected_on_create(
+    auth_client, profile_seed
+):
+    response = auth_client.post(
+        "/profiles/",
+        {
+            "name": "Profile 2",
+            "github": profile_seed.github,
+            "linkedin": "http://myfakeurl.com",
+            "bio": "Bio do profile 2",
+        },
+        format="json",
+    )
+    assert response.status_code == 400
+
+
+def test_upsert_request_without_authentication(client, profile_seed):
+    response = client.post(
+        "/profiles/upsert/",
+        {
+            "name": "Profile 1",
+            "github": profile_seed.github,
+            "linkedin": profile_seed.linkedin,
+            "bio": profile_seed.bio,
+        },
+        format="json",
+    )
+    assert response.status_code == 401
@@ -0,0 +1,76 @@
+import pytest
+from projects.models import Certificate, Profile, Project
+from projects.serializers import CertificateSerializer, ProjectSerializer
+from projects.values import ValuesSerializer
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.fixture()
+def certificates_seed(certificate_and_institution_seed):
+    certificate, institution = certificate_and_institution_seed
+    other = Profile.objects.create(
+        name="Profile 2",
+        github="http://myfakeurl2.com",
+        linkedin="http://myfakeurl2.com",
+        bio="Bio do profile 2",
+    )
+    certificate.profiles.add(other)
+    lonely = Certificate.objects.create(
+        name="Certificate 2", certifying_institution=institution
+    )
+    return [certificate, lonely]
+
+
+def test_project_list_matches_model_serializer(
+    auth_client, project_seed, django_assert_num_queries
+):
+    expected = ProjectSerializer(Project.objects.all(), many=True).data
+
+    with django_assert_num_queries(2):
+        response = auth_client.get("/projects/")
+
+    assert response.json() == expected
+
+
+def test_certificate_list_matches_model_serializer(
+    auth_client, certificates_seed, django_assert_num_queries
+):
+    expected = CertificateSerializer(Certificate.objects.all(), many=True).data
+
+    # The user, the certificates and the links to their profiles.
+    with django_assert_num_queries(3):
+        response = auth_client.get("/certificates/")
+
+    assert response.json() == expected
+    assert len(response.json()[0]["profiles"]) == 2
+    assert response.json()[1]["profiles"] == []
+
+
+def test_paginated_list_matches_model_serializer(
+    auth_client, certificates_seed
+):
+    expected = CertificateSerializer(
+        Certificate.objects.all()[1:2], many=True
+    ).data
+
+    response = auth_client.get("/certificates/", {"limit": 1, "offset": 1})
+
+    assert response.json()["count"] == 2
+    assert response.json()["results"] == expected
+
+
+def test_values_serializer_handles_null_columns():
+    rows = [(1, "Certificate", 1, None)]
+
+    data = ValuesSerializer(CertificateSerializer).serialize(rows)
+
+    assert data == [
+        {
+            "id": 1,
+            "name": "Certificate",
+            "certifying_institution": 1,
+            "timestamp": None,
+            "profiles": [],
+        }
+    ]
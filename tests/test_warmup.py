@@ -0,0 +1,58 @@
+import pytest
+from django.db import connections
+from django.template import engines
+from django.urls import clear_url_caches, get_resolver
+from projects import warmup
+from projects.views import ProjectViewSet
+
+pytestmark = pytest.mark.dependency()
+
+
+@pytest.fixture()
+def cold_caches():
+    loader = engines["django"].engine.template_loaders[0]
+    loader.reset()
+    clear_url_caches()
+    vars(ProjectViewSet.values_serializer).pop("plan", None)
+    return loader
+
+
+def test_warm_up(settings, cold_caches):
+    settings.WARMUP_ON_BOOT = True
+
+    warmup.warm_up()
+
+    assert set(cold_caches.get_template_cache) == {
+        "base.html",
+        "profile_detail.html",
+    }
+    assert get_resolver()._populated
+    assert "plan" in vars(ProjectViewSet.values_serializer)
+
+
+def test_warm_up_can_be_turned_off(settings, cold_caches):
+    settings.WARMUP_ON_BOOT = False
+
+    warmup.warm_up()
+
+    assert cold_caches.get_template_cache == {}
+    assert not get_resolver()._populated
+
+
+def test_warm_connections_reopen_after_fork(monkeypatch):
+    hooks = []
+    monkeypatch.setattr(
+        warmup.os, "register_at_fork", lambda **kwargs: hooks.append(kwargs)
+    )
+    warmup.register_fork_hooks.cache_clear()
+
+    warmup.warm_connections()
+    warmup.warm_connections()
+
+    assert hooks == [
+        {
+            "before": connections.close_all,
+            "after_in_child": warmup.open_connections,
+        }
+    ]
+    warmup.register_fork_hooks.cache_clear()